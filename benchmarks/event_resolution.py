@@ -0,0 +1,104 @@
+"""Compare the cached lookup of event classes with walking the class hierarchy.
+
+``Event.resolve_by_type`` looks the event classes up by their type names instead
+of walking the hierarchy of the event classes for every event.
+
+* lookup: the type names of a conversation and of story lines, where most story
+  lines are actions which fall back to ``ActionExecuted``
+* deserialise: ``deserialise_events`` of a serialised conversation
+
+Run with Rasa installed, e.g.:
+
+    python benchmarks/event_resolution.py --turns 500
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict, List, Optional, Text, Type
+
+from rasa.core import utils
+from rasa.core.events import ActionExecuted, Event, deserialise_events
+
+from event_serialisation import realistic_events
+
+
+def _resolve_by_walking(
+    type_name: Text, default: Optional[Type[Event]] = None
+) -> Optional[Type[Event]]:
+    """The previous implementation of `Event.resolve_by_type`."""
+
+    for cls in utils.all_subclasses(Event):
+        if cls.type_name == type_name:
+            return cls
+    if type_name == "topic":
+        return None
+    elif default is not None:
+        return default
+    else:
+        raise ValueError("Unknown event name '{}'.".format(type_name))
+
+
+def _deserialise_by_walking(serialised: List[Dict[Text, Any]]) -> List[Event]:
+    return [_resolve_by_walking(e["event"])._from_parameters(e) for e in serialised]
+
+
+def _best_of(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(turns: int, repeat: int) -> None:
+    evts = realistic_events(turns)
+    serialised = [e.as_dict() for e in evts]
+    # a story line is either an event (e.g. `slot{...}`) or an action
+    story_names = [
+        e.action_name if isinstance(e, ActionExecuted) else e.type_name
+        for e in evts
+    ]
+
+    def lookup(resolve):
+        for name in story_names:
+            resolve(name, ActionExecuted)
+
+    measurements = [
+        (
+            "lookup",
+            lambda: lookup(_resolve_by_walking),
+            lambda: lookup(Event.resolve_by_type),
+        ),
+        (
+            "deserialise",
+            lambda: _deserialise_by_walking(serialised),
+            lambda: deserialise_events(serialised),
+        ),
+    ]
+
+    print("{} events, best of {} runs".format(len(evts), repeat))
+    header = ("benchmark", "walk (ms)", "cached (ms)", "speedup")
+    print("{:<14}{:>12}{:>14}{:>10}".format(*header))
+    for name, walking, cached in measurements:
+        walking_time = _best_of(walking, repeat)
+        cached_time = _best_of(cached, repeat)
+        print(
+            "{:<14}{:>12.2f}{:>14.2f}{:>9.1f}x".format(
+                name,
+                walking_time * 1000,
+                cached_time * 1000,
+                walking_time / cached_time,
+            )
+        )
+
+
+def main(args: Optional[List[Text]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--turns", type=int, default=200, help="Number of turns of the conversation."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of runs per measurement."
+    )
+    parsed = parser.parse_args(args)
+    run(parsed.turns, parsed.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare the serialisation paths of events on a realistic conversation.
+
+* json: ``Event.as_dict`` and ``json.dumps``, ``json.loads`` and
+  ``deserialise_events`` (SQL, Mongo and Redis event lists, event brokers)
+* pickle: pickled ``Event`` objects (``TrackerStore.serialise_tracker``)
+* compact: ``rasa.core.events.compact``
+
+Run with Rasa installed, e.g.:
+
+    python benchmarks/event_serialisation.py --turns 500
+"""
+
+import argparse
+import json
+import pickle
+import timeit
+import uuid
+from typing import Callable, List, Optional, Text
+
+from rasa.core.events import (
+    ActionExecuted,
+    BotUttered,
+    Event,
+    SlotSet,
+    UserUttered,
+    deserialise_events,
+)
+from rasa.core.events import compact
+
+
+def realistic_events(turns: int, n_intents: int = 20) -> List[Event]:
+    """Create a conversation as it is logged by a bot with `n_intents` intents
+    and an ensemble of several policies."""
+
+    intents = ["intent_{}".format(i) for i in range(n_intents)]
+    evts = [ActionExecuted("action_listen")]
+
+    for turn in range(turns):
+        intent = intents[turn % n_intents]
+        ranking = [
+            {"name": name, "confidence": 1.0 / (i + 2)}
+            for i, name in enumerate([intent] + [n for n in intents if n != intent])
+        ]
+        text = "this is message number {} about berlin".format(turn)
+        entities = [
+            {
+                "start": 33,
+                "end": 39,
+                "value": "berlin",
+                "entity": "city",
+                "confidence": 0.87,
+                "extractor": "CRFEntityExtractor",
+            }
+        ]
+        parse_data = {
+            "intent": ranking[0],
+            "entities": entities,
+            "intent_ranking": ranking,
+            "text": text,
+        }
+        evts.extend(
+            [
+                UserUttered(
+                    text,
+                    ranking[0],
+                    entities,
+                    parse_data,
+                    input_channel="rest",
+                    message_id=uuid.uuid4().hex,
+                ),
+                SlotSet("city", "berlin"),
+                ActionExecuted("utter_" + intent, "policy_0_MemoizationPolicy", 1.0),
+                BotUttered(
+                    "response to message number {}".format(turn),
+                    {"elements": None, "buttons": None, "attachment": None},
+                ),
+                ActionExecuted("action_listen", "policy_1_KerasPolicy", 0.93),
+            ]
+        )
+
+    return evts
+
+
+def _json_encode(evts: List[Event]) -> bytes:
+    return json.dumps([e.as_dict() for e in evts]).encode("utf-8")
+
+
+def _json_decode(data: bytes) -> List[Event]:
+    return deserialise_events(json.loads(data.decode("utf-8")))
+
+
+def _pickle_encode(evts: List[Event]) -> bytes:
+    return pickle.dumps(evts)
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(turns: int, repeat: int) -> None:
+    evts = realistic_events(turns)
+
+    paths = [
+        ("json", _json_encode, _json_decode),
+        ("pickle", _pickle_encode, pickle.loads),
+        ("compact", compact.encode_events, compact.decode_events),
+    ]
+
+    print("{} events, best of {} runs".format(len(evts), repeat))
+    header = ("format", "size (kB)", "encode (ms)", "decode (ms)")
+    print("{:<10}{:>12}{:>14}{:>14}".format(*header))
+    for name, encode, decode in paths:
+        data = encode(evts)
+        assert decode(data) == evts
+
+        encode_time = _best_of(lambda: encode(evts), repeat)
+        decode_time = _best_of(lambda: decode(data), repeat)
+        print(
+            "{:<10}{:>12.1f}{:>14.2f}{:>14.2f}".format(
+                name, len(data) / 1024, encode_time * 1000, decode_time * 1000
+            )
+        )
+
+
+def main(args: Optional[List[Text]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--turns", type=int, default=200, help="Number of turns of the conversation."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of runs per measurement."
+    )
+    parsed = parser.parse_args(args)
+    run(parsed.turns, parsed.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import argparse
 
 from rasa.cli.arguments.default_arguments import add_model_param, add_endpoint_param
-from rasa.core import constants
+from rasa.core import constants, inference
 
 
 def set_run_arguments(parser: argparse.ArgumentParser):
@@ -56,6 +56,66 @@ def add_server_arguments(parser: argparse.ArgumentParser):
         action="store_true",
         help="Start the web server API in addition to the input channel.",
     )
+    server_arguments.add_argument(
+        "--workers",
+        default=constants.DEFAULT_SERVER_WORKERS,
+        type=int,
+        help="Number of worker processes handling requests. Using more than one "
+        "worker requires a tracker store and a lock store which can be shared "
+        "between processes, e.g. Redis.",
+    )
+    server_arguments.add_argument(
+        "--nlu-executor",
+        default=inference.DEFAULT_EXECUTOR_TYPE,
+        choices=inference.EXECUTOR_TYPES,
+        help="Where messages are parsed by the NLU model: directly on the event "
+        "loop ('inline'), in a thread pool ('thread') or in a process pool "
+        "('process').",
+    )
+    server_arguments.add_argument(
+        "--policy-executor",
+        default=inference.DEFAULT_EXECUTOR_TYPE,
+        choices=[inference.INLINE_EXECUTOR, inference.THREAD_EXECUTOR],
+        help="Where the next actions are predicted by the policies: directly on "
+        "the event loop ('inline') or in a thread pool ('thread').",
+    )
+    server_arguments.add_argument(
+        "--inference-workers",
+        default=None,
+        type=int,
+        help="Maximum number of threads or processes used by each inference "
+        "executor. Defaults to {} threads or one process per CPU."
+        "".format(inference.DEFAULT_MAX_THREAD_WORKERS),
+    )
+    server_arguments.add_argument(
+        "--nlu-batch-size",
+        default=inference.DEFAULT_MAX_BATCH_SIZE,
+        type=int,
+        help="Maximum number of concurrently received messages which are parsed "
+        "together as one batch. A batch size of 1 disables batching.",
+    )
+    server_arguments.add_argument(
+        "--nlu-batch-wait",
+        default=inference.DEFAULT_MAX_BATCH_WAIT_MS,
+        type=float,
+        help="Maximum time in milliseconds a message waits for further messages "
+        "before its batch is parsed.",
+    )
+    server_arguments.add_argument(
+        "--policy-batch-size",
+        default=inference.DEFAULT_MAX_BATCH_SIZE,
+        type=int,
+        help="Maximum number of concurrently handled conversations whose next "
+        "actions are predicted together as one batch. A batch size of 1 disables "
+        "batching.",
+    )
+    server_arguments.add_argument(
+        "--policy-batch-wait",
+        default=inference.DEFAULT_MAX_BATCH_WAIT_MS,
+        type=float,
+        help="Maximum time in milliseconds a prediction waits for further "
+        "predictions before its batch is predicted.",
+    )
     server_arguments.add_argument(
         "--remote-storage",
         help="Set the remote location where your Rasa model is stored, e.g. on AWS.",
@@ -20,6 +20,7 @@ def set_train_arguments(parser: argparse.ArgumentParser):
     add_augmentation_param(parser)
     add_debug_plots_param(parser)
     add_dump_stories_param(parser)
+    add_policy_processes_param(parser)
 
     add_model_name_param(parser)
     add_force_param(parser)
@@ -34,6 +35,7 @@ def set_train_core_arguments(parser: argparse.ArgumentParser):
     add_augmentation_param(parser)
     add_debug_plots_param(parser)
     add_dump_stories_param(parser)
+    add_policy_processes_param(parser)
 
     add_force_param(parser)
 
@@ -107,6 +109,17 @@ def add_augmentation_param(
     )
 
 
+def add_policy_processes_param(
+    parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
+):
+    parser.add_argument(
+        "--policy-processes",
+        type=int,
+        default=1,
+        help="Number of processes used to train the policies concurrently.",
+    )
+
+
 def add_dump_stories_param(
     parser: Union[argparse.ArgumentParser, argparse._ActionsContainer]
 ):
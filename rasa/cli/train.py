@@ -145,6 +145,8 @@ def extract_additional_arguments(args: argparse.Namespace) -> Dict:
         arguments["dump_stories"] = args.dump_stories
     if "debug_plots" in args:
         arguments["debug_plots"] = args.debug_plots
+    if "policy_processes" in args:
+        arguments["policy_processes"] = args.policy_processes
 
     return arguments
 
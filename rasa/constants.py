@@ -39,6 +39,19 @@ MINIMUM_COMPATIBLE_VERSION = "1.0.0rc1"
 
 GLOBAL_USER_CONFIG_PATH = os.path.expanduser("~/.config/rasa/global.yml")
 
+DEFAULT_MODEL_CACHE_PATH = os.path.expanduser("~/.cache/rasa/models")
+DEFAULT_MODEL_CACHE_SIZE_MB = 2048
+ENV_MODEL_CACHE_PATH = "RASA_MODEL_CACHE_PATH"
+ENV_MODEL_CACHE_SIZE_MB = "RASA_MODEL_CACHE_SIZE_MB"
+ENV_MODEL_CACHE_READ_ONLY = "RASA_MODEL_CACHE_READ_ONLY"
+
+DEFAULT_MODEL_DOWNLOAD_PATH = os.path.expanduser("~/.cache/rasa/downloads")
+ENV_MODEL_DOWNLOAD_PATH = "RASA_MODEL_DOWNLOAD_PATH"
+
+DEFAULT_TRAINING_DATA_CACHE_PATH = os.path.expanduser("~/.cache/rasa/training_data")
+DEFAULT_TRAINING_DATA_CACHE_SIZE = 10
+ENV_TRAINING_DATA_CACHE_PATH = "RASA_TRAINING_DATA_CACHE_PATH"
+
 DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_LOG_LEVEL_RASA_X = "WARNING"
 DEFAULT_LOG_LEVEL_LIBRARIES = "ERROR"
@@ -1,7 +1,14 @@
+import asyncio
+import base64
+import gc
+import hashlib
+import json
 import logging
 import os
 import shutil
+import tarfile
 import tempfile
+import time
 import uuid
 from asyncio import CancelledError
 from sanic import Sanic
@@ -11,18 +18,26 @@ import aiohttp
 
 import rasa
 import rasa.utils.io
-from rasa.constants import DEFAULT_DOMAIN_PATH, LEGACY_DOCS_BASE_URL
+from rasa.constants import (
+    DEFAULT_DOMAIN_PATH,
+    DEFAULT_MODEL_DOWNLOAD_PATH,
+    ENV_MODEL_DOWNLOAD_PATH,
+    LEGACY_DOCS_BASE_URL,
+)
 from rasa.core import constants, jobs, training
+from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.channels.channel import (
     InputChannel,
     OutputChannel,
     UserMessage,
     CollectingOutputChannel,
 )
-from rasa.core.constants import DEFAULT_REQUEST_TIMEOUT
+from rasa.core.constants import DEFAULT_REQUEST_TIMEOUT, MODEL_DOWNLOAD_CHUNK_SIZE
 from rasa.core.domain import Domain, InvalidDomain
+from rasa.core.events import ActionExecuted, UserUttered
 from rasa.core.exceptions import AgentNotReady
 from rasa.core.interpreter import NaturalLanguageInterpreter, RegexInterpreter
+from rasa.core.lock_store import InMemoryLockStore, LockStore
 from rasa.core.nlg import NaturalLanguageGenerator
 from rasa.core.policies.policy import Policy
 from rasa.core.policies.form_policy import FormPolicy
@@ -32,16 +47,17 @@ from rasa.core.policies.memoization import MemoizationPolicy
 from rasa.core.processor import MessageProcessor
 from rasa.core.tracker_store import InMemoryTrackerStore, TrackerStore
 from rasa.core.trackers import DialogueStateTracker
-from rasa.core.utils import LockCounter
 from rasa.model import (
     get_model_subdirectories,
     get_latest_model,
     unpack_model,
     get_model,
+    is_unpacked_model,
 )
 from rasa.nlu.utils import is_url
 from rasa.utils.common import update_sanic_log_level, set_log_level
 from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.metrics import registry
 from rasa.exceptions import ModelNotFound
 
 from rasa.importers.importer import TrainingDataImporter
@@ -69,12 +85,10 @@ async def load_from_server(agent: "Agent", model_server: EndpointConfig) -> "Age
     return agent
 
 
-def _load_and_set_updated_model(
-    agent: "Agent", model_directory: Text, fingerprint: Text
-):
-    """Load the persisted model into memory and set the model on the agent."""
-
-    logger.debug("Found new model with fingerprint {}. Loading...".format(fingerprint))
+def _load_updated_model(
+    agent: "Agent", model_directory: Text
+) -> Tuple[Optional[Domain], Optional[PolicyEnsemble], NaturalLanguageInterpreter]:
+    """Load the domain, the policies and the interpreter of a persisted model."""
 
     core_path, nlu_path = get_model_subdirectories(model_directory)
 
@@ -88,14 +102,26 @@ def _load_and_set_updated_model(
         )
 
     domain = None
+    policy_ensemble = None
     if core_path:
         domain_path = os.path.join(os.path.abspath(core_path), DEFAULT_DOMAIN_PATH)
         domain = Domain.load(domain_path)
+        policy_ensemble = PolicyEnsemble.load(core_path)
+
+    return domain, policy_ensemble, interpreter
+
+
+def _load_and_set_updated_model(
+    agent: "Agent", model_directory: Text, fingerprint: Text
+):
+    """Load the persisted model into memory and set the model on the agent."""
+
+    logger.debug("Found new model with fingerprint {}. Loading...".format(fingerprint))
 
     try:
-        policy_ensemble = None
-        if core_path:
-            policy_ensemble = PolicyEnsemble.load(core_path)
+        domain, policy_ensemble, interpreter = _load_updated_model(
+            agent, model_directory
+        )
         agent.update_model(
             domain, policy_ensemble, fingerprint, interpreter, model_directory
         )
@@ -107,6 +133,169 @@ def _load_and_set_updated_model(
         )
 
 
+def _handle_synthetic_messages(
+    interpreter: Optional[NaturalLanguageInterpreter],
+    domain: Optional[Domain],
+    policy_ensemble: Optional[PolicyEnsemble],
+    messages: List[Text],
+) -> float:
+    """Parse `messages` and predict the next action after each of them.
+
+    Returns the mean time it took to handle a message."""
+
+    from rasa.core.interpreter import RasaNLUInterpreter
+
+    if not messages:
+        return 0.0
+
+    start = time.time()
+    for text in messages:
+        if isinstance(interpreter, RasaNLUInterpreter) and interpreter.interpreter:
+            parse_data = interpreter.interpreter.parse(text)
+        else:
+            intent = domain.intents[0] if domain and domain.intents else None
+            parse_data = {
+                "text": text,
+                "intent": {"name": intent, "confidence": 1.0},
+                "entities": [],
+            }
+
+        if domain is not None and policy_ensemble is not None:
+            tracker = DialogueStateTracker(
+                constants.WARM_UP_SENDER_ID, domain.slots
+            )
+            tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+            tracker.update(
+                UserUttered(
+                    text,
+                    parse_data.get("intent"),
+                    parse_data.get("entities", []),
+                    parse_data,
+                )
+            )
+            policy_ensemble.probabilities_using_best_policy(tracker, domain)
+
+    return (time.time() - start) / len(messages)
+
+
+def _load_and_warm_up_model(
+    agent: "Agent", model_directory: Text, warm_up_messages: List[Text]
+) -> Tuple[Optional[Domain], Optional[PolicyEnsemble], NaturalLanguageInterpreter]:
+    """Load a model and handle the warm-up messages with it.
+
+    The first messages initialise e.g. the TensorFlow graphs, hence they are
+    handled a second time to measure the latency of the warmed up model."""
+
+    domain, policy_ensemble, interpreter = _load_updated_model(agent, model_directory)
+
+    cold_latency = _handle_synthetic_messages(
+        interpreter, domain, policy_ensemble, warm_up_messages
+    )
+    warm_latency = _handle_synthetic_messages(
+        interpreter, domain, policy_ensemble, warm_up_messages
+    )
+    registry.set_gauge("model.warm_up.cold_latency", cold_latency)
+    registry.set_gauge("model.warm_up.warm_latency", warm_latency)
+
+    return domain, policy_ensemble, interpreter
+
+
+async def _load_and_swap_updated_model(
+    agent: "Agent",
+    model_directory: Text,
+    fingerprint: Text,
+    warm_up_messages: List[Text],
+) -> None:
+    """Load and warm up the model in a thread, then swap it into the agent.
+
+    Until the new model is ready, messages are handled by the previous model.
+    The previous model is released once the messages it still handles are done."""
+
+    logger.debug(
+        "Found new model with fingerprint {}. Loading it in the "
+        "background...".format(fingerprint)
+    )
+
+    loop = asyncio.get_event_loop()
+    try:
+        with registry.measure("model.load_time"):
+            domain, policy_ensemble, interpreter = await loop.run_in_executor(
+                None, _load_and_warm_up_model, agent, model_directory, warm_up_messages
+            )
+    except Exception:
+        logger.exception(
+            "Failed to load policy and update agent. "
+            "The previous model will stay loaded instead."
+        )
+        return
+
+    previous_interpreter = agent.interpreter
+    previous_policy_ensemble = agent.policy_ensemble
+    previous_usage = agent.model_usage
+
+    # there is no await in between, hence every message is either handled by
+    # the previous or by the new model
+    agent.update_model(
+        domain, policy_ensemble, fingerprint, interpreter, model_directory
+    )
+    agent.model_usage.swapped_in = True
+    registry.increment("model.swaps")
+
+    if previous_usage.handled_messages:
+        registry.set_gauge("model.swap.latency_before", previous_usage.mean_latency)
+    gauges = registry.as_dict()["gauges"]
+    logger.info(
+        "Swapped in model with fingerprint {}. Mean latency of the warm-up "
+        "messages: {:.4f}s, mean latency of the messages handled by the previous "
+        "model: {:.4f}s.".format(
+            fingerprint,
+            gauges.get("model.warm_up.warm_latency", 0.0),
+            previous_usage.mean_latency,
+        )
+    )
+
+    asyncio.ensure_future(
+        _release_model(
+            agent, previous_interpreter, previous_policy_ensemble, previous_usage
+        )
+    )
+
+
+async def _release_model(
+    agent: "Agent",
+    interpreter: Optional[NaturalLanguageInterpreter],
+    policy_ensemble: Optional[PolicyEnsemble],
+    usage: "ModelUsage",
+) -> None:
+    """Free the resources of a replaced model once the messages which are still
+    handled by it are done."""
+
+    from rasa.core.interpreter import RasaNLUInterpreter
+
+    await usage.wait_until_unused()
+
+    components = []
+    if policy_ensemble is not None and policy_ensemble is not agent.policy_ensemble:
+        components.extend(policy_ensemble.policies)
+    if (
+        isinstance(interpreter, RasaNLUInterpreter)
+        and interpreter is not agent.interpreter
+        and interpreter.interpreter is not None
+    ):
+        components.extend(interpreter.interpreter.pipeline)
+
+    for component in components:
+        # e.g. the TensorFlow sessions of the Keras and embedding models
+        session = getattr(component, "session", None)
+        if session is not None and hasattr(session, "close"):
+            session.close()
+
+    del components, interpreter, policy_ensemble
+    gc.collect()
+    registry.increment("model.releases")
+    logger.debug("Released the resources of the previous model.")
+
+
 async def _update_model_from_server(
     model_server: EndpointConfig, agent: "Agent"
 ) -> None:
@@ -120,21 +309,271 @@ async def _update_model_from_server(
     )
     if model_directory_and_fingerprint:
         model_directory, new_model_fingerprint = model_directory_and_fingerprint
-        _load_and_set_updated_model(agent, model_directory, new_model_fingerprint)
+        await _load_and_swap_updated_model(
+            agent,
+            model_directory,
+            new_model_fingerprint,
+            model_server.kwargs.get(
+                "warm_up_messages", constants.DEFAULT_WARM_UP_MESSAGES
+            ),
+        )
     else:
         logger.debug("No new model found at URL {}".format(model_server.url))
 
 
+class ModelUsage(object):
+    """Counts the messages which are handled by a model.
+
+    Every processor is created with the model which is loaded at that time and
+    keeps using it until its message is handled, even if another model is
+    swapped in meanwhile. A replaced model is hence only released once none of
+    its messages are in flight anymore."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.handled_messages = 0
+        self.swapped_in = False
+        self._total_latency = 0.0
+        self._unused = None  # type: Optional[asyncio.Event]
+
+    def __enter__(self) -> "ModelUsage":
+        self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0 and self._unused is not None:
+            self._unused.set()
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean time it took the model to handle a message."""
+
+        if not self.handled_messages:
+            return 0.0
+        return self._total_latency / self.handled_messages
+
+    def observe(self, latency: float) -> None:
+        """Record the time it took the model to handle a message."""
+
+        self.handled_messages += 1
+        self._total_latency += latency
+
+    async def wait_until_unused(self) -> None:
+        """Wait until the model does not handle any messages anymore."""
+
+        while self.in_flight:
+            self._unused = asyncio.Event()
+            await self._unused.wait()
+
+
+class _ModelDownload(object):
+    """Model archive pulled from a model server, stored on disk.
+
+    The download directory of a model server contains the last completely
+    downloaded archive together with its fingerprint, and possibly a partially
+    downloaded archive which is resumed by the next pull. The directory is kept
+    across restarts, so that a restarted server only downloads a model if its
+    fingerprint changed."""
+
+    def __init__(self, url: Text) -> None:
+        base_directory = os.environ.get(
+            ENV_MODEL_DOWNLOAD_PATH, DEFAULT_MODEL_DOWNLOAD_PATH
+        )
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        self.directory = os.path.join(base_directory, url_hash[:32])
+        self.model_file = os.path.join(self.directory, "model.tar.gz")
+        self.partial_file = os.path.join(self.directory, "model.tar.gz.partial")
+        self._lock_file = None
+
+    def _read_metadata(self, path: Text) -> Dict[Text, Any]:
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_metadata(self, path: Text, metadata: Dict[Text, Any]) -> None:
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+    def lock(self) -> bool:
+        """Prevents other processes from pulling the same model at the same time.
+
+        Returns `False` if another process is pulling the model already."""
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_file = open(os.path.join(self.directory, ".lock"), "w")
+        try:
+            import fcntl
+
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            # no file locks on this platform
+            pass
+        except OSError:
+            self.unlock()
+            return False
+        return True
+
+    def unlock(self) -> None:
+        if self._lock_file is not None:
+            # closing the file releases the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def stored_fingerprint(self) -> Optional[Text]:
+        """Fingerprint of the completely downloaded archive."""
+
+        if not os.path.isfile(self.model_file):
+            return None
+        return self._read_metadata(self.model_file).get("fingerprint")
+
+    def resumable(self) -> Tuple[int, Optional[Text]]:
+        """Size and fingerprint of the partially downloaded archive."""
+
+        fingerprint = self._read_metadata(self.partial_file).get("fingerprint")
+        if not fingerprint or not os.path.isfile(self.partial_file):
+            return 0, None
+        return os.path.getsize(self.partial_file), fingerprint
+
+    def start(self, fingerprint: Optional[Text], resume: bool) -> Dict[Text, Any]:
+        """Prepares the partial archive and returns the checksums of its content.
+
+        Archives without fingerprint can not be resumed, as it is not known
+        whether the remaining bytes belong to the same model."""
+
+        checksums = {"md5": hashlib.md5(), "sha-256": hashlib.sha256()}
+        if resume:
+            with open(self.partial_file, "rb") as f:
+                for chunk in iter(lambda: f.read(MODEL_DOWNLOAD_CHUNK_SIZE), b""):
+                    for checksum in checksums.values():
+                        checksum.update(chunk)
+        else:
+            open(self.partial_file, "wb").close()
+
+        self._write_metadata(self.partial_file, {"fingerprint": fingerprint})
+        return checksums
+
+    def discard_partial(self) -> None:
+        for path in [self.partial_file, self.partial_file + ".json"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def complete(self, fingerprint: Optional[Text]) -> None:
+        """Replaces the stored archive with the completely downloaded one."""
+
+        # the fingerprint is removed first, so that a crash in between never
+        # pairs the old fingerprint with the new archive
+        if os.path.exists(self.model_file + ".json"):
+            os.remove(self.model_file + ".json")
+        os.replace(self.partial_file, self.model_file)
+        self._write_metadata(self.model_file, {"fingerprint": fingerprint})
+        os.remove(self.partial_file + ".json")
+
+
+def _expected_checksums(headers: Any) -> Dict[Text, Text]:
+    """Returns the checksums of the `Digest` header, e.g.
+    `Digest: sha-256=<base64 encoded hash>`."""
+
+    checksums = {}
+    for digest in headers.getall("Digest", []):
+        for value in digest.split(","):
+            algorithm, _, encoded = value.strip().partition("=")
+            if algorithm.lower() in ["md5", "sha-256"] and encoded:
+                checksums[algorithm.lower()] = encoded
+    return checksums
+
+
+async def _download_model(
+    resp: aiohttp.ClientResponse, download: _ModelDownload, resume: bool
+) -> bool:
+    """Streams a model archive from the model server to disk.
+
+    Returns `True` if the archive was downloaded completely and its size and
+    checksums match the ones announced by the model server."""
+
+    fingerprint = resp.headers.get("ETag")
+    # hashing the partial archive of a resumed download reads it from disk
+    checksums = await asyncio.get_event_loop().run_in_executor(
+        None, download.start, fingerprint, resume
+    )
+
+    with open(download.partial_file, "ab" if resume else "wb") as f:
+        async for chunk in resp.content.iter_chunked(MODEL_DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            for checksum in checksums.values():
+                checksum.update(chunk)
+        size = f.tell()
+
+    expected_size = resp.headers.get("Content-Length")
+    if resp.status == 206:
+        # e.g. `Content-Range: bytes 1000-9999/10000`
+        expected_size = resp.headers.get("Content-Range", "").rpartition("/")[2]
+
+    if expected_size and expected_size.isdigit() and int(expected_size) != size:
+        logger.warning(
+            "Downloaded {} bytes of the model, but the model server announced {} "
+            "bytes.".format(size, expected_size)
+        )
+        if size > int(expected_size):
+            download.discard_partial()
+        # otherwise the remaining bytes are requested by the next pull
+        return False
+
+    for algorithm, expected in _expected_checksums(resp.headers).items():
+        actual = base64.b64encode(checksums[algorithm].digest()).decode("ascii")
+        if actual != expected:
+            logger.warning(
+                "The {} checksum of the downloaded model does not match the "
+                "checksum announced by the model server.".format(algorithm)
+            )
+            download.discard_partial()
+            registry.increment("model_download.checksum_failures")
+            return False
+
+    download.complete(fingerprint)
+    return True
+
+
 async def _pull_model_and_fingerprint(
     model_server: EndpointConfig, fingerprint: Optional[Text]
 ) -> Optional[Tuple[Text, Text]]:
     """Queries the model server.
 
-    Returns the temporary model directory and value of the response's <ETag> header
+    Returns the model directory and value of the response's <ETag> header
     which contains the model hash. Returns `None` if no new model is found.
+
+    The model is streamed to the download directory of the model server. An
+    interrupted download is resumed by the next pull. If the server was
+    restarted and the model server still serves the stored model, the stored
+    model is used without downloading it again.
     """
 
-    headers = {"If-None-Match": fingerprint}
+    download = _ModelDownload(model_server.url)
+    if not download.lock():
+        logger.debug("Another process is pulling the model already.")
+        return None
+
+    try:
+        return await _pull_model(model_server, fingerprint, download)
+    finally:
+        download.unlock()
+
+
+async def _pull_model(
+    model_server: EndpointConfig, fingerprint: Optional[Text], download: _ModelDownload
+) -> Optional[Tuple[Text, Text]]:
+    stored_fingerprint = download.stored_fingerprint()
+    headers = {"If-None-Match": fingerprint or stored_fingerprint}
+
+    resumable_size, resumable_fingerprint = download.resumable()
+    if resumable_size:
+        headers["Range"] = "bytes={}-".format(resumable_size)
+        # the server sends the whole model if the fingerprint changed meanwhile
+        headers["If-Range"] = resumable_fingerprint
+
+    headers = {k: v for k, v in headers.items() if v is not None}
 
     logger.debug("Requesting model from server {}...".format(model_server.url))
 
@@ -151,6 +590,18 @@ async def _pull_model_and_fingerprint(
             ) as resp:
 
                 if resp.status in [204, 304]:
+                    if not fingerprint and stored_fingerprint:
+                        logger.debug(
+                            "Model server returned {} status code, using the "
+                            "previously downloaded model with fingerprint {}."
+                            "".format(resp.status, stored_fingerprint)
+                        )
+                        registry.increment("model_download.reused")
+                        model_directory = await _unpack_pulled_model_async(
+                            download.model_file
+                        )
+                        return model_directory, stored_fingerprint
+
                     logger.debug(
                         "Model server returned {} status code, "
                         "indicating that no new model is available. "
@@ -165,7 +616,14 @@ async def _pull_model_and_fingerprint(
                         "and tag combination yet."
                     )
                     return None
-                elif resp.status != 200:
+                elif resp.status == 416:
+                    logger.debug(
+                        "Model server can't resume the download of the model. "
+                        "Downloading the whole model with the next pull..."
+                    )
+                    download.discard_partial()
+                    return None
+                elif resp.status not in [200, 206]:
                     logger.debug(
                         "Tried to fetch model from server, but server response "
                         "status code is {}. We'll retry later..."
@@ -173,18 +631,32 @@ async def _pull_model_and_fingerprint(
                     )
                     return None
 
-                model_directory = tempfile.mkdtemp()
-                rasa.utils.io.unarchive(await resp.read(), model_directory)
+                resume = resp.status == 206
+                if resume:
+                    logger.debug(
+                        "Resuming the download of the model after {} bytes."
+                        "".format(resumable_size)
+                    )
+                    registry.increment("model_download.resumed")
+
+                with registry.measure("model_download.latency"):
+                    completed = await _download_model(resp, download, resume)
+                if not completed:
+                    return None
+
+                model_directory = await _unpack_pulled_model_async(
+                    download.model_file
+                )
                 logger.debug(
                     "Unzipped model to '{}'".format(os.path.abspath(model_directory))
                 )
 
                 # get the new fingerprint
                 new_fingerprint = resp.headers.get("ETag")
-                # return new tmp model directory and new fingerprint
+                # return new model directory and new fingerprint
                 return model_directory, new_fingerprint
 
-        except aiohttp.ClientError as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.debug(
                 "Tried to fetch model from server, but "
                 "couldn't reach server. We'll retry later... "
@@ -193,6 +665,25 @@ async def _pull_model_and_fingerprint(
             return None
 
 
+def _unpack_pulled_model(model_file: Text) -> Text:
+    """Unpacks a model received from the model server using the model cache.
+
+    Models which are no tar archives are unpacked into a temporary directory."""
+
+    try:
+        return unpack_model(model_file, use_cache=True)
+    except tarfile.TarError:
+        with open(model_file, "rb") as f:
+            return rasa.utils.io.unarchive(f.read(), tempfile.mkdtemp())
+
+
+async def _unpack_pulled_model_async(model_file: Text) -> Text:
+    """Unpacks a pulled model without blocking the event loop."""
+
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, _unpack_pulled_model, model_file)
+
+
 async def _run_model_pulling_worker(
     model_server: EndpointConfig, agent: "Agent"
 ) -> None:
@@ -227,6 +718,7 @@ async def load_agent(
     interpreter: Optional[NaturalLanguageInterpreter] = None,
     generator: Union[EndpointConfig, NaturalLanguageGenerator] = None,
     tracker_store: Optional[TrackerStore] = None,
+    lock_store: Optional[LockStore] = None,
     action_endpoint: Optional[EndpointConfig] = None,
 ):
     try:
@@ -236,6 +728,7 @@ async def load_agent(
                     interpreter=interpreter,
                     generator=generator,
                     tracker_store=tracker_store,
+                    lock_store=lock_store,
                     action_endpoint=action_endpoint,
                     model_server=model_server,
                     remote_storage=remote_storage,
@@ -250,6 +743,7 @@ async def load_agent(
                 interpreter=interpreter,
                 generator=generator,
                 tracker_store=tracker_store,
+                lock_store=lock_store,
                 action_endpoint=action_endpoint,
                 model_server=model_server,
             )
@@ -260,6 +754,7 @@ async def load_agent(
                 interpreter=interpreter,
                 generator=generator,
                 tracker_store=tracker_store,
+                lock_store=lock_store,
                 action_endpoint=action_endpoint,
                 model_server=model_server,
                 remote_storage=remote_storage,
@@ -288,6 +783,7 @@ class Agent(object):
         interpreter: Optional[NaturalLanguageInterpreter] = None,
         generator: Union[EndpointConfig, NaturalLanguageGenerator, None] = None,
         tracker_store: Optional[TrackerStore] = None,
+        lock_store: Optional[LockStore] = None,
         action_endpoint: Optional[EndpointConfig] = None,
         fingerprint: Optional[Text] = None,
         model_directory: Optional[Text] = None,
@@ -309,13 +805,14 @@ class Agent(object):
 
         self.nlg = NaturalLanguageGenerator.create(generator, self.domain)
         self.tracker_store = self.create_tracker_store(tracker_store, self.domain)
+        self.lock_store = self._create_lock_store(lock_store)
         self.action_endpoint = action_endpoint
-        self.conversations_in_processing = {}
 
         self._set_fingerprint(fingerprint)
         self.model_directory = model_directory
         self.model_server = model_server
         self.remote_storage = remote_storage
+        self.model_usage = ModelUsage()
 
     def update_model(
         self,
@@ -327,6 +824,7 @@ class Agent(object):
     ) -> None:
         self.domain = domain
         self.policy_ensemble = policy_ensemble
+        self.model_usage = ModelUsage()
 
         if interpreter:
             self.interpreter = NaturalLanguageInterpreter.create(interpreter)
@@ -347,6 +845,7 @@ class Agent(object):
         interpreter: Optional[NaturalLanguageInterpreter] = None,
         generator: Union[EndpointConfig, NaturalLanguageGenerator] = None,
         tracker_store: Optional[TrackerStore] = None,
+        lock_store: Optional[LockStore] = None,
         action_endpoint: Optional[EndpointConfig] = None,
         model_server: Optional[EndpointConfig] = None,
         remote_storage: Optional[Text] = None,
@@ -389,6 +888,7 @@ class Agent(object):
             interpreter=interpreter,
             generator=generator,
             tracker_store=tracker_store,
+            lock_store=lock_store,
             action_endpoint=action_endpoint,
             model_directory=model_path,
             model_server=model_server,
@@ -439,9 +939,10 @@ class Agent(object):
 
         """
 
-        processor = self.create_processor()
-        message = UserMessage(message_data)
-        return await processor._parse_message(message, tracker)
+        with self.model_usage:
+            processor = self.create_processor()
+            message = UserMessage(message_data)
+            return await processor._parse_message(message, tracker)
 
     async def handle_message(
         self,
@@ -468,43 +969,29 @@ class Agent(object):
         if not self.is_ready(allow_nlu_only=True):
             return noop(message)
 
-        processor = self.create_processor(message_preprocessor)
+        with self.model_usage as usage:
+            processor = self.create_processor(message_preprocessor)
 
-        # get the lock for the current conversation
-        lock = self.conversations_in_processing.get(message.sender_id)
-        if not lock:
-            logger.debug(
-                "Created a new lock for conversation '{}'".format(message.sender_id)
-            )
-            lock = LockCounter()
-            self.conversations_in_processing[message.sender_id] = lock
+            # this makes sure that there can always only be one coroutine handling
+            # a conversation at any point in time and that messages are processed
+            # in the order in which they arrived. If the lock store is shared, this
+            # also holds across multiple processes.
+            async with self.lock_store.lock(message.sender_id):
+                start = time.time()
+                responses = await processor.handle_message(message)
+                usage.observe(time.time() - start)
 
-        try:
-            async with lock:
-                # this makes sure that there can always only be one coroutine
-                # handling a conversation at any point in time
-                # Note: this doesn't support multi-processing, it just works
-                # for coroutines. If there are multiple processes handling
-                # messages, an external system needs to make sure messages
-                # for the same conversation are always processed by the same
-                # process.
-                return await processor.handle_message(message)
-        finally:
-            if not lock.is_someone_waiting():
-                # dispose of the lock if no one needs it to avoid
-                # accumulating locks
-                del self.conversations_in_processing[message.sender_id]
-                logger.debug(
-                    "Deleted lock for conversation '{}' (unused)"
-                    "".format(message.sender_id)
-                )
+            if usage.swapped_in:
+                registry.set_gauge("model.swap.latency_after", usage.mean_latency)
+            return responses
 
     # noinspection PyUnusedLocal
     def predict_next(self, sender_id: Text, **kwargs: Any) -> Optional[Dict[Text, Any]]:
         """Handle a single message."""
 
-        processor = self.create_processor()
-        return processor.predict_next(sender_id)
+        with self.model_usage:
+            processor = self.create_processor()
+            return processor.predict_next(sender_id)
 
     # noinspection PyUnusedLocal
     async def log_message(
@@ -515,8 +1002,9 @@ class Agent(object):
     ) -> DialogueStateTracker:
         """Append a message to a dialogue - does not predict actions."""
 
-        processor = self.create_processor(message_preprocessor)
-        return await processor.log_message(message)
+        with self.model_usage:
+            processor = self.create_processor(message_preprocessor)
+            return await processor.log_message(message)
 
     async def execute_action(
         self,
@@ -528,10 +1016,11 @@ class Agent(object):
     ) -> DialogueStateTracker:
         """Handle a single message."""
 
-        processor = self.create_processor()
-        return await processor.execute_action(
-            sender_id, action, output_channel, self.nlg, policy, confidence
-        )
+        with self.model_usage:
+            processor = self.create_processor()
+            return await processor.execute_action(
+                sender_id, action, output_channel, self.nlg, policy, confidence
+            )
 
     async def handle_text(
         self,
@@ -877,6 +1366,13 @@ class Agent(object):
         else:
             return InMemoryTrackerStore(domain)
 
+    @staticmethod
+    def _create_lock_store(store: Optional[LockStore]) -> LockStore:
+        if store is not None:
+            return store
+
+        return InMemoryLockStore()
+
     @staticmethod
     def _create_ensemble(
         policies: Union[List[Policy], PolicyEnsemble, None]
@@ -901,27 +1397,34 @@ class Agent(object):
         interpreter: Optional[NaturalLanguageInterpreter] = None,
         generator: Union[EndpointConfig, NaturalLanguageGenerator] = None,
         tracker_store: Optional[TrackerStore] = None,
+        lock_store: Optional[LockStore] = None,
         action_endpoint: Optional[EndpointConfig] = None,
         model_server: Optional[EndpointConfig] = None,
         remote_storage: Optional[Text] = None,
     ) -> "Agent":
-        if os.path.isfile(model_path):
-            model_archive = model_path
+        if is_unpacked_model(model_path):
+            # e.g. the model was already unpacked for several server workers
+            unpacked_model = model_path
         else:
-            model_archive = get_latest_model(model_path)
-
-        if model_archive is None:
-            logger.warning("Could not load local model in '{}'".format(model_path))
-            return Agent()
+            if os.path.isfile(model_path):
+                model_archive = model_path
+            else:
+                model_archive = get_latest_model(model_path)
+
+            if model_archive is None:
+                logger.warning(
+                    "Could not load local model in '{}'".format(model_path)
+                )
+                return Agent()
 
-        working_directory = tempfile.mkdtemp()
-        unpacked_model = unpack_model(model_archive, working_directory)
+            unpacked_model = unpack_model(model_archive, use_cache=True)
 
         return Agent.load(
             unpacked_model,
             interpreter=interpreter,
             generator=generator,
             tracker_store=tracker_store,
+            lock_store=lock_store,
             action_endpoint=action_endpoint,
             model_server=model_server,
             remote_storage=remote_storage,
@@ -934,6 +1437,7 @@ class Agent(object):
         interpreter: Optional[NaturalLanguageInterpreter] = None,
         generator: Union[EndpointConfig, NaturalLanguageGenerator] = None,
         tracker_store: Optional[TrackerStore] = None,
+        lock_store: Optional[LockStore] = None,
         action_endpoint: Optional[EndpointConfig] = None,
         model_server: Optional[EndpointConfig] = None,
     ) -> Optional["Agent"]:
@@ -950,6 +1454,7 @@ class Agent(object):
                 interpreter=interpreter,
                 generator=generator,
                 tracker_store=tracker_store,
+                lock_store=lock_store,
                 action_endpoint=action_endpoint,
                 model_server=model_server,
                 remote_storage=remote_storage,
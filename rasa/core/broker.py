@@ -1,12 +1,47 @@
+import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional, Text
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from typing import Any, Deque, Dict, List, Optional, Text, Tuple
 
 from rasa.utils.common import class_from_module_path
 from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.metrics import registry
 
 logger = logging.getLogger(__name__)
 
+# maximum number of events waiting to be published in the background
+DEFAULT_MAX_BUFFER_SIZE = 10000
+# maximum number of events published at once by the background publisher
+DEFAULT_MAX_BATCH_SIZE = 100
+# seconds the background publisher waits for further events of a batch
+DEFAULT_FLUSH_INTERVAL = 0.1
+# maximum seconds between two attempts to reconnect to the broker
+MAX_RECONNECT_DELAY = 30
+
+# what a `QueuedEventChannel` does with events which do not fit into its queue
+DROP_POLICY = "drop"
+BLOCK_POLICY = "block"
+SPILL_POLICY = "spill"
+FULL_QUEUE_POLICIES = [DROP_POLICY, BLOCK_POLICY, SPILL_POLICY]
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_PUBLISH_BATCH_SIZE = 100
+DEFAULT_SPILL_FILE_NAME = "rasa_event_spill.log"
+
+# settings of the endpoint configuration which configure the queue
+QUEUE_SETTINGS = [
+    "max_queue_size",
+    "full_queue_policy",
+    "spill_path",
+    "publish_batch_size",
+]
+
 
 def from_endpoint_config(
     broker_config: Optional[EndpointConfig]
@@ -15,6 +50,8 @@ def from_endpoint_config(
 
     if broker_config is None:
         return None
+    elif broker_config.kwargs.get("queued"):
+        return QueuedEventChannel.from_endpoint_config(broker_config)
     elif broker_config.type == "pika" or broker_config.type is None:
         return PikaProducer.from_endpoint_config(broker_config)
     elif broker_config.type.lower() == "sql":
@@ -55,8 +92,40 @@ class EventChannel(object):
 
         raise NotImplementedError("Event broker must implement the `publish` method.")
 
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Publishes several events. Brokers override this to send them at once."""
+
+        for event in events:
+            self.publish(event)
+
+    async def publish_many(self, events: List[Dict[Text, Any]]) -> None:
+        """Publishes several events without blocking the event loop.
+
+        By default, the events are published by `publish_batch` in a thread."""
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.publish_batch, events)
+
+    async def flush(self) -> None:
+        """Waits until the events handed to the broker were published."""
+
+        pass
+
+    def close(self) -> None:
+        """Releases the connections of the broker."""
+
+        pass
+
 
 class PikaProducer(EventChannel):
+    """Publish events to a RabbitMQ queue using pika.
+
+    The connection to RabbitMQ is kept open between events and reopened if it
+    was lost. With `background_publishing`, events are collected in a buffer
+    of at most `max_buffer_size` events and published in batches by a
+    background thread, so that saving a tracker never waits for RabbitMQ.
+    Events which do not fit into the full buffer are dropped."""
+
     def __init__(
         self,
         host,
@@ -64,6 +133,10 @@ class PikaProducer(EventChannel):
         password,
         queue="rasa_core_events",
         loglevel=logging.WARNING,
+        background_publishing: bool = False,
+        max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
     ):
         import pika
 
@@ -75,6 +148,14 @@ class PikaProducer(EventChannel):
         self.channel = None
         self.credentials = pika.PlainCredentials(username, password)
 
+        self.background_publishing = background_publishing
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self._buffer = Queue(maxsize=max_buffer_size)
+        self._publisher = None  # type: Optional[threading.Thread]
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
     @classmethod
     def from_endpoint_config(
         cls, broker_config: Optional["EndpointConfig"]
@@ -85,10 +166,108 @@ class PikaProducer(EventChannel):
         return cls(broker_config.url, **broker_config.kwargs)
 
     def publish(self, event):
-        self._open_connection()
-        self._publish(json.dumps(event))
+        body = json.dumps(event)
+
+        if not self.background_publishing:
+            self._publish_batch([body])
+            return
+
+        self._start_publisher()
+        try:
+            self._buffer.put_nowait(body)
+        except Full:
+            registry.increment("event_broker.dropped")
+            logger.warning(
+                "The event buffer of the pika producer is full. Dropping event "
+                "for queue '{}'.".format(self.queue)
+            )
+
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        if not self.background_publishing:
+            self._publish_batch([json.dumps(event) for event in events])
+            return
+
+        for event in events:
+            self.publish(event)
+
+    def close(self) -> None:
+        """Publish the buffered events and close the connection."""
+
+        self._stopped.set()
+        if self._publisher is not None:
+            self._publisher.join()
+            self._publisher = None
         self._close()
 
+    def _start_publisher(self) -> None:
+        with self._lock:
+            if self._publisher is None:
+                self._stopped.clear()
+                self._publisher = threading.Thread(
+                    target=self._run_publisher, name="pika-producer", daemon=True
+                )
+                self._publisher.start()
+
+    def _run_publisher(self) -> None:
+        while not (self._stopped.is_set() and self._buffer.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._publish_batch(batch)
+            elif self.connection is not None and self.connection.is_open:
+                # let pika send its heartbeats while there are no events
+                try:
+                    self.connection.process_data_events(0)
+                except Exception:
+                    self._close()
+
+    def _next_batch(self) -> List[Text]:
+        """Wait for the next event and collect the events buffered after it."""
+
+        try:
+            batch = [self._buffer.get(timeout=self.flush_interval)]
+        except Empty:
+            return []
+
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._buffer.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _publish_batch(self, bodies: List[Text]) -> None:
+        """Publish `bodies` using the open connection.
+
+        The connection is reopened once if publishing fails. In the background
+        thread, failed batches are retried until the producer is closed."""
+
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if self.connection is None or not self.connection.is_open:
+                    self._open_connection()
+                for body in bodies:
+                    self._publish(body)
+                registry.increment("event_broker.published", len(bodies))
+                return
+            except Exception as e:
+                self._close()
+                gives_up = not self.background_publishing or self._stopped.is_set()
+                if gives_up and attempts > 1:
+                    registry.increment("event_broker.failed", len(bodies))
+                    logger.error(
+                        "Failed to publish {} event(s) to queue '{}' at '{}'. "
+                        "Error: {}".format(len(bodies), self.queue, self.host, e)
+                    )
+                    return
+                logger.debug(
+                    "Lost connection to RabbitMQ at '{}'. Reconnecting. "
+                    "Error: {}".format(self.host, e)
+                )
+                if attempts > 1:
+                    self._stopped.wait(min(attempts, MAX_RECONNECT_DELAY))
+
     def _open_connection(self):
         import pika
 
@@ -110,7 +289,12 @@ class PikaProducer(EventChannel):
         )
 
     def _close(self):
-        self.connection.close()
+        connection, self.connection, self.channel = self.connection, None, None
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.debug("Failed to close the RabbitMQ connection: {}".format(e))
 
 
 class FileProducer(EventChannel):
@@ -156,6 +340,13 @@ class FileProducer(EventChannel):
         self.event_logger.info(json.dumps(event))
         self.event_logger.handlers[0].flush()
 
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Write events to file, one event per line."""
+
+        if events:
+            self.event_logger.info("\n".join(json.dumps(event) for event in events))
+            self.event_logger.handlers[0].flush()
+
 
 class KafkaProducer(EventChannel):
     def __init__(
@@ -197,6 +388,12 @@ class KafkaProducer(EventChannel):
         self._publish(event)
         self._close()
 
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        self._create_producer()
+        for event in events:
+            self._publish(event)
+        self._close()
+
     def _create_producer(self):
         import kafka
 
@@ -281,3 +478,267 @@ class SQLProducer(EventChannel):
             )
         )
         self.session.commit()
+
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Stores several events within one transaction."""
+
+        self.session.add_all(
+            [
+                self.SQLBrokerEvent(
+                    sender_id=event.get("sender_id"), data=json.dumps(event)
+                )
+                for event in events
+            ]
+        )
+        self.session.commit()
+
+
+def _do_nothing() -> None:
+    pass
+
+
+class QueuedEventChannel(EventChannel):
+    """Hands events to another event channel without blocking the event loop.
+
+    The events of all conversations are collected in one queue of at most
+    `max_queue_size` events. A background task takes batches of up to
+    `publish_batch_size` events from the queue and publishes them with the
+    wrapped channel within a worker thread.
+
+    If the queue is full, the `full_queue_policy` decides what happens:
+    `drop` discards the events, `block` makes `publish_many` wait until the
+    queue has room for them and `spill` appends them to the file `spill_path`.
+    Spilled events are published once the queue is empty again. Synchronous
+    calls on the running event loop (e.g. by `TrackerStore.save`) can't wait
+    without blocking the loop, with the `block` policy they spill the events.
+
+    Without a running event loop, events are published immediately.
+
+    Channels which buffer events themselves, like a `PikaProducer` with
+    `background_publishing`, can't be queued."""
+
+    def __init__(
+        self,
+        event_channel: EventChannel,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        full_queue_policy: Text = DROP_POLICY,
+        spill_path: Optional[Text] = None,
+        publish_batch_size: int = DEFAULT_PUBLISH_BATCH_SIZE,
+    ) -> None:
+        if full_queue_policy not in FULL_QUEUE_POLICIES:
+            raise ValueError(
+                "Unknown policy '{}' for full event queues. Use one of {}."
+                "".format(full_queue_policy, FULL_QUEUE_POLICIES)
+            )
+
+        if getattr(event_channel, "background_publishing", False):
+            raise ValueError(
+                "The event channel publishes its events in the background "
+                "already. Use either `queued` or `background_publishing`."
+            )
+
+        self.event_channel = event_channel
+        self.max_queue_size = max(1, max_queue_size)
+        self.full_queue_policy = full_queue_policy
+        # every process spills into its own file
+        self.spill_path = "{}.{}".format(
+            spill_path or DEFAULT_SPILL_FILE_NAME, os.getpid()
+        )
+        self.publish_batch_size = max(1, publish_batch_size)
+
+        self._queue = deque()  # type: Deque[Tuple[float, Dict[Text, Any]]]
+        self._spilled = 0
+        # the wrapped channel is only ever used by this thread
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._worker = None  # type: Optional[asyncio.Future]
+        self._worker_loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._has_events = None  # type: Optional[asyncio.Event]
+        self._has_space = None  # type: Optional[asyncio.Event]
+
+    @classmethod
+    def from_endpoint_config(
+        cls, broker_config: EndpointConfig
+    ) -> Optional["QueuedEventChannel"]:
+        config = broker_config.copy()
+        config.type = broker_config.type
+        settings = {
+            key: config.kwargs.pop(key)
+            for key in QUEUE_SETTINGS
+            if key in config.kwargs
+        }
+        config.kwargs.pop("queued", None)
+
+        event_channel = from_endpoint_config(config)
+        if event_channel is None:
+            return None
+
+        return cls(event_channel, **settings)
+
+    def publish(self, event: Dict[Text, Any]) -> None:
+        self.publish_batch([event])
+
+    def publish_batch(self, events: List[Dict[Text, Any]]) -> None:
+        """Queues `events` without waiting for the wrapped channel.
+
+        Events which don't fit into the full queue are never waited for, as
+        this would block the event loop. With the `block` policy, they are
+        spilled, which keeps the events as well as their order."""
+
+        loop = self._running_loop()
+        if loop is None:
+            self._executor.submit(self._publish_events, events).result()
+            return
+
+        self._start_worker(loop)
+        remaining = self._put(events)
+        if remaining and self.full_queue_policy == BLOCK_POLICY:
+            self._spill(remaining)
+        elif remaining:
+            self._handle_full_queue(remaining)
+
+    async def publish_many(self, events: List[Dict[Text, Any]]) -> None:
+        """Queues `events`.
+
+        With the `block` policy, this waits until the queue has room for all
+        events."""
+
+        self._start_worker(asyncio.get_event_loop())
+        remaining = self._put(events)
+        while remaining and self.full_queue_policy == BLOCK_POLICY:
+            self._has_space.clear()
+            await self._has_space.wait()
+            remaining = self._put(remaining)
+
+        if remaining:
+            self._handle_full_queue(remaining)
+
+    async def flush(self) -> None:
+        """Publishes all queued and spilled events."""
+
+        while self._queue or self._spilled:
+            await self._publish_next()
+
+        # wait for the batch the worker might still be publishing
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self._executor, _do_nothing)
+        await self.event_channel.flush()
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=True)
+        self.event_channel.close()
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            return None
+        return loop if loop.is_running() else None
+
+    def _start_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        if (
+            self._worker is None
+            or self._worker.done()
+            or self._worker_loop is not loop
+        ):
+            self._has_events = asyncio.Event()
+            self._has_space = asyncio.Event()
+            self._worker_loop = loop
+            self._worker = asyncio.ensure_future(self._publish_queued_events())
+
+    def _put(self, events: List[Dict[Text, Any]]) -> List[Dict[Text, Any]]:
+        """Appends as many events as fit into the queue, returns the others."""
+
+        if self._spilled:
+            # keep the order of the events until the spilled ones are published
+            return events
+
+        n_fitting = max(0, self.max_queue_size - len(self._queue))
+        now = time.time()
+        self._queue.extend((now, event) for event in events[:n_fitting])
+        self._update_queue_length()
+        if n_fitting:
+            self._has_events.set()
+        return events[n_fitting:]
+
+    def _handle_full_queue(self, events: List[Dict[Text, Any]]) -> None:
+        if self.full_queue_policy == SPILL_POLICY:
+            self._spill(events)
+        else:
+            registry.increment("event_broker.dropped", len(events))
+            logger.warning(
+                "The event queue is full. Dropping {} event(s).".format(len(events))
+            )
+
+    def _spill(self, events: List[Dict[Text, Any]]) -> None:
+        now = time.time()
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps([now, event]) + "\n")
+
+        self._spilled += len(events)
+        registry.increment("event_broker.spilled", len(events))
+        self._has_events.set()
+
+    def _update_queue_length(self) -> None:
+        registry.set_gauge("event_broker.queue_length", len(self._queue))
+
+    async def _publish_queued_events(self) -> None:
+        while True:
+            if not self._queue and not self._spilled:
+                self._has_events.clear()
+                await self._has_events.wait()
+            await self._publish_next()
+
+    async def _publish_next(self) -> None:
+        """Publishes the next batch of queued events or the spilled events."""
+
+        loop = asyncio.get_event_loop()
+
+        if self._queue:
+            n_events = min(len(self._queue), self.publish_batch_size)
+            batch = [self._queue.popleft() for _ in range(n_events)]
+            self._update_queue_length()
+            self._has_space.set()
+            # taken events have to be published even if the worker is cancelled
+            await asyncio.shield(
+                loop.run_in_executor(self._executor, self._publish_timed_events, batch)
+            )
+        elif self._spilled:
+            # events spilled from now on go to a new file
+            publishing_path = self.spill_path + ".publishing"
+            os.replace(self.spill_path, publishing_path)
+            self._spilled = 0
+            await asyncio.shield(
+                loop.run_in_executor(
+                    self._executor, self._publish_spill_file, publishing_path
+                )
+            )
+
+    def _publish_spill_file(self, path: Text) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            spilled = [tuple(json.loads(line)) for line in f if line.strip()]
+
+        for start in range(0, len(spilled), self.publish_batch_size):
+            self._publish_timed_events(
+                spilled[start : start + self.publish_batch_size]
+            )
+        os.remove(path)
+
+    def _publish_timed_events(
+        self, batch: List[Tuple[float, Dict[Text, Any]]]
+    ) -> None:
+        self._publish_events([event for _, event in batch])
+        registry.observe("event_broker.publish_lag", time.time() - batch[0][0])
+
+    def _publish_events(self, events: List[Dict[Text, Any]]) -> None:
+        try:
+            self.event_channel.publish_batch(events)
+        except Exception as e:
+            registry.increment("event_broker.failed", len(events))
+            logger.error(
+                "Failed to publish {} event(s). Error: {}".format(len(events), e)
+            )
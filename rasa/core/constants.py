@@ -4,6 +4,12 @@ DEFAULT_SERVER_FORMAT = "http://localhost:{}"
 
 DEFAULT_SERVER_URL = DEFAULT_SERVER_FORMAT.format(DEFAULT_SERVER_PORT)
 
+DEFAULT_SERVER_WORKERS = 1
+
+# synthetic messages which are handled by a pulled model before it is used
+DEFAULT_WARM_UP_MESSAGES = ["hello"]
+WARM_UP_SENDER_ID = "__warm_up__"
+
 DEFAULT_NLU_FALLBACK_THRESHOLD = 0.0
 
 DEFAULT_CORE_FALLBACK_THRESHOLD = 0.0
@@ -12,6 +18,9 @@ DEFAULT_FALLBACK_ACTION = "action_default_fallback"
 
 DEFAULT_REQUEST_TIMEOUT = 60 * 5  # 5 minutes
 
+# size of the chunks in which models are streamed from the model server to disk
+MODEL_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 REQUESTED_SLOT = "requested_slot"
 
 # start of special user message section
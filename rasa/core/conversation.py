@@ -1,5 +1,5 @@
 import typing
-from typing import List
+from typing import Any, Dict, List, Optional
 from typing import Text
 
 if typing.TYPE_CHECKING:
@@ -9,11 +9,18 @@ if typing.TYPE_CHECKING:
 class Dialogue(object):
     """A dialogue comprises a list of Turn objects"""
 
-    def __init__(self, name: Text, events: List["Event"]) -> None:
+    def __init__(
+        self,
+        name: Text,
+        events: List["Event"],
+        snapshot: Optional[Dict[Text, Any]] = None,
+    ) -> None:
         # This function initialises the dialogue with
-        # the dialogue name and the event list.
+        # the dialogue name, the event list and optionally
+        # a snapshot of the tracker state after these events.
         self.name = name
         self.events = events
+        self.snapshot = snapshot
 
     def __str__(self) -> Text:
 
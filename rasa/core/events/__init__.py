@@ -72,8 +72,38 @@ def first_key(d, default_key):
         return None
 
 
+# event classes by their type names, built on the first lookup and dropped
+# whenever another event class is defined (e.g. custom events being imported)
+_event_types = None  # type: Optional[Dict[Text, Type[Event]]]
+
+
+def _event_types_by_name() -> Dict[Text, Type["Event"]]:
+    global _event_types
+
+    event_types = _event_types
+    if event_types is None:
+        event_types = {}
+        for cls in utils.all_subclasses(Event):
+            # the first class with a type name wins, as the subclasses are
+            # ordered by their depth in the hierarchy and their definition
+            event_types.setdefault(cls.type_name, cls)
+        _event_types = event_types
+    return event_types
+
+
+class _EventType(type):
+    """Metaclass of the events which invalidates the lookup of the event
+    classes by their type names when another event class is defined."""
+
+    def __init__(cls, name, bases, namespace):
+        global _event_types
+
+        super(_EventType, cls).__init__(name, bases, namespace)
+        _event_types = None
+
+
 # noinspection PyProtectedMember
-class Event(object):
+class Event(object, metaclass=_EventType):
     """Events describe everything that occurs in
     a conversation and tell the :class:`rasa.core.trackers.DialogueStateTracker`
     how to update its state."""
@@ -111,9 +141,6 @@ class Event(object):
 
         event_name = parameters.get("event")
         if event_name is not None:
-            copied = parameters.copy()
-            del copied["event"]
-
             event = Event.resolve_by_type(event_name, default)
             if event:
                 return event._from_parameters(parameters)
@@ -153,12 +180,11 @@ class Event(object):
     def resolve_by_type(
         type_name: Text, default: Optional[Type["Event"]] = None
     ) -> Optional[Type["Event"]]:
-        """Returns a slots class by its type name."""
-        from rasa.core import utils
+        """Returns an event class by its type name."""
 
-        for cls in utils.all_subclasses(Event):
-            if cls.type_name == type_name:
-                return cls
+        cls = _event_types_by_name().get(type_name)
+        if cls is not None:
+            return cls
         if type_name == "topic":
             return None  # backwards compatibility to support old TopicSet evts
         elif default is not None:
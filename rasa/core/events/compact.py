@@ -0,0 +1,163 @@
+"""Compact binary encoding of events.
+
+Events are encoded as the values of their ``as_dict`` representation. The keys
+of the dictionaries are stored once for every distinct set of keys (a
+"layout"), and event type names, action, slot, policy and intent names are
+stored once in a name table and referenced by their index. The intent ranking
+of user messages is stored as pairs of intent index and confidence.
+
+The encoded structure only contains builtin types and is packed with the
+binary pickle protocol, which keeps the decoding in C. The payload starts
+with a header which contains the version of the format. The event classes are
+resolved through the lookup of `Event.resolve_by_type`."""
+
+import itertools
+import pickle
+from typing import Any, Dict, Iterable, List, Text, Tuple
+
+from rasa.core.events import Event
+
+# identifies a compact event payload, followed by one byte with the version
+MAGIC = b"RCEV"
+FORMAT_VERSION = 1
+HEADER = MAGIC + bytes([FORMAT_VERSION])
+
+PICKLE_PROTOCOL = 4
+
+# keys of the serialised events whose string values are stored in the name table
+NAME_KEYS = frozenset(["event", "name", "policy"])
+PARSE_DATA_KEY = "parse_data"
+
+
+class _Encoder(object):
+    """Collects the name table and the layouts while encoding events."""
+
+    def __init__(self) -> None:
+        self.names = []  # type: List[Text]
+        self._name_indices = {}  # type: Dict[Text, int]
+        self.layouts = []  # type: List[Tuple[Text, ...]]
+        self._layout_indices = {}  # type: Dict[Tuple[Text, ...], int]
+
+    def name(self, value: Any) -> Any:
+        """Reference a string by its index within the name table.
+
+        Values which are no strings are wrapped in a tuple, so that they can't
+        be confused with an index."""
+
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            return (value,)
+
+        index = self._name_indices.get(value)
+        if index is None:
+            index = self._name_indices[value] = len(self.names)
+            self.names.append(value)
+        return index
+
+    def intent(self, intent: Any) -> Any:
+        if (
+            isinstance(intent, dict)
+            and len(intent) == 2
+            and "name" in intent
+            and "confidence" in intent
+        ):
+            return self.name(intent["name"]), intent["confidence"]
+        return intent
+
+    def parse_data(self, parse_data: Any) -> Any:
+        if not isinstance(parse_data, dict):
+            return parse_data
+
+        encoded = dict(parse_data)
+        if "intent" in encoded:
+            encoded["intent"] = self.intent(encoded["intent"])
+        ranking = encoded.get("intent_ranking")
+        if isinstance(ranking, list):
+            encoded["intent_ranking"] = [self.intent(i) for i in ranking]
+        return encoded
+
+    def event(self, event: Event) -> Tuple:
+        data = event.as_dict()
+
+        keys = tuple(data.keys())
+        layout = self._layout_indices.get(keys)
+        if layout is None:
+            layout = self._layout_indices[keys] = len(self.layouts)
+            self.layouts.append(keys)
+
+        row = [layout]
+        for key, value in data.items():
+            if key in NAME_KEYS:
+                value = self.name(value)
+            elif key == PARSE_DATA_KEY:
+                value = self.parse_data(value)
+            row.append(value)
+        return tuple(row)
+
+
+def encode_events(evts: Iterable[Event]) -> bytes:
+    """Encode events into the compact binary format."""
+
+    encoder = _Encoder()
+    rows = [encoder.event(e) for e in evts]
+    payload = (encoder.names, encoder.layouts, rows)
+    return HEADER + pickle.dumps(payload, protocol=PICKLE_PROTOCOL)
+
+
+def _decode_name(value: Any, names: List[Text]) -> Any:
+    if value is None:
+        return None
+    if type(value) is int:
+        return names[value]
+    return value[0]
+
+
+def _decode_intent(intent: Any, names: List[Text]) -> Any:
+    if isinstance(intent, tuple):
+        return {"name": _decode_name(intent[0], names), "confidence": intent[1]}
+    return intent
+
+
+def _decode_parse_data(parse_data: Any, names: List[Text]) -> Any:
+    if not isinstance(parse_data, dict):
+        return parse_data
+
+    if "intent" in parse_data:
+        parse_data["intent"] = _decode_intent(parse_data["intent"], names)
+    ranking = parse_data.get("intent_ranking")
+    if isinstance(ranking, list):
+        parse_data["intent_ranking"] = [_decode_intent(i, names) for i in ranking]
+    return parse_data
+
+
+def decode_events(data: bytes) -> List[Event]:
+    """Decode events which were encoded with `encode_events`."""
+
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Data does not contain events in the compact format.")
+    version = data[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            "Can't decode events of the compact format version {}, only "
+            "version {} is supported.".format(version, FORMAT_VERSION)
+        )
+
+    names, layouts, rows = pickle.loads(memoryview(data)[len(HEADER) :])
+
+    decoded = []
+    for row in rows:
+        parameters = {}
+        for key, value in zip(layouts[row[0]], itertools.islice(row, 1, None)):
+            if key in NAME_KEYS:
+                value = _decode_name(value, names)
+            elif key == PARSE_DATA_KEY:
+                value = _decode_parse_data(value, names)
+            parameters[key] = value
+
+        cls = Event.resolve_by_type(parameters["event"])
+        event = cls._from_parameters(parameters) if cls else None
+        if event:
+            decoded.append(event)
+
+    return decoded
@@ -1,4 +1,5 @@
 import io
+import itertools
 import jsonpickle
 import logging
 import numpy as np
@@ -274,12 +275,17 @@ class TrackerFeaturizer(object):
         tracker: DialogueStateTracker,
         domain: Domain,
         is_binary_training: bool = False,
+        max_history: Optional[int] = None,
     ) -> List[Dict[Text, float]]:
         """Create states: a list of dictionaries.
             If use_intent_probabilities is False (default behaviour),
             pick the most probable intent out of all provided ones and
-            set its probability to 1.0, while all the others to 0.0."""
+            set its probability to 1.0, while all the others to 0.0.
+            If max_history is given, only the last max_history states
+            are created."""
         states = tracker.past_states(domain)
+        if max_history is not None and len(states) > max_history:
+            states = itertools.islice(states, len(states) - max_history, None)
 
         # during training we encounter only 1 or 0
         if not self.use_intent_probabilities and not is_binary_training:
@@ -623,7 +629,8 @@ class MaxHistoryTrackerFeaturizer(TrackerFeaturizer):
     ) -> List[List[Dict[Text, float]]]:
 
         trackers_as_states = [
-            self._create_states(tracker, domain) for tracker in trackers
+            self._create_states(tracker, domain, max_history=self.max_history)
+            for tracker in trackers
         ]
         trackers_as_states = [
             self.slice_state_history(states, self.max_history)
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple
+
+from rasa.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# inference stages which can be run outside of the event loop
+NLU_STAGE = "nlu"
+POLICY_STAGE = "policy"
+
+# run the inference directly on the event loop
+INLINE_EXECUTOR = "inline"
+# run the inference in a thread pool, TensorFlow and sklearn release the GIL
+THREAD_EXECUTOR = "thread"
+# run the inference in a process pool, suited for pure Python components
+PROCESS_EXECUTOR = "process"
+
+EXECUTOR_TYPES = [INLINE_EXECUTOR, THREAD_EXECUTOR, PROCESS_EXECUTOR]
+
+# the inference is only moved off the event loop if it was chosen explicitly
+DEFAULT_EXECUTOR_TYPE = INLINE_EXECUTOR
+
+# default maximum number of threads of a thread executor
+DEFAULT_MAX_THREAD_WORKERS = 4
+
+# a batch size of 1 disables the batching of concurrent calls
+DEFAULT_MAX_BATCH_SIZE = 1
+DEFAULT_MAX_BATCH_WAIT_MS = 5
+
+
+def _call_and_record_start(
+    func: Callable[..., Any], *args: Any
+) -> Tuple[float, float, Any]:
+    """Runs `func` and returns its result together with its start and end time.
+
+    Defined on module level, so that it can be sent to a process pool."""
+
+    started = time.time()
+    result = func(*args)
+    return started, time.time(), result
+
+
+class StageExecutor(object):
+    """Runs the CPU-bound work of one inference stage outside of the event loop.
+
+    The time a call waited for a free worker and the time it took to run are
+    recorded as `inference.<stage>.queue_time` and `inference.<stage>.latency`.
+    The number of calls which were submitted but did not finish yet is reported
+    as `inference.<stage>.queue_depth`.
+
+    Stages which support it can batch concurrent calls, see `MicroBatcher`."""
+
+    def __init__(
+        self,
+        stage: Text,
+        executor_type: Text = DEFAULT_EXECUTOR_TYPE,
+        max_workers: Optional[int] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+    ) -> None:
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(
+                "Unknown executor type '{}' for inference stage '{}'. Use one "
+                "of {}.".format(executor_type, stage, EXECUTOR_TYPES)
+            )
+
+        self.stage = stage
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_wait_ms = max_batch_wait_ms
+
+        self._executor = None  # type: Optional[Executor]
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _metric(self, name: Text) -> Text:
+        return "inference.{}.{}".format(self.stage, name)
+
+    def _get_executor(self) -> Optional[Executor]:
+        # pools are created lazily, so that no worker is started before the
+        # server processes are forked
+        if self._executor is None and self.executor_type != INLINE_EXECUTOR:
+            if self.executor_type == PROCESS_EXECUTOR:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers or DEFAULT_MAX_THREAD_WORKERS
+                )
+        return self._executor
+
+    def _update_pending(self, change: int) -> None:
+        with self._lock:
+            self._pending += change
+            registry.set_gauge(self._metric("queue_depth"), self._pending)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run `func(*args)` within the executor of this stage.
+
+        If the process executor is used, `func` and `args` have to be
+        picklable."""
+
+        executor = self._get_executor()
+        if executor is None:
+            with registry.measure(self._metric("latency")):
+                return func(*args)
+
+        submitted = time.time()
+        self._update_pending(1)
+        try:
+            loop = asyncio.get_event_loop()
+            started, finished, result = await loop.run_in_executor(
+                executor, _call_and_record_start, func, *args
+            )
+        finally:
+            self._update_pending(-1)
+
+        registry.observe(self._metric("queue_time"), max(0.0, started - submitted))
+        registry.observe(self._metric("latency"), finished - started)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class MicroBatcher(object):
+    """Collects concurrent calls of a stage and processes them as one batch.
+
+    A batch is processed once `max_batch_size` items were collected or the
+    first item waited for `max_batch_wait_ms` milliseconds. `process_batch`
+    receives the list of items and has to return a result for every item, it
+    is run within the executor of the stage."""
+
+    def __init__(
+        self,
+        executor: StageExecutor,
+        process_batch: Callable[[List[Any]], List[Any]],
+    ) -> None:
+        self.executor = executor
+        self.process_batch = process_batch
+
+        self._pending = []  # type: List[Tuple[Any, asyncio.Future]]
+        self._scheduled_flush = None  # type: Optional[asyncio.Handle]
+
+    async def submit(self, item: Any) -> Any:
+        """Add `item` to the next batch and return its result."""
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.executor.max_batch_size:
+            self.flush()
+        elif self._scheduled_flush is None:
+            self._scheduled_flush = loop.call_later(
+                self.executor.max_batch_wait_ms / 1000, self.flush
+            )
+
+        return await future
+
+    def flush(self) -> None:
+        """Start processing the collected items."""
+
+        if self._scheduled_flush is not None:
+            self._scheduled_flush.cancel()
+            self._scheduled_flush = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._process(batch))
+
+    async def _process(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        registry.increment("inference.{}.batches".format(self.executor.stage))
+        registry.increment(
+            "inference.{}.batched_items".format(self.executor.stage), len(batch)
+        )
+
+        try:
+            results = await self.executor.run(
+                self.process_batch, [item for item, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_executors = {}  # type: Dict[Text, StageExecutor]
+
+
+def configure(
+    nlu_executor: Text = DEFAULT_EXECUTOR_TYPE,
+    policy_executor: Text = DEFAULT_EXECUTOR_TYPE,
+    max_workers: Optional[int] = None,
+    nlu_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    nlu_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+    policy_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    policy_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+) -> None:
+    """Configure how the NLU and the policy inference are run.
+
+    The policy ensemble is not sent to other processes, hence the policy
+    inference falls back to a thread pool if the process executor is chosen.
+    Concurrently parsed messages are batched if `nlu_batch_size` is larger
+    than 1, concurrent action predictions if `policy_batch_size` is larger
+    than 1."""
+
+    if policy_executor == PROCESS_EXECUTOR:
+        logger.warning(
+            "The policy inference can not be run in a process pool. Using a "
+            "thread pool instead."
+        )
+        policy_executor = THREAD_EXECUTOR
+
+    shutdown()
+    _executors[NLU_STAGE] = StageExecutor(
+        NLU_STAGE, nlu_executor, max_workers, nlu_batch_size, nlu_batch_wait_ms
+    )
+    _executors[POLICY_STAGE] = StageExecutor(
+        POLICY_STAGE,
+        policy_executor,
+        max_workers,
+        policy_batch_size,
+        policy_batch_wait_ms,
+    )
+
+
+def get_executor(stage: Text) -> StageExecutor:
+    """Return the executor of an inference stage, create a default one if the
+    stage was not configured."""
+
+    if stage not in _executors:
+        _executors[stage] = StageExecutor(stage)
+    return _executors[stage]
+
+
+async def run(stage: Text, func: Callable[..., Any], *args: Any) -> Any:
+    """Run `func(*args)` within the executor of the inference `stage`."""
+
+    return await get_executor(stage).run(func, *args)
+
+
+def shutdown() -> None:
+    """Stop the workers of all inference executors."""
+
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
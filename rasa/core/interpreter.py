@@ -1,16 +1,17 @@
-import aiohttp
-
+import functools
+import gc
 import json
 import logging
 import re
 
 import os
+from collections import OrderedDict
 from typing import Text, List, Dict, Any, Union, Optional, Tuple
 
-from rasa.core import constants
+from rasa.core import constants, inference
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core.constants import INTENT_MESSAGE_PREFIX
-from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.endpoints import ClientResponseError, EndpointConfig
 
 logger = logging.getLogger(__name__)
 
@@ -213,7 +214,6 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
     ) -> Optional[Dict[Text, Any]]:
         """Send a text message to a running rasa NLU http server.
         Return `None` on failure."""
-        from requests.compat import urljoin  # pytype: disable=import-error
 
         if not self.endpoint:
             logger.error(
@@ -224,23 +224,18 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
 
         params = {"token": self.endpoint.token, "text": text, "message_id": message_id}
 
-        if self.endpoint.url.endswith("/"):
-            url = self.endpoint.url + "model/parse"
-        else:
-            url = self.endpoint.url + "/model/parse"
-
         # noinspection PyBroadException
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=params) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    else:
-                        logger.error(
-                            "Failed to parse text '{}' using rasa NLU over "
-                            "http. Error: {}".format(text, await resp.text())
-                        )
-                        return None
+            # the endpoint keeps the connection to the NLU server alive
+            return await self.endpoint.request(
+                "post", subpath="model/parse", json=params
+            )
+        except ClientResponseError as e:
+            logger.error(
+                "Failed to parse text '{}' using rasa NLU over "
+                "http. Error: {}".format(text, e.text)
+            )
+            return None
         except Exception:
             logger.exception(
                 "Failed to parse text '{}' using rasa NLU over http.".format(text)
@@ -264,6 +259,8 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
         else:
             self.interpreter = None
 
+        self._batcher = None  # type: Optional[inference.MicroBatcher]
+
     async def parse(
         self,
         text: Text,
@@ -274,13 +271,101 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
 
         Return a default value if the parsing of the text failed."""
 
+        nlu_executor = inference.get_executor(inference.NLU_STAGE)
+        if nlu_executor.max_batch_size > 1:
+            return await self._get_batcher(nlu_executor).submit(text)
+
+        if nlu_executor.executor_type == inference.PROCESS_EXECUTOR:
+            return await nlu_executor.run(
+                _parse_in_worker_process, self.model_directory, text, message_id
+            )
+
         if self.lazy_init and self.interpreter is None:
             self._load_interpreter()
-        result = self.interpreter.parse(text, message_id)
+        result = await nlu_executor.run(self.interpreter.parse, text, message_id)
 
         return result
 
+    def _get_batcher(
+        self, nlu_executor: inference.StageExecutor
+    ) -> inference.MicroBatcher:
+        """Return the batcher which parses concurrent messages together."""
+
+        if self._batcher is None or self._batcher.executor is not nlu_executor:
+            if nlu_executor.executor_type == inference.PROCESS_EXECUTOR:
+                parse_batch = functools.partial(
+                    _parse_batch_in_worker_process, self.model_directory
+                )
+            else:
+                if self.lazy_init and self.interpreter is None:
+                    self._load_interpreter()
+                parse_batch = self.interpreter.parse_batch
+            self._batcher = inference.MicroBatcher(nlu_executor, parse_batch)
+
+        return self._batcher
+
     def _load_interpreter(self):
         from rasa.nlu.model import Interpreter
 
         self.interpreter = Interpreter.load(self.model_directory)
+
+
+# interpreters loaded within the processes of the NLU process pool by model
+# directory, least recently used first
+_worker_process_interpreters = OrderedDict()  # type: Dict[Text, Any]
+
+# the current model and the one it replaced, which might still parse the
+# messages which were received before the swap
+MAX_WORKER_PROCESS_INTERPRETERS = 2
+
+
+def _worker_process_interpreter(model_directory: Text) -> Any:
+    """Return the interpreter of a worker process of the NLU process pool.
+
+    Every worker process loads the NLU model once and keeps it in memory.
+    Models which were replaced by newer ones are freed."""
+
+    from rasa.nlu.model import Interpreter
+
+    interpreter = _worker_process_interpreters.get(model_directory)
+    if interpreter is None:
+        interpreter = Interpreter.load(model_directory)
+        _worker_process_interpreters[model_directory] = interpreter
+        _release_worker_process_interpreters()
+    else:
+        _worker_process_interpreters.move_to_end(model_directory)
+
+    return interpreter
+
+
+def _release_worker_process_interpreters() -> None:
+    """Drop the least recently used interpreters of a worker process."""
+
+    released = False
+    while len(_worker_process_interpreters) > MAX_WORKER_PROCESS_INTERPRETERS:
+        _, interpreter = _worker_process_interpreters.popitem(last=False)
+        for component in interpreter.pipeline:
+            # e.g. the TensorFlow sessions of the embedding models
+            session = getattr(component, "session", None)
+            if session is not None and hasattr(session, "close"):
+                session.close()
+        released = True
+
+    if released:
+        gc.collect()
+
+
+def _parse_in_worker_process(
+    model_directory: Text, text: Text, message_id: Optional[Text] = None
+) -> Dict[Text, Any]:
+    """Parse a message within a worker process of the NLU process pool."""
+
+    return _worker_process_interpreter(model_directory).parse(text, message_id)
+
+
+def _parse_batch_in_worker_process(
+    model_directory: Text, texts: List[Text]
+) -> List[Dict[Text, Any]]:
+    """Parse a batch of messages within a worker process of the NLU process pool."""
+
+    return _worker_process_interpreter(model_directory).parse_batch(texts)
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional, Text, TypeVar
+
+from async_generator import asynccontextmanager, async_generator, yield_
+
+from rasa.core.lock import TicketLock
+from rasa.utils.common import class_from_module_path
+from rasa.utils.endpoints import EndpointConfig
+from rasa.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# default lifetime in seconds of a ticket before it is considered abandoned
+DEFAULT_LOCK_LIFETIME = 60
+
+# default time in seconds to wait between two checks whether a lock became free
+DEFAULT_WAIT_TIME_BETWEEN_POLLS = 0.05
+
+T = TypeVar("T")
+
+
+class LockError(Exception):
+    """Exception that is raised when a lock cannot be acquired.
+
+     Attributes:
+          message (str): explanation of which `conversation_id` raised the error
+    """
+
+    pass
+
+
+class LockStore(object):
+    """Serialises the processing of messages belonging to the same conversation.
+
+    Every message has to draw a ticket for its conversation and is processed as
+    soon as its ticket is the oldest one that did not expire yet. Messages of a
+    conversation are hence processed in the order in which they arrived, even if
+    they are handled by different processes sharing the same lock store."""
+
+    @staticmethod
+    def find_lock_store(store: Optional[EndpointConfig] = None) -> "LockStore":
+        if store is None or store.type is None or store.type == "in_memory":
+            lock_store = InMemoryLockStore()
+        elif store.type == "redis":
+            lock_store = RedisLockStore(host=store.url, **store.kwargs)
+        else:
+            lock_store = LockStore.load_lock_store_from_module_string(store)
+
+        logger.debug("Connected to lock store '{}'.".format(type(lock_store).__name__))
+
+        return lock_store
+
+    @staticmethod
+    def load_lock_store_from_module_string(store: EndpointConfig) -> "LockStore":
+        """Given the name of a `LockStore` module tries to retrieve it."""
+
+        try:
+            lock_store_class = class_from_module_path(store.type)
+            return lock_store_class(host=store.url, **store.kwargs)
+        except (AttributeError, ImportError):
+            logger.warning(
+                "Lock store type '{}' not found. "
+                "Using InMemoryLockStore instead.".format(store.type)
+            )
+            return InMemoryLockStore()
+
+    @staticmethod
+    def create_lock(conversation_id: Text) -> TicketLock:
+        """Create a new `TicketLock` for `conversation_id`."""
+
+        return TicketLock(conversation_id)
+
+    def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
+        """Fetch lock for `conversation_id` from storage."""
+
+        raise NotImplementedError
+
+    def delete_lock(self, conversation_id: Text) -> None:
+        """Delete lock for `conversation_id` from storage."""
+
+        raise NotImplementedError
+
+    def save_lock(self, lock: TicketLock) -> None:
+        """Commit `lock` to storage."""
+
+        raise NotImplementedError
+
+    def update_lock(
+        self, conversation_id: Text, update: Callable[[TicketLock], T]
+    ) -> T:
+        """Apply `update` to the lock of `conversation_id` and persist the result.
+
+        Locks without any tickets are deleted. Stores which are shared between
+        processes override this to make the read-modify-write cycle atomic."""
+
+        lock = self.get_lock(conversation_id) or self.create_lock(conversation_id)
+        result = update(lock)
+
+        if lock.is_someone_waiting():
+            self.save_lock(lock)
+        else:
+            self.delete_lock(conversation_id)
+
+        return result
+
+    def issue_ticket(
+        self, conversation_id: Text, lock_lifetime: float = DEFAULT_LOCK_LIFETIME
+    ) -> int:
+        """Issue new ticket with `lock_lifetime` for lock associated with
+        `conversation_id`."""
+
+        registry.increment("lock_store.tickets_issued")
+        return self.update_lock(
+            conversation_id, lambda lock: lock.issue_ticket(lock_lifetime)
+        )
+
+    def finish_serving(self, conversation_id: Text, ticket_number: int) -> None:
+        """Finish serving ticket with `ticket_number` for `conversation_id`.
+
+        Removes ticket from lock and deletes the lock if no one is waiting."""
+
+        self.update_lock(
+            conversation_id, lambda lock: lock.remove_ticket_for(ticket_number)
+        )
+
+    def is_someone_waiting(self, conversation_id: Text) -> bool:
+        """Return whether someone is waiting for lock associated with
+        `conversation_id`."""
+
+        lock = self.get_lock(conversation_id)
+        if lock:
+            return lock.is_someone_waiting()
+
+        return False
+
+    @asynccontextmanager
+    @async_generator  # needed for python 3.5 compatibility
+    async def lock(
+        self,
+        conversation_id: Text,
+        lock_lifetime: float = DEFAULT_LOCK_LIFETIME,
+        wait_time_in_seconds: float = DEFAULT_WAIT_TIME_BETWEEN_POLLS,
+    ) -> None:
+        """Acquire lock with lifetime `lock_lifetime`for `conversation_id`.
+
+        Try acquiring lock with a wait time of `wait_time_in_seconds` seconds
+        between attempts. Raise a `LockError` if lock has expired.
+        """
+
+        ticket = self.issue_ticket(conversation_id, lock_lifetime)
+        start = time.time()
+
+        try:
+            await self._acquire_lock(conversation_id, ticket, wait_time_in_seconds)
+            acquired = time.time()
+            registry.observe("lock_store.wait_time", acquired - start)
+
+            try:
+                await yield_()
+            finally:
+                registry.observe("lock_store.hold_time", time.time() - acquired)
+        finally:
+            self.finish_serving(conversation_id, ticket)
+
+    async def _acquire_lock(
+        self, conversation_id: Text, ticket: int, wait_time_in_seconds: float
+    ) -> TicketLock:
+
+        while True:
+            # fetch lock in every iteration because lock might no longer exist
+            lock = self.get_lock(conversation_id)
+
+            # exit loop if lock or ticket do not exist anymore (expired)
+            if not lock or not lock.has_ticket(ticket):
+                break
+
+            # acquire lock if it isn't locked
+            if not lock.is_locked(ticket):
+                return lock
+
+            logger.debug(
+                "Failed to acquire lock for conversation ID '{}'. Retrying..."
+                "".format(conversation_id)
+            )
+
+            # sleep and update lock
+            await asyncio.sleep(wait_time_in_seconds)
+
+        raise LockError(
+            "Could not acquire lock for conversation_id '{}'."
+            "".format(conversation_id)
+        )
+
+
+class InMemoryLockStore(LockStore):
+    """In-memory store for ticket locks.
+
+    Only serialises the processing within a single process."""
+
+    def __init__(self):
+        self.conversation_locks = {}  # type: Dict[Text, TicketLock]
+
+    def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
+        return self.conversation_locks.get(conversation_id)
+
+    def delete_lock(self, conversation_id: Text) -> None:
+        deleted_lock = self.conversation_locks.pop(conversation_id, None)
+        if deleted_lock is None:
+            logger.debug(
+                "Could not delete lock for conversation '{}' because it "
+                "doesn't exist.".format(conversation_id)
+            )
+
+    def save_lock(self, lock: TicketLock) -> None:
+        self.conversation_locks[lock.conversation_id] = lock
+
+
+class RedisLockStore(LockStore):
+    """Redis store for ticket locks which can be shared by several processes."""
+
+    def __init__(
+        self,
+        host: Text = "localhost",
+        port: int = 6379,
+        db: int = 1,
+        password: Optional[Text] = None,
+        key_prefix: Text = "lock:",
+    ):
+        import redis
+
+        self.red = redis.StrictRedis(
+            host=host, port=int(port), db=int(db), password=password
+        )
+        self.key_prefix = key_prefix
+
+    def _key(self, conversation_id: Text) -> Text:
+        return self.key_prefix + conversation_id
+
+    def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
+        serialised_lock = self.red.get(self._key(conversation_id))
+        if serialised_lock:
+            return TicketLock.from_dict(json.loads(serialised_lock))
+
+    def delete_lock(self, conversation_id: Text) -> None:
+        deletion_successful = self.red.delete(self._key(conversation_id))
+        if deletion_successful == 0:
+            logger.debug(
+                "Could not delete lock for conversation '{}'.".format(conversation_id)
+            )
+
+    def save_lock(self, lock: TicketLock) -> None:
+        self.red.set(self._key(lock.conversation_id), lock.dumps())
+
+    def update_lock(
+        self, conversation_id: Text, update: Callable[[TicketLock], T]
+    ) -> T:
+        """Apply `update` to the lock of `conversation_id` within an optimistic
+        transaction, which is retried if another process modified the lock."""
+
+        key = self._key(conversation_id)
+
+        def _update(pipe) -> T:
+            serialised_lock = pipe.get(key)
+            if serialised_lock:
+                lock = TicketLock.from_dict(json.loads(serialised_lock))
+            else:
+                lock = self.create_lock(conversation_id)
+
+            result = update(lock)
+
+            pipe.multi()
+            if lock.is_someone_waiting():
+                pipe.set(key, lock.dumps())
+            else:
+                pipe.delete(key)
+
+            return result
+
+        return self.red.transaction(_update, key, value_from_callable=True)
@@ -18,6 +18,7 @@ from rasa.core.featurizers import (
     TrackerFeaturizer,
     FullDialogueTrackerFeaturizer,
     LabelTokenizerSingleStateFeaturizer,
+    MaxHistoryTrackerFeaturizer,
 )
 from rasa.core.policies.policy import Policy
 
@@ -1352,13 +1353,48 @@ class EmbeddingPolicy(Policy):
 
         # noinspection PyPep8Naming
         data_X = self.featurizer.create_X([tracker], domain)
+        _sim = self._calculate_similarities(domain, data_X)
+
+        return self._normalize_similarities(_sim[0, -1, :]).tolist()
+
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+        """Predict the next actions of all trackers with one tf call.
+
+        Only the states of a `MaxHistoryTrackerFeaturizer` have the same length
+        for every tracker, other featurizers predict tracker by tracker.
+        """
+
+        if (
+            not trackers
+            or self.session is None
+            or not isinstance(self.featurizer, MaxHistoryTrackerFeaturizer)
+        ):
+            return super(EmbeddingPolicy, self).predict_action_probabilities_batch(
+                trackers, domain
+            )
+
+        # noinspection PyPep8Naming
+        data_X = self.featurizer.create_X(trackers, domain)
+        _sim = self._calculate_similarities(domain, data_X)
+
+        return [
+            self._normalize_similarities(_sim[i, -1, :]).tolist()
+            for i in range(len(trackers))
+        ]
+
+    # noinspection PyPep8Naming
+    def _calculate_similarities(self, domain: Domain, data_X: np.ndarray) -> np.ndarray:
+        """Calculate the similarities of the featurized dialogues to all actions."""
+
         session_data = self._create_tf_session_data(domain, data_X)
         # noinspection PyPep8Naming
         all_Y_d_x = np.stack(
             [session_data.all_Y_d for _ in range(session_data.X.shape[0])]
         )
 
-        _sim = self.session.run(
+        return self.session.run(
             self.sim_op,
             feed_dict={
                 self.a_in: session_data.X,
@@ -1372,7 +1408,7 @@ class EmbeddingPolicy(Policy):
             },
         )
 
-        result = _sim[0, -1, :]
+    def _normalize_similarities(self, result: np.ndarray) -> np.ndarray:
         if self.similarity_type == "cosine":
             # clip negative values to zero
             result[result < 0] = 0
@@ -1381,7 +1417,7 @@ class EmbeddingPolicy(Policy):
             result = np.exp(result)
             result /= np.sum(result)
 
-        return result.tolist()
+        return result
 
     def _persist_tensor(self, name: Text, tensor: tf.Tensor) -> None:
         if tensor is not None:
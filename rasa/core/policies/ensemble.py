@@ -1,8 +1,14 @@
 import importlib
 import json
 import logging
+import mmap
+import multiprocessing
 import os
+import pickle
+import shutil
 import sys
+import tempfile
+import time
 from collections import defaultdict
 from datetime import datetime
 from typing import Text, Optional, Any, List, Dict, Tuple
@@ -28,6 +34,57 @@ from rasa.utils.common import class_from_module_path
 
 logger = logging.getLogger(__name__)
 
+def _peak_memory_mb() -> Optional[float]:
+    """Returns the peak resident memory of this process in megabytes."""
+
+    try:
+        import resource
+    except ImportError:
+        # not available on Windows
+        return None
+
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak_memory / (1024 * 1024)
+    return peak_memory / 1024
+
+
+def _train_policy(
+    policy: Policy,
+    training_trackers: List[DialogueStateTracker],
+    domain: Domain,
+    **kwargs: Any
+) -> Tuple[float, Optional[float]]:
+    """Trains a policy and returns the training time and the peak memory."""
+
+    start = time.time()
+    policy.train(training_trackers, domain, **kwargs)
+    return time.time() - start, _peak_memory_mb()
+
+
+def _train_policy_in_process(
+    policy: Policy,
+    trackers_file: Text,
+    domain: Domain,
+    model_directory: Text,
+    kwargs: Dict[Text, Any],
+) -> Tuple[float, Optional[float]]:
+    """Trains a policy within a training process and persists it.
+
+    The training trackers are loaded from a memory-mapped file which is shared
+    by all training processes."""
+
+    with open(trackers_file, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            training_trackers = pickle.loads(mapped_file)
+
+    training_time, peak_memory = _train_policy(
+        policy, training_trackers, domain, **kwargs
+    )
+    policy.persist(model_directory)
+    return training_time, peak_memory
+
 
 class PolicyEnsemble(object):
     versioned_packages = ["rasa", "tensorflow", "sklearn"]
@@ -103,19 +160,121 @@ class PolicyEnsemble(object):
         domain: Domain,
         **kwargs: Any
     ) -> None:
-        if training_trackers:
-            for policy in self.policies:
-                policy.train(training_trackers, domain, **kwargs)
-        else:
+        """Trains the policies of the ensemble.
+
+        If `policy_processes` is larger than 1, the policies are trained
+        concurrently within that many processes."""
+
+        policy_processes = kwargs.pop("policy_processes", 1) or 1
+
+        if not training_trackers:
             logger.info("Skipped training, because there are no training samples.")
+        elif policy_processes > 1 and len(self.policies) > 1:
+            self._train_in_processes(
+                training_trackers, domain, policy_processes, **kwargs
+            )
+        else:
+            for policy in self.policies:
+                training_time, peak_memory = _train_policy(
+                    policy, training_trackers, domain, **kwargs
+                )
+                self._log_training_statistics(policy, training_time, peak_memory)
         self.training_trackers = training_trackers
         self.date_trained = datetime.now().strftime("%Y%m%d-%H%M%S")
 
+    def _train_in_processes(
+        self,
+        training_trackers: List[DialogueStateTracker],
+        domain: Domain,
+        policy_processes: int,
+        **kwargs: Any
+    ) -> None:
+        """Trains every policy within its own process of a process pool.
+
+        The training trackers are written once to a file which the processes
+        map into memory. Every process persists its trained policy, which is
+        then loaded in place of the untrained policy. The processes are
+        spawned instead of forked, so that they do not inherit the state of
+        TensorFlow. Every process trains a single policy, so that its peak
+        memory is the one of that policy's training."""
+
+        temporary_directory = tempfile.mkdtemp()
+        trackers_file = os.path.join(temporary_directory, "training_trackers.pkl")
+        with open(trackers_file, "wb") as f:
+            pickle.dump(training_trackers, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        processes = min(policy_processes, len(self.policies))
+        logger.info(
+            "Training {} policies within {} processes.".format(
+                len(self.policies), processes
+            )
+        )
+
+        context = multiprocessing.get_context("spawn")
+        try:
+            with context.Pool(processes, maxtasksperchild=1) as pool:
+                results = [
+                    pool.apply_async(
+                        _train_policy_in_process,
+                        (
+                            policy,
+                            trackers_file,
+                            domain,
+                            os.path.join(temporary_directory, str(i)),
+                            kwargs,
+                        ),
+                    )
+                    for i, policy in enumerate(self.policies)
+                ]
+
+                trained_policies = []
+                for i, (policy, result) in enumerate(zip(self.policies, results)):
+                    training_time, peak_memory = result.get()
+                    trained_policy = policy.__class__.load(
+                        os.path.join(temporary_directory, str(i))
+                    )
+                    self._ensure_loaded_policy(
+                        trained_policy,
+                        policy.__class__,
+                        utils.module_path_from_instance(policy),
+                    )
+                    self._log_training_statistics(
+                        trained_policy, training_time, peak_memory
+                    )
+                    trained_policies.append(trained_policy)
+        finally:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+
+        self.policies = trained_policies
+
+    @staticmethod
+    def _log_training_statistics(
+        policy: Policy, training_time: float, peak_memory: Optional[float]
+    ) -> None:
+        if peak_memory is None:
+            memory = "unknown"
+        else:
+            memory = "{:.0f} MB".format(peak_memory)
+
+        logger.info(
+            "Trained {} in {:.2f}s, peak memory of the training process: {}."
+            "".format(type(policy).__name__, training_time, memory)
+        )
+
     def probabilities_using_best_policy(
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> Tuple[Optional[List[float]], Optional[Text]]:
         raise NotImplementedError
 
+    def probabilities_using_best_policy_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[Tuple[Optional[List[float]], Optional[Text]]]:
+        """Predicts the next action for several trackers at once.
+
+        By default, the prediction is made for every tracker on its own."""
+
+        return [self.probabilities_using_best_policy(t, domain) for t in trackers]
+
     def _max_histories(self) -> List[Optional[int]]:
         """Return max history."""
 
@@ -352,14 +511,50 @@ class SimplePolicyEnsemble(PolicyEnsemble):
     def probabilities_using_best_policy(
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> Tuple[Optional[List[float]], Optional[Text]]:
+        predictions = [
+            p.predict_action_probabilities(tracker, domain) for p in self.policies
+        ]
+
+        return self._best_policy_prediction(tracker, domain, predictions)
+
+    def probabilities_using_best_policy_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[Tuple[Optional[List[float]], Optional[Text]]]:
+        """Predicts the next action for several trackers at once.
+
+        Every policy predicts the next actions of all trackers with a single
+        call of `predict_action_probabilities_batch`."""
+
+        if not trackers:
+            return []
+
+        predictions_per_policy = [
+            p.predict_action_probabilities_batch(trackers, domain)
+            for p in self.policies
+        ]
+
+        results = []
+        for i, tracker in enumerate(trackers):
+            predictions = [predictions[i] for predictions in predictions_per_policy]
+            results.append(self._best_policy_prediction(tracker, domain, predictions))
+        return results
+
+    def _best_policy_prediction(
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        predictions: List[List[float]],
+    ) -> Tuple[Optional[List[float]], Optional[Text]]:
+        """Chooses the prediction of the best policy.
+
+        `predictions` contains the probabilities predicted by every policy."""
+
         result = None
         max_confidence = -1
         best_policy_name = None
         best_policy_priority = -1
 
-        for i, p in enumerate(self.policies):
-            probabilities = p.predict_action_probabilities(tracker, domain)
-
+        for i, (p, probabilities) in enumerate(zip(self.policies, predictions)):
             if len(tracker.events) > 0 and isinstance(
                 tracker.events[-1], ActionExecutionRejected
             ):
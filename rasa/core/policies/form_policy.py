@@ -26,12 +26,17 @@ class FormPolicy(MemoizationPolicy):
         featurizer: Optional[TrackerFeaturizer] = None,
         priority: int = 5,
         lookup: Optional[Dict] = None,
+        legacy_feature_keys: bool = False,
     ) -> None:
 
         # max history is set to 2 in order to capture
         # previous meaningful action before action listen
         super(FormPolicy, self).__init__(
-            featurizer=featurizer, priority=priority, max_history=2, lookup=lookup
+            featurizer=featurizer,
+            priority=priority,
+            max_history=2,
+            lookup=lookup,
+            legacy_feature_keys=legacy_feature_keys,
         )
 
     @classmethod
@@ -95,7 +100,7 @@ class FormPolicy(MemoizationPolicy):
             if active_form and self._prev_action_listen_in_state(states[-1]):
                 # modify the states
                 states = self._modified_states(states)
-                feature_key = self._create_feature_key(states)
+                feature_key = self._create_feature_key(states, domain)
                 # even if there are two identical feature keys
                 # their form will be the same
                 # because of `active_form_...` feature
@@ -108,7 +113,7 @@ class FormPolicy(MemoizationPolicy):
         domain: Domain,
     ) -> Optional[int]:
         # modify the states
-        return self._recall_states(self._modified_states(states))
+        return self._recall_states(self._modified_states(states), domain)
 
     def state_is_unhappy(self, tracker, domain):
         # since it is assumed that training stories contain
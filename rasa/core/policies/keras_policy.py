@@ -265,6 +265,34 @@ class KerasPolicy(Policy):
         else:
             raise Exception("Network prediction has invalid shape.")
 
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+        """Predicts the next actions of all trackers with one network call.
+
+        Only the states of a `MaxHistoryTrackerFeaturizer` have the same length
+        for every tracker, other featurizers predict tracker by tracker."""
+
+        if not trackers or not isinstance(
+            self.featurizer, MaxHistoryTrackerFeaturizer
+        ):
+            return super(KerasPolicy, self).predict_action_probabilities_batch(
+                trackers, domain
+            )
+
+        # noinspection PyPep8Naming
+        X = self.featurizer.create_X(trackers, domain)
+
+        with self.graph.as_default(), self.session.as_default():
+            y_pred = self.model.predict(X, batch_size=len(trackers))
+
+        if len(y_pred.shape) == 2:
+            return y_pred.tolist()
+        elif len(y_pred.shape) == 3:
+            return y_pred[:, -1].tolist()
+        else:
+            raise Exception("Network prediction has invalid shape.")
+
     def persist(self, path: Text) -> None:
 
         if self.model:
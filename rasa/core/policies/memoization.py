@@ -4,14 +4,15 @@ import base64
 import json
 import logging
 import os
+import pickle
 from tqdm import tqdm
-from typing import Optional, Any, Dict, List, Text
+from typing import Optional, Any, Dict, List, Set, Text, Tuple, Union
 
 import rasa.utils.io
 
 from rasa.core import utils
-from rasa.core.domain import Domain
-from rasa.core.events import ActionExecuted
+from rasa.core.domain import PREV_PREFIX, Domain
+from rasa.core.events import ActionExecuted, Event, Form
 from rasa.core.featurizers import TrackerFeaturizer, MaxHistoryTrackerFeaturizer
 from rasa.core.policies.policy import Policy
 from rasa.core.trackers import DialogueStateTracker
@@ -19,6 +20,19 @@ from rasa.utils.common import is_logging_disabled
 
 logger = logging.getLogger(__name__)
 
+# lookup table persisted by versions before 1.2.3, keyed by the json of the states
+LEGACY_MEMORIZED_TURNS_FILE = "memorized_turns.json"
+MEMORIZED_TURNS_FILE = "memorized_turns.pkl"
+
+# fixed protocol, so that the lookup table can be loaded by every Python 3 version
+PICKLE_PROTOCOL = 4
+
+# index of states which are not part of the domain, e.g. an intent predicted by
+# the NLU model which is missing from the domain
+UNKNOWN_STATE_INDEX = -1
+
+FeatureKey = Union[Text, Tuple[Optional[Tuple[Tuple[int, float], ...]], ...]]
+
 
 class MemoizationPolicy(Policy):
     """The policy that remembers exact examples of
@@ -39,8 +53,13 @@ class MemoizationPolicy(Policy):
         If it is needed to recall turns from training dialogues where
         some slots might not be set during prediction time, and there are
         training stories for this, use AugmentedMemoizationPolicy.
+
+        The states are memorized as tuples of the indices of the states
+        within the domain. Lookup tables of older models, which are keyed by
+        the (compressed) json of the states, are used as they are.
     """
 
+    # only used by the lookup tables of models trained before 1.2.3
     ENABLE_FEATURE_STRING_COMPRESSION = True
 
     SUPPORTS_ONLINE_TRAINING = True
@@ -63,6 +82,7 @@ class MemoizationPolicy(Policy):
         priority: int = 2,
         max_history: Optional[int] = None,
         lookup: Optional[Dict] = None,
+        legacy_feature_keys: bool = False,
     ) -> None:
 
         if not featurizer:
@@ -72,6 +92,7 @@ class MemoizationPolicy(Policy):
 
         self.max_history = self.featurizer.max_history
         self.lookup = lookup if lookup is not None else {}
+        self.legacy_feature_keys = legacy_feature_keys
         self.is_enabled = True
 
     def toggle(self, activate: bool) -> None:
@@ -104,7 +125,7 @@ class MemoizationPolicy(Policy):
         for states, actions in pbar:
             action = actions[0]
 
-            feature_key = self._create_feature_key(states)
+            feature_key = self._create_feature_key(states, domain)
             feature_item = domain.index_for_action(action)
 
             if feature_key not in ambiguous_feature_keys:
@@ -130,7 +151,31 @@ class MemoizationPolicy(Policy):
                     self.lookup[feature_key] = feature_item
             pbar.set_postfix({"# examples": "{:d}".format(len(self.lookup))})
 
-    def _create_feature_key(self, states):
+    def _create_feature_key(
+        self, states: List[Optional[Dict[Text, float]]], domain: Domain
+    ) -> FeatureKey:
+        """Creates the canonical key of `states` within the lookup table.
+
+        Every state is represented by the sorted pairs of the index of a
+        state name within `domain.input_state_map` and its value."""
+
+        if self.legacy_feature_keys:
+            return self._create_legacy_feature_key(states)
+
+        state_map = domain.input_state_map
+        return tuple(
+            None
+            if state is None
+            else tuple(
+                sorted(
+                    (state_map.get(name, UNKNOWN_STATE_INDEX), value)
+                    for name, value in state.items()
+                )
+            )
+            for state in states
+        )
+
+    def _create_legacy_feature_key(self, states: List[Optional[Dict[Text, float]]]):
         feature_str = json.dumps(states, sort_keys=True).replace('"', "")
         if self.ENABLE_FEATURE_STRING_COMPRESSION:
             compressed = zlib.compress(bytes(feature_str, "utf-8"))
@@ -146,6 +191,7 @@ class MemoizationPolicy(Policy):
     ) -> None:
         """Trains the policy on given training trackers."""
         self.lookup = {}
+        self.legacy_feature_keys = False
         # only considers original trackers (no augmented ones)
         training_trackers = [
             t
@@ -173,9 +219,11 @@ class MemoizationPolicy(Policy):
         ) = self.featurizer.training_states_and_actions(training_trackers[-1:], domain)
         self._add_states_to_lookup(trackers_as_states, trackers_as_actions, domain)
 
-    def _recall_states(self, states: List[Dict[Text, float]]) -> Optional[int]:
+    def _recall_states(
+        self, states: List[Dict[Text, float]], domain: Domain
+    ) -> Optional[int]:
 
-        return self.lookup.get(self._create_feature_key(states))
+        return self.lookup.get(self._create_feature_key(states, domain))
 
     def recall(
         self,
@@ -184,7 +232,7 @@ class MemoizationPolicy(Policy):
         domain: Domain,
     ) -> Optional[int]:
 
-        return self._recall_states(states)
+        return self._recall_states(states, domain)
 
     def predict_action_probabilities(
         self, tracker: DialogueStateTracker, domain: Domain
@@ -224,24 +272,39 @@ class MemoizationPolicy(Policy):
 
         self.featurizer.persist(path)
 
-        memorized_file = os.path.join(path, "memorized_turns.json")
+        memorized_file = os.path.join(path, MEMORIZED_TURNS_FILE)
         data = {
             "priority": self.priority,
             "max_history": self.max_history,
             "lookup": self.lookup,
+            "legacy_feature_keys": self.legacy_feature_keys,
         }
         rasa.utils.io.create_directory_for_file(memorized_file)
-        utils.dump_obj_as_json_to_file(memorized_file, data)
+        with open(memorized_file, "wb") as f:
+            pickle.dump(data, f, protocol=PICKLE_PROTOCOL)
 
     @classmethod
     def load(cls, path: Text) -> "MemoizationPolicy":
 
         featurizer = TrackerFeaturizer.load(path)
-        memorized_file = os.path.join(path, "memorized_turns.json")
+        memorized_file = os.path.join(path, MEMORIZED_TURNS_FILE)
+        legacy_memorized_file = os.path.join(path, LEGACY_MEMORIZED_TURNS_FILE)
         if os.path.isfile(memorized_file):
-            data = json.loads(rasa.utils.io.read_file(memorized_file))
+            with open(memorized_file, "rb") as f:
+                data = pickle.load(f)
+            return cls(
+                featurizer=featurizer,
+                priority=data["priority"],
+                lookup=data["lookup"],
+                legacy_feature_keys=data.get("legacy_feature_keys", False),
+            )
+        elif os.path.isfile(legacy_memorized_file):
+            data = json.loads(rasa.utils.io.read_file(legacy_memorized_file))
             return cls(
-                featurizer=featurizer, priority=data["priority"], lookup=data["lookup"]
+                featurizer=featurizer,
+                priority=data["priority"],
+                lookup=data["lookup"],
+                legacy_feature_keys=True,
             )
         else:
             logger.info(
@@ -269,44 +332,124 @@ class AugmentedMemoizationPolicy(MemoizationPolicy):
         for current dialogue.
     """
 
-    @staticmethod
-    def _back_to_the_future_again(tracker):
-        """Send Marty to the past to get
-            the new featurization for the future"""
-
-        idx_of_first_action = None
-        idx_of_second_action = None
-
-        # we need to find second executed action
-        for e_i, event in enumerate(tracker.applied_events()):
-            # find second ActionExecuted
-            if isinstance(event, ActionExecuted):
-                if idx_of_first_action is None:
-                    idx_of_first_action = e_i
-                else:
-                    idx_of_second_action = e_i
-                    break
+    def __init__(
+        self,
+        featurizer: Optional[TrackerFeaturizer] = None,
+        priority: int = 2,
+        max_history: Optional[int] = None,
+        lookup: Optional[Dict] = None,
+        legacy_feature_keys: bool = False,
+    ) -> None:
 
-        if idx_of_second_action is None:
-            return None
-        # make second ActionExecuted the first one
-        events = tracker.applied_events()[idx_of_second_action:]
-        if not events:
+        super(AugmentedMemoizationPolicy, self).__init__(
+            featurizer, priority, max_history, lookup, legacy_feature_keys
+        )
+        # the domain and the previous actions of every memorized history
+        self._action_index = None  # type: Optional[Tuple[Domain, Set[Tuple]]]
+
+    def _add_states_to_lookup(
+        self, trackers_as_states, trackers_as_actions, domain, online=False
+    ):
+        super(AugmentedMemoizationPolicy, self)._add_states_to_lookup(
+            trackers_as_states, trackers_as_actions, domain, online
+        )
+        self._action_index = None
+        self._memorized_actions(domain)
+
+    def _memorized_actions(self, domain: Domain) -> Optional[Set[Tuple]]:
+        """Returns the previous actions of every memorized history.
+
+        Every memorized history is represented by the index of the previous
+        action of each state, `UNKNOWN_STATE_INDEX` for states without
+        previous action and `None` for padding. The index is built once per
+        domain, it is not available for lookup tables of older models."""
+
+        if self.legacy_feature_keys:
             return None
 
-        mcfly_tracker = tracker.init_copy()
-        for e in events:
-            mcfly_tracker.update(e)
+        if self._action_index is None or self._action_index[0] is not domain:
+            state_map = domain.input_state_map
+            prev_action_indices = {
+                state_map[state] for state in domain.prev_action_states
+            }
+
+            def previous_action(state):
+                if state is None:
+                    return None
+                for index, _ in state:
+                    if index in prev_action_indices:
+                        return index
+                return UNKNOWN_STATE_INDEX
+
+            memorized_actions = {
+                tuple(previous_action(state) for state in feature_key)
+                for feature_key in self.lookup.keys()
+            }
+            self._action_index = (domain, memorized_actions)
+
+        return self._action_index[1]
+
+    def _previous_actions_of_restarts(
+        self, events: List[Event], restart_points: List[int], domain: Domain
+    ) -> List[Tuple]:
+        """Computes the previous actions of the states of every restarted
+        tracker in a single pass over the actions of the tracker.
+
+        A tracker which is restarted at an action starts with an empty state,
+        which is followed by one state after each of the following actions."""
+
+        state_map = domain.input_state_map
+        actions = [
+            state_map.get(PREV_PREFIX + events[i].action_name, UNKNOWN_STATE_INDEX)
+            for i in restart_points
+        ]
 
-        return mcfly_tracker
+        previous_actions = []
+        for n in range(len(restart_points)):
+            history = [UNKNOWN_STATE_INDEX] + actions[n:]
+            history = history[-self.max_history :]
+            padding = [None] * (self.max_history - len(history))
+            previous_actions.append(tuple(padding + history))
+        return previous_actions
 
     def _recall_using_delorean(self, old_states, tracker, domain):
         """Recursively go to the past to correctly forget slots,
-            and then back to the future to recall."""
+            and then back to the future to recall.
+
+            The tracker is restarted at every action after the first one,
+            the states of every restarted tracker are looked up until a
+            memorized history is found. Restarts whose previous actions do not
+            match any memorized history are skipped without replaying them,
+            which is only possible if no form was involved."""
 
         logger.debug("Launch DeLorean...")
-        mcfly_tracker = self._back_to_the_future_again(tracker)
-        while mcfly_tracker is not None:
+
+        events = tracker.applied_events()
+        restart_points = [
+            i for i, event in enumerate(events) if isinstance(event, ActionExecuted)
+        ][1:]
+
+        memorized_actions = self._memorized_actions(domain)
+        if memorized_actions is not None and not any(
+            isinstance(event, Form) for event in events
+        ):
+            previous_actions = self._previous_actions_of_restarts(
+                events, restart_points, domain
+            )
+        else:
+            previous_actions = None
+
+        for n, restart_point in enumerate(restart_points):
+            if (
+                previous_actions is not None
+                and previous_actions[n] not in memorized_actions
+            ):
+                continue
+
+            mcfly_tracker = tracker.init_copy()
+            for event in events[restart_point:]:
+                mcfly_tracker.update(event)
+
             tracker_as_states = self.featurizer.prediction_states(
                 [mcfly_tracker], domain
             )
@@ -314,15 +457,12 @@ class AugmentedMemoizationPolicy(MemoizationPolicy):
 
             if old_states != states:
                 # check if we like new futures
-                memorised = self._recall_states(states)
+                memorised = self._recall_states(states, domain)
                 if memorised is not None:
                     logger.debug("Current tracker state {}".format(states))
                     return memorised
                 old_states = states
 
-            # go back again
-            mcfly_tracker = self._back_to_the_future_again(mcfly_tracker)
-
         # No match found
         logger.debug("Current tracker state {}".format(old_states))
         return None
@@ -334,7 +474,7 @@ class AugmentedMemoizationPolicy(MemoizationPolicy):
         domain: Domain,
     ) -> Optional[int]:
 
-        recalled = self._recall_states(states)
+        recalled = self._recall_states(states, domain)
         if recalled is None:
             # let's try a different method to recall that tracker
             return self._recall_using_delorean(states, tracker, domain)
@@ -144,6 +144,19 @@ class Policy(object):
 
         raise NotImplementedError("Policy must have the capacity to predict.")
 
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+        """Predicts the next action for several trackers at once.
+
+        Policies which can vectorise their prediction should overwrite this
+        method. By default, the next action is predicted for every tracker
+        on its own.
+
+        Returns a list of probabilities for the next actions per tracker"""
+
+        return [self.predict_action_probabilities(t, domain) for t in trackers]
+
     def persist(self, path: Text) -> None:
         """Persists the policy to a storage."""
         raise NotImplementedError("Policy must have the capacity to persist itself.")
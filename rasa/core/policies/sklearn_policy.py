@@ -145,8 +145,8 @@ class SklearnPolicy(Policy):
         if score is not None:
             logger.info("Cross validation score: {:.5f}".format(score))
 
-    def _postprocess_prediction(self, y_proba, domain):
-        yp = y_proba[0].tolist()
+    def _postprocess_prediction(self, y_proba, domain, index=0):
+        yp = y_proba[index].tolist()
 
         # Some classes might not be part of the training labels. Since
         # sklearn does not predict labels it has never encountered
@@ -166,6 +166,22 @@ class SklearnPolicy(Policy):
         y_proba = self.model.predict_proba(Xt)
         return self._postprocess_prediction(y_proba, domain)
 
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+        """Predicts the next actions of all trackers with one model call."""
+
+        if not trackers:
+            return []
+
+        X = self.featurizer.create_X(trackers, domain)
+        Xt = self._preprocess_data(X)
+        y_proba = self.model.predict_proba(Xt)
+        return [
+            self._postprocess_prediction(y_proba, domain, i)
+            for i in range(len(trackers))
+        ]
+
     def persist(self, path: Text) -> None:
 
         if self.model:
@@ -1,13 +1,15 @@
+import functools
 import json
 import logging
 import os
+import weakref
 from types import LambdaType
 from typing import Any, Dict, List, Optional, Text, Tuple
 
 import numpy as np
 import time
 
-from rasa.core import jobs
+from rasa.core import inference, jobs
 from rasa.core.actions.action import Action
 from rasa.core.actions.action import (
     ACTION_LISTEN_NAME,
@@ -44,6 +46,9 @@ from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
 
+# batchers which coalesce the predictions of concurrently handled conversations
+_prediction_batchers = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
 
 MAX_NUMBER_OF_PREDICTIONS = int(os.environ.get("MAX_NUMBER_OF_PREDICTIONS", "10"))
 
@@ -179,6 +184,65 @@ class MessageProcessor(object):
 
         action_confidences, policy = self._get_next_action_probabilities(tracker)
 
+        return self._action_for_confidences(action_confidences, policy)
+
+    async def _predict_next_action_in_executor(
+        self, tracker: DialogueStateTracker
+    ) -> Tuple[Action, Text, float]:
+        """Predicts the next action without blocking the event loop.
+
+        The policy inference is run within the executor of the policy stage."""
+
+        policy_executor = inference.get_executor(inference.POLICY_STAGE)
+        if policy_executor.max_batch_size > 1:
+            # coalesce the predictions of concurrently handled conversations
+            result = self._probabilities_for_followup_action(tracker)
+            if not result:
+                batcher = self._get_prediction_batcher(policy_executor)
+                result = await batcher.submit(tracker)
+            action_confidences, policy = result
+        else:
+            action_confidences, policy = await policy_executor.run(
+                self._get_next_action_probabilities, tracker
+            )
+
+        return self._action_for_confidences(action_confidences, policy)
+
+    def _get_prediction_batcher(
+        self, policy_executor: inference.StageExecutor
+    ) -> inference.MicroBatcher:
+        """Return the batcher of the policy ensemble.
+
+        Processors are created per message, hence the batcher is shared by all
+        processors which use the same policy ensemble."""
+
+        batcher = _prediction_batchers.get(self.policy_ensemble)
+        if batcher is None or batcher.executor is not policy_executor:
+            batcher = inference.MicroBatcher(
+                policy_executor,
+                functools.partial(
+                    self.policy_ensemble.probabilities_using_best_policy_batch,
+                    domain=self.domain,
+                ),
+            )
+            _prediction_batchers[self.policy_ensemble] = batcher
+        return batcher
+
+    def predict_next_action_batch(
+        self, trackers: List[DialogueStateTracker]
+    ) -> List[Tuple[Action, Text, float]]:
+        """Predicts the next actions of several trackers at once."""
+
+        return [
+            self._action_for_confidences(action_confidences, policy)
+            for action_confidences, policy in self._get_next_action_probabilities_batch(
+                trackers
+            )
+        ]
+
+    def _action_for_confidences(
+        self, action_confidences: List[float], policy: Text
+    ) -> Tuple[Action, Text, float]:
         max_confidence_index = int(np.argmax(action_confidences))
         action = self.domain.action_for_index(
             max_confidence_index, self.action_endpoint
@@ -353,7 +417,9 @@ class MessageProcessor(object):
             and num_predicted_actions < self.max_number_of_predictions
         ):
             # this actually just calls the policy's method by the same name
-            action, policy, confidence = self.predict_next_action(tracker)
+            action, policy, confidence = await self._predict_next_action_in_executor(
+                tracker
+            )
 
             should_predict_another_action = await self._run_action(
                 action, tracker, message.output_channel, self.nlg, policy, confidence
@@ -551,6 +617,38 @@ class MessageProcessor(object):
         """Collect predictions from ensemble and return action and predictions.
         """
 
+        result = self._probabilities_for_followup_action(tracker)
+        if result:
+            return result
+
+        return self.policy_ensemble.probabilities_using_best_policy(
+            tracker, self.domain
+        )
+
+    def _get_next_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker]
+    ) -> List[Tuple[Optional[List[float]], Optional[Text]]]:
+        """Collect the predictions for several trackers from the ensemble.
+
+        The trackers without follow up action are predicted in one batch."""
+
+        results = [self._probabilities_for_followup_action(t) for t in trackers]
+        to_predict = [i for i, result in enumerate(results) if not result]
+
+        predictions = self.policy_ensemble.probabilities_using_best_policy_batch(
+            [trackers[i] for i in to_predict], self.domain
+        )
+        for i, prediction in zip(to_predict, predictions):
+            results[i] = prediction
+
+        return results
+
+    def _probabilities_for_followup_action(
+        self, tracker: DialogueStateTracker
+    ) -> Optional[Tuple[Optional[List[float]], Optional[Text]]]:
+        """Return the prediction for the follow up action of the tracker,
+        `None` if the next action has to be predicted by the ensemble."""
+
         followup_action = tracker.followup_action
         if followup_action:
             tracker.clear_followup_action()
@@ -564,6 +662,4 @@ class MessageProcessor(object):
                     "and predict the next action.".format(followup_action)
                 )
 
-        return self.policy_ensemble.probabilities_using_best_policy(
-            tracker, self.domain
-        )
+        return None
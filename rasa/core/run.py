@@ -9,15 +9,22 @@ from sanic_cors import CORS
 
 import rasa.core
 import rasa.utils
+import rasa.utils.endpoints
 import rasa.utils.io
-from rasa.core import constants, utils
+from rasa.core import constants, inference, utils
 from rasa.core.agent import load_agent, Agent
 from rasa.core.channels import console
 from rasa.core.channels.channel import InputChannel
 from rasa.core.interpreter import NaturalLanguageInterpreter
+from rasa.core.lock_store import LockStore
 from rasa.core.tracker_store import TrackerStore
 from rasa.core.utils import AvailableEndpoints, configure_file_logging
-from rasa.model import get_model_subdirectories, get_model
+from rasa.model import (
+    get_model_subdirectories,
+    get_model,
+    is_cached_model,
+    is_unpacked_model,
+)
 from rasa.utils.common import update_sanic_log_level, class_from_module_path
 from rasa.server import add_root_route
 
@@ -131,6 +138,12 @@ def configure_app(
 
         app.add_task(run_cmdline_io)
 
+    async def close_endpoint_sessions(_app: Sanic, _loop: Text) -> None:
+        # close the kept alive connections to action server, NLG and NLU server
+        await rasa.utils.endpoints.close_pooled_sessions()
+
+    app.register_listener(close_endpoint_sessions, "after_server_stop")
+
     return app
 
 
@@ -147,6 +160,14 @@ def serve_application(
     endpoints: Optional[AvailableEndpoints] = None,
     remote_storage: Optional[Text] = None,
     log_file: Optional[Text] = None,
+    workers: int = constants.DEFAULT_SERVER_WORKERS,
+    nlu_executor: Text = inference.DEFAULT_EXECUTOR_TYPE,
+    policy_executor: Text = inference.DEFAULT_EXECUTOR_TYPE,
+    inference_workers: Optional[int] = None,
+    nlu_batch_size: int = inference.DEFAULT_MAX_BATCH_SIZE,
+    nlu_batch_wait: float = inference.DEFAULT_MAX_BATCH_WAIT_MS,
+    policy_batch_size: int = inference.DEFAULT_MAX_BATCH_SIZE,
+    policy_batch_wait: float = inference.DEFAULT_MAX_BATCH_WAIT_MS,
 ):
     if not channel and not credentials:
         channel = "cmdline"
@@ -165,25 +186,170 @@ def serve_application(
         log_file=log_file,
     )
 
+    workers = number_of_workers(workers, endpoints, input_channels)
+
+    # unpack the model archive only once, all workers load the unpacked model
+    unpacked_model = _unpack_model_for_serving(model_path, remote_storage)
+    if workers > 1:
+        _preload_libraries(unpacked_model)
+
     logger.info(
         "Starting Rasa server on "
         "{}".format(constants.DEFAULT_SERVER_FORMAT.format(port))
     )
 
     app.register_listener(
-        partial(load_agent_on_start, model_path, endpoints, remote_storage),
+        partial(
+            load_agent_on_start, unpacked_model or model_path, endpoints, remote_storage
+        ),
         "before_server_start",
     )
 
     async def clear_model_files(app: Sanic, _loop: Text) -> None:
-        if app.agent.model_directory:
-            shutil.rmtree(app.agent.model_directory)
+        # the initially unpacked model is shared by all workers and is removed
+        # once the server stopped
+        model_directory = app.agent.model_directory
+        if (
+            model_directory
+            and model_directory != unpacked_model
+            and not is_cached_model(model_directory)
+        ):
+            shutil.rmtree(model_directory)
 
     app.register_listener(clear_model_files, "after_server_stop")
 
+    # the executors start their threads and processes lazily within the workers
+    inference.configure(
+        nlu_executor,
+        policy_executor,
+        inference_workers,
+        nlu_batch_size,
+        nlu_batch_wait,
+        policy_batch_size,
+        policy_batch_wait,
+    )
+
+    async def shutdown_inference_executors(_app: Sanic, _loop: Text) -> None:
+        inference.shutdown()
+
+    app.register_listener(shutdown_inference_executors, "after_server_stop")
+
+    async def close_event_broker(app: Sanic, _loop: Text) -> None:
+        # publish the events which are still queued before the server exits
+        tracker_store = getattr(getattr(app, "agent", None), "tracker_store", None)
+        event_broker = getattr(tracker_store, "event_broker", None)
+        if event_broker is not None:
+            await event_broker.flush()
+            event_broker.close()
+
+    app.register_listener(close_event_broker, "after_server_stop")
+
     update_sanic_log_level(log_file)
 
-    app.run(host="0.0.0.0", port=port)
+    try:
+        app.run(host="0.0.0.0", port=port, workers=workers)
+    finally:
+        if unpacked_model and not is_cached_model(unpacked_model):
+            shutil.rmtree(unpacked_model, ignore_errors=True)
+
+
+def number_of_workers(
+    workers: int,
+    endpoints: Optional[AvailableEndpoints],
+    input_channels: List[InputChannel],
+) -> int:
+    """Return the number of worker processes the server can be started with.
+
+    Several workers can only be used if the tracker store and the lock store
+    are shared between processes."""
+
+    if workers <= 1:
+        return 1
+
+    if "cmdline" in {c.name() for c in input_channels}:
+        logger.warning(
+            "The command line channel can only be used with a single worker. "
+            "Starting the server with a single worker."
+        )
+        return 1
+
+    tracker_store = endpoints.tracker_store if endpoints else None
+    lock_store = endpoints.lock_store if endpoints else None
+
+    if (
+        tracker_store is None
+        or tracker_store.type is None
+        or tracker_store.type.lower() == "in_memory"
+        or lock_store is None
+        or lock_store.type in [None, "in_memory"]
+    ):
+        logger.warning(
+            "Using {} workers requires a tracker store and a lock store which are "
+            "shared between processes, but the in-memory tracker store or lock "
+            "store is configured. Starting the server with a single worker "
+            "instead.".format(workers)
+        )
+        return 1
+
+    return workers
+
+
+def _unpack_model_for_serving(
+    model_path: Optional[Text], remote_storage: Optional[Text]
+) -> Optional[Text]:
+    """Unpack the served model archive, returns `None` if there is none."""
+
+    if not model_path or remote_storage:
+        return None
+
+    try:
+        return get_model(model_path)
+    except Exception:
+        logger.debug("Could not unpack model from '{}'.".format(model_path))
+        return None
+
+
+def _preload_libraries(unpacked_model: Optional[Text]) -> None:
+    """Import the policies and NLU components of the model and the libraries
+    they require before the workers are forked.
+
+    The workers then share the memory of the imported libraries (copy-on-write)
+    instead of importing e.g. spaCy or sklearn-crfsuite themselves. The models
+    themselves are loaded within the workers, as TensorFlow sessions must not
+    be shared between processes."""
+    import importlib
+    from rasa.core import registry
+    from rasa.core.policies.ensemble import PolicyEnsemble
+    from rasa.nlu import registry as nlu_registry
+    from rasa.nlu.model import Metadata
+
+    if not unpacked_model:
+        return
+
+    core_model, nlu_model = get_model_subdirectories(unpacked_model)
+    packages = set()
+
+    try:
+        if core_model:
+            metadata = PolicyEnsemble.load_metadata(core_model)
+            for policy_name in metadata.get("policy_names", []):
+                # imports the module of the policy and the libraries it uses
+                registry.policy_from_module_path(policy_name)
+
+        if nlu_model:
+            for component_name in Metadata.load(nlu_model).component_classes:
+                component = nlu_registry.get_component_class(component_name)
+                packages.update(component.required_packages())
+    except Exception as e:
+        logger.debug("Could not preload the libraries of the model: {}".format(e))
+        return
+
+    for package in sorted(packages):
+        try:
+            importlib.import_module(package)
+        except ImportError:
+            # reported once the workers load the model
+            logger.debug("Could not preload package '{}'.".format(package))
 
 
 # noinspection PyUnusedLocal
@@ -201,9 +367,15 @@ async def load_agent_on_start(
     from rasa.core import broker
 
     try:
-        with get_model(model_path) as unpacked_model:
-            _, nlu_model = get_model_subdirectories(unpacked_model)
+        if is_unpacked_model(model_path):
+            _, nlu_model = get_model_subdirectories(model_path)
             _interpreter = NaturalLanguageInterpreter.create(nlu_model, endpoints.nlu)
+        else:
+            with get_model(model_path) as unpacked_model:
+                _, nlu_model = get_model_subdirectories(unpacked_model)
+                _interpreter = NaturalLanguageInterpreter.create(
+                    nlu_model, endpoints.nlu
+                )
     except Exception:
         logger.debug("Could not load interpreter from '{}'.".format(model_path))
         _interpreter = None
@@ -212,6 +384,7 @@ async def load_agent_on_start(
     _tracker_store = TrackerStore.find_tracker_store(
         None, endpoints.tracker_store, _broker
     )
+    _lock_store = LockStore.find_lock_store(endpoints.lock_store)
 
     model_server = endpoints.model if endpoints and endpoints.model else None
 
@@ -222,6 +395,7 @@ async def load_agent_on_start(
         interpreter=_interpreter,
         generator=endpoints.nlg,
         tracker_store=_tracker_store,
+        lock_store=_lock_store,
         action_endpoint=endpoints.action,
     )
 
@@ -234,6 +408,7 @@ async def load_agent_on_start(
             interpreter=_interpreter,
             generator=endpoints.nlg,
             tracker_store=_tracker_store,
+            lock_store=_lock_store,
             action_endpoint=endpoints.action,
             model_server=model_server,
             remote_storage=remote_storage,
@@ -15,6 +15,9 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# number of stories whose actions are predicted together
+STORY_EVALUATION_BATCH_SIZE = 64
+
 StoryEvalution = namedtuple(
     "StoryEvaluation",
     "evaluation_store failed_stories action_list in_training_data_fraction",
@@ -281,7 +284,7 @@ def _emulate_form_rejection(processor, partial_tracker):
 
 
 def _collect_action_executed_predictions(
-    processor, partial_tracker, event, fail_on_prediction_errors
+    processor, partial_tracker, event, fail_on_prediction_errors, prediction=None
 ):
     from rasa.core.policies.form_policy import FormPolicy
 
@@ -289,7 +292,9 @@ def _collect_action_executed_predictions(
 
     gold = event.action_name
 
-    action, policy, confidence = processor.predict_next_action(partial_tracker)
+    if prediction is None:
+        prediction = processor.predict_next_action(partial_tracker)
+    action, policy, confidence = prediction
     predicted = action.name()
 
     if policy and predicted != gold and FormPolicy.__name__ in policy:
@@ -333,23 +338,74 @@ def _collect_action_executed_predictions(
 def _predict_tracker_actions(
     tracker, agent: "Agent", fail_on_prediction_errors=False, use_e2e=False
 ):
+    processor = agent.create_processor()
+
+    return _predict_trackers_actions(
+        [tracker], processor, fail_on_prediction_errors, use_e2e
+    )[0]
+
+
+def _predict_trackers_actions(
+    trackers, processor, fail_on_prediction_errors=False, use_e2e=False
+):
+    """Evaluates the actions of several trackers side by side.
+
+    Whenever all trackers reached their next action, the actions of all
+    trackers are predicted with one batched prediction."""
+
+    results = [None] * len(trackers)
+    waiting = {}  # tracker index -> (evaluation step, partial tracker)
+
+    def _continue(index, step, prediction):
+        try:
+            waiting[index] = (step, step.send(prediction))
+        except StopIteration as e:
+            results[index] = e.value
+
+    for i, tracker in enumerate(trackers):
+        step = _tracker_action_predictions(
+            tracker, processor, fail_on_prediction_errors, use_e2e
+        )
+        _continue(i, step, None)
+
+    while waiting:
+        indices = list(waiting.keys())
+        predictions = processor.predict_next_action_batch(
+            [waiting[i][1] for i in indices]
+        )
+        for i, prediction in zip(indices, predictions):
+            step, _ = waiting.pop(i)
+            _continue(i, step, prediction)
+
+    return results
+
+
+def _tracker_action_predictions(
+    tracker, processor, fail_on_prediction_errors=False, use_e2e=False
+):
+    """Evaluates the actions of a tracker step by step.
+
+    Yields the partial tracker whenever the next action has to be predicted
+    and expects the prediction to be sent back. Returns the evaluation store,
+    the predicted tracker and the predicted actions."""
+
     from rasa.core.trackers import DialogueStateTracker
 
-    processor = agent.create_processor()
     tracker_eval_store = EvaluationStore()
 
     events = list(tracker.events)
 
     partial_tracker = DialogueStateTracker.from_events(
-        tracker.sender_id, events[:1], agent.domain.slots
+        tracker.sender_id, events[:1], processor.domain.slots
     )
 
     tracker_actions = []
 
     for event in events[1:]:
         if isinstance(event, ActionExecuted):
+            prediction = yield partial_tracker
             action_executed_result, policy, confidence = _collect_action_executed_predictions(
-                processor, partial_tracker, event, fail_on_prediction_errors
+                processor, partial_tracker, event, fail_on_prediction_errors, prediction
             )
             tracker_eval_store.merge_store(action_executed_result)
             tracker_actions.append(
@@ -406,11 +462,19 @@ def collect_story_predictions(
 
     action_list = []
 
-    for tracker in tqdm(completed_trackers):
-        tracker_results, predicted_tracker, tracker_actions = _predict_tracker_actions(
-            tracker, agent, fail_on_prediction_errors, use_e2e
-        )
+    processor = agent.create_processor()
+    predictions = []
+    with tqdm(total=number_of_stories) as progress_bar:
+        for start in range(0, number_of_stories, STORY_EVALUATION_BATCH_SIZE):
+            batch = completed_trackers[start : start + STORY_EVALUATION_BATCH_SIZE]
+            predictions.extend(
+                _predict_trackers_actions(
+                    batch, processor, fail_on_prediction_errors, use_e2e
+                )
+            )
+            progress_bar.update(len(batch))
 
+    for tracker_results, predicted_tracker, tracker_actions in predictions:
         story_eval_store.merge_store(tracker_results)
 
         action_list.extend(tracker_actions)
@@ -1,8 +1,13 @@
+import base64
 import json
 import logging
+import os
 import pickle
+import time
 import typing
-from typing import Iterator, Optional, Text, Iterable, Union
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Text, Iterable, Tuple, Union
 
 import itertools
 
@@ -11,9 +16,13 @@ from time import sleep
 
 from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.broker import EventChannel
+from rasa.core import events
 from rasa.core.domain import Domain
+from rasa.core.events import Event, Restarted
+from rasa.core.events.compact import decode_events, encode_events
 from rasa.core.trackers import ActionExecuted, DialogueStateTracker, EventVerbosity
 from rasa.utils.common import class_from_module_path
+from rasa.utils.metrics import registry
 
 if typing.TYPE_CHECKING:
     from sqlalchemy.engine.url import URL
@@ -32,18 +41,29 @@ class TrackerStore(object):
     # sql数据库中（SQLTrackerStore）（rasa默认使用的是这个，具体用sqlite,也可以通过配置改为MySQL）
     # 通过继承TrackerStore，可以实现自定义的tracker store
 
+    # number of senders for which marks about their stored and streamed events
+    # are kept, the marks of the least recently used senders are dropped
+    MAX_EVENT_MARKS = 10000
+
     def __init__(
         self, domain: Optional[Domain], event_broker: Optional[EventChannel] = None
     ) -> None:
         self.domain = domain
         self.event_broker = event_broker  # TODO:搞清楚event_broker作用
         self.max_event_history = None  # TODO:搞清楚max_event_history作用
+        # number of leading events of the most recently retrieved / saved tracker
+        # which were already streamed to the event broker, per sender
+        self._streamed_events = OrderedDict()  # type: OrderedDict[Text, int]
 
     @staticmethod
     def find_tracker_store(domain, store=None, event_broker=None):
         if store is None or store.type is None:
             # 没有指定store 或者没有指定store类型时，默认用InMemoryTrackerStore
             tracker_store = InMemoryTrackerStore(domain, event_broker=event_broker)
+        elif store.type.lower() == "in_memory":
+            tracker_store = InMemoryTrackerStore(
+                domain, event_broker=event_broker, **store.kwargs
+            )
         elif store.type == "redis":
             tracker_store = RedisTrackerStore(
                 domain=domain, host=store.url, event_broker=event_broker, **store.kwargs
@@ -118,12 +138,75 @@ class TrackerStore(object):
         raise NotImplementedError()
 
     def stream_events(self, tracker: DialogueStateTracker) -> None:
-        offset = self.number_of_existing_events(tracker.sender_id)  # 这个ID记录在自己tracker中的事件数量
+        """Publish the events of the tracker which were not streamed yet.
+
+        Uses the number of events streamed for this sender during the last
+        `retrieve` / `save` and only falls back to counting the stored events
+        (which retrieves the stored tracker) if there is none."""
+
+        offset = self._streamed_events.get(tracker.sender_id)
+        if offset is None:
+            offset = self.number_of_existing_events(tracker.sender_id)
         evts = tracker.events
-        for evt in list(itertools.islice(evts, offset, len(evts))):  # offset == len(evts) ?
-            body = {"sender_id": tracker.sender_id}
+        self._publish_events(
+            tracker.sender_id, itertools.islice(evts, offset, len(evts))
+        )
+        self._remember_mark(self._streamed_events, tracker.sender_id, len(evts))
+
+    def _remember_streamed_events(
+        self, sender_id: Text, tracker: Optional[DialogueStateTracker]
+    ) -> None:
+        """Mark the events of a retrieved tracker as streamed, as every stored
+        event was streamed when it was saved."""
+
+        n_events = len(tracker.events) if tracker else 0
+        self._remember_mark(self._streamed_events, sender_id, n_events)
+
+    def _remember_mark(
+        self, marks: "OrderedDict[Text, Any]", sender_id: Text, mark: Any
+    ) -> None:
+        """Remember a mark of a sender, e.g. the number of its stored events.
+
+        Only the marks of the `MAX_EVENT_MARKS` most recently used senders are
+        kept. Stores fall back to querying the stored conversation if a mark is
+        missing."""
+
+        marks[sender_id] = mark
+        marks.move_to_end(sender_id)
+        while len(marks) > self.MAX_EVENT_MARKS:
+            marks.popitem(last=False)
+
+    def _forget_marks(self, sender_id: Text) -> None:
+        """Drop the marks of a sender, e.g. once its conversation is evicted."""
+
+        self._streamed_events.pop(sender_id, None)
+
+    def _publish_events(self, sender_id: Text, evts: Iterable[Event]) -> None:
+        """Publish events of a conversation to the event broker as one batch."""
+
+        bodies = []
+        for evt in evts:
+            body = {"sender_id": sender_id}
             body.update(evt.as_dict())
-            self.event_broker.publish(body)  # TODO: 作用？
+            bodies.append(body)
+
+        if bodies:
+            self.event_broker.publish_batch(bodies)
+
+    @staticmethod
+    def _extends_stored_events(
+        tracker: DialogueStateTracker, n_stored: int, last_stored: Optional[Event]
+    ) -> bool:
+        """Check whether the tracker starts with the stored events.
+
+        Events are only ever appended to a tracker, so it starts with the stored
+        events if the last stored event is the very same object at the same
+        position. Replaced events (e.g. of a tracker recreated from its dump)
+        are different objects, even if they are equal to the stored ones."""
+
+        if n_stored > len(tracker.events):
+            return False
+        return n_stored == 0 or tracker.events[n_stored - 1] is last_stored
 
     def number_of_existing_events(self, sender_id: Text) -> int:
         """Return number of stored events for a given sender id."""
@@ -154,37 +237,204 @@ class TrackerStore(object):
 
 
 class InMemoryTrackerStore(TrackerStore):
+    """Store which keeps the trackers in memory.
+
+    Instead of pickling every saved tracker and replaying it on every
+    `retrieve`, the store keeps a copy of the saved tracker and hands out copies
+    of it. The copies share the (immutable) events and only duplicate the
+    tracker state.
+
+    The number of kept conversations can be limited with `max_conversations`,
+    the least recently used conversations are evicted first. Conversations
+    which were not accessed for `conversation_ttl` seconds expire. If a
+    `spill_path` is set, evicted conversations are written to this directory
+    and loaded again once they are retrieved."""
+
+    SPILL_FILE_SUFFIX = ".pkl"
 
     def __init__(
-        self, domain: Domain, event_broker: Optional[EventChannel] = None
+        self,
+        domain: Domain,
+        event_broker: Optional[EventChannel] = None,
+        max_conversations: Optional[int] = None,
+        conversation_ttl: Optional[float] = None,
+        spill_path: Optional[Text] = None,
     ) -> None:
-        self.store = {}  # 新增属性，各个tracker在内存中以字典形式组织，key为sender_id，value为序列化的tracker
+        # sender id -> (tracker, time of the last access), least recently used
+        # conversation first
+        self.store = (
+            OrderedDict()
+        )  # type: OrderedDict[Text, Tuple[DialogueStateTracker, float]]
+        self.max_conversations = max_conversations
+        self.conversation_ttl = conversation_ttl
+        self.spill_path = spill_path
+        if spill_path:
+            os.makedirs(spill_path, exist_ok=True)
         super(InMemoryTrackerStore, self).__init__(domain, event_broker)
 
     def save(self, tracker: DialogueStateTracker) -> None:
         # 把tracker添加到store中
         if self.event_broker:
-            self.stream_events(tracker) # todo:作用？
-        serialised = InMemoryTrackerStore.serialise_tracker(tracker)
-        self.store[tracker.sender_id] = serialised
+            self.stream_events(tracker)  # todo:作用？
+
+        # later changes of the saved tracker must not change the stored one
+        self._keep(tracker.sender_id, self._copy_tracker(tracker))
+        self._remove_spilled(tracker.sender_id)
+        self._evict()
 
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         # 查找特定的tracker
+        self._expire()
+
         if sender_id in self.store:
+            stored, _ = self.store[sender_id]
+            registry.increment("tracker_store.in_memory.hits")
+        else:
+            stored = self._load_spilled(sender_id)
+            if stored is None:
+                registry.increment("tracker_store.in_memory.misses")
+
+        if stored is not None:
             logger.debug("Recreating tracker for id '{}'".format(sender_id))
-            return self.deserialise_tracker(sender_id, self.store[sender_id])
+            self._keep(sender_id, stored)
+            self._evict()
+            # changes of the retrieved tracker must not change the stored one
+            tracker = self._copy_tracker(stored)
         else:
             logger.debug("Creating a new tracker for id '{}'.".format(sender_id))
-            return None
+            tracker = None
+
+        self._remember_streamed_events(sender_id, tracker)
+        return tracker
 
     def keys(self) -> Iterable[Text]:
         # 返回所有受维护的sender_id
-        return self.store.keys()
+        self._expire()
+        return list(self.store.keys()) + self._spilled_keys()
+
+    def _copy_tracker(self, tracker: DialogueStateTracker) -> DialogueStateTracker:
+        """Copy a tracker by restoring a snapshot of it, the events are shared
+        with the copied tracker and not replayed."""
+
+        copied = self.init_tracker(tracker.sender_id)
+        copied.restore_from_snapshot(tracker.as_snapshot(), list(tracker.events))
+        return copied
+
+    def _keep(self, sender_id: Text, tracker: DialogueStateTracker) -> None:
+        self.store[sender_id] = (tracker, time.time())
+        self.store.move_to_end(sender_id)
+
+    def _expire(self) -> None:
+        """Drop the conversations which were not accessed within the ttl.
+
+        The conversations are ordered by their last access, hence only the
+        expired ones at the front need to be checked."""
+
+        if self.conversation_ttl is None:
+            return
+
+        expired_before = time.time() - self.conversation_ttl
+        while self.store:
+            sender_id, (_, last_access) = next(iter(self.store.items()))
+            if last_access > expired_before:
+                break
+            del self.store[sender_id]
+            self._forget_marks(sender_id)
+            registry.increment("tracker_store.in_memory.expirations")
+
+        registry.set_gauge("tracker_store.in_memory.conversations", len(self.store))
+
+    def _evict(self) -> None:
+        """Evict the least recently used conversations which exceed the capacity
+        of the store."""
+
+        self._expire()
+
+        if self.max_conversations is not None:
+            while len(self.store) > self.max_conversations:
+                sender_id, (tracker, _) = self.store.popitem(last=False)
+                self._forget_marks(sender_id)
+                if self.spill_path:
+                    self._spill(tracker)
+                registry.increment("tracker_store.in_memory.evictions")
+
+        registry.set_gauge("tracker_store.in_memory.conversations", len(self.store))
+
+    def _spill_file(self, sender_id: Text) -> Text:
+        # the file name encodes the sender id, so that `keys` can decode it
+        name = base64.urlsafe_b64encode(sender_id.encode("utf-8")).decode("ascii")
+        return os.path.join(self.spill_path, name + self.SPILL_FILE_SUFFIX)
+
+    def _spill(self, tracker: DialogueStateTracker) -> None:
+        """Write an evicted conversation to the spill directory."""
+
+        path = self._spill_file(tracker.sender_id)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((tracker.as_snapshot(), encode_events(tracker.events)), f)
+        os.replace(path + ".tmp", path)
+        registry.increment("tracker_store.in_memory.spills")
+
+    def _load_spilled(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        """Load a spilled conversation and remove it from the spill directory."""
+
+        if not self.spill_path:
+            return None
+
+        path = self._spill_file(sender_id)
+        try:
+            with open(path, "rb") as f:
+                snapshot, encoded = pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+        self._remove_spilled(sender_id)
+        registry.increment("tracker_store.in_memory.spill_hits")
+
+        tracker = self.init_tracker(sender_id)
+        tracker.restore_from_snapshot(snapshot, decode_events(encoded))
+        return tracker
+
+    def _remove_spilled(self, sender_id: Text) -> None:
+        if self.spill_path:
+            try:
+                os.remove(self._spill_file(sender_id))
+            except FileNotFoundError:
+                pass
+
+    def _spilled_keys(self) -> List[Text]:
+        if not self.spill_path:
+            return []
+
+        return [
+            base64.urlsafe_b64decode(name[: -len(self.SPILL_FILE_SUFFIX)]).decode(
+                "utf-8"
+            )
+            for name in os.listdir(self.spill_path)
+            if name.endswith(self.SPILL_FILE_SUFFIX)
+        ]
 
 
 class RedisTrackerStore(TrackerStore):
+    """Store which can save and retrieve trackers from Redis.
+
+    By default every tracker is stored as a single pickled value. With
+    `use_event_lists` the events of a conversation are kept in a Redis list to
+    which only new events are appended, while a snapshot of the tracker state
+    is kept in a hash next to it."""
+
+    EVENTS_KEY_PREFIX = "tracker_events:"
+    STATE_KEY_PREFIX = "tracker_state:"
+
     def keys(self) -> Iterable[Text]:
-        return self.red.keys()
+        # `SCAN` iterates incrementally instead of blocking the server like `KEYS`
+        if not self.use_event_lists:
+            return self.red.scan_iter()
+
+        prefix = self.STATE_KEY_PREFIX.encode("utf-8")
+        return [
+            key[len(prefix) :].decode("utf-8")
+            for key in self.red.scan_iter(match=prefix + b"*")
+        ]
 
     def __init__(
         self,
@@ -195,30 +445,195 @@ class RedisTrackerStore(TrackerStore):
         password=None,
         event_broker=None,
         record_exp=None,
+        use_event_lists=False,
+        load_events_after_restart=False,
     ):
 
         import redis
 
         self.red = redis.StrictRedis(host=host, port=port, db=db, password=password)  # 连接redis
         self.record_exp = record_exp  # redis过期时间（秒）
+        self.use_event_lists = use_event_lists
+        # only used together with `use_event_lists`
+        self.load_events_after_restart = load_events_after_restart
+        # index of the first loaded event, number of tracker events which are
+        # already stored in the event list, the last stored event and the
+        # version of the stored events, per sender
+        self._event_list_marks = (
+            OrderedDict()
+        )  # type: OrderedDict[Text, Tuple[int, int, Optional[Event], Optional[Text]]]
         super(RedisTrackerStore, self).__init__(domain, event_broker)
 
     def save(self, tracker, timeout=None):
-        if self.event_broker:
-            self.stream_events(tracker)
-
         if not timeout and self.record_exp:  # 方法中和store中都设置了过期时间，按store的过期时间算
             timeout = self.record_exp
 
+        if self.use_event_lists:
+            self._save_to_event_list(tracker, timeout)
+            return
+
+        if self.event_broker:
+            self.stream_events(tracker)
+
         serialised_tracker = self.serialise_tracker(tracker)
         self.red.set(tracker.sender_id, serialised_tracker, ex=timeout)
 
     def retrieve(self, sender_id):
+        if self.use_event_lists:
+            return self._retrieve_from_event_list(sender_id)
+
         stored = self.red.get(sender_id)
         if stored is not None:
-            return self.deserialise_tracker(sender_id, stored)
+            tracker = self.deserialise_tracker(sender_id, stored)
         else:
+            tracker = None
+
+        self._remember_streamed_events(sender_id, tracker)
+        return tracker
+
+    def _events_key(self, sender_id: Text) -> Text:
+        return self.EVENTS_KEY_PREFIX + sender_id
+
+    def _state_key(self, sender_id: Text) -> Text:
+        return self.STATE_KEY_PREFIX + sender_id
+
+    def _save_to_event_list(
+        self, tracker: DialogueStateTracker, timeout: Optional[int] = None
+    ) -> None:
+        """Append the new events of the tracker to its event list and update the
+        stored snapshot, all within a single transaction.
+
+        The state hash keeps the number of stored events and a version which
+        changes with every write. If the tracker does not start with the stored
+        events (e.g. its events were replaced) or another process wrote the
+        conversation since it was loaded, the event list is rewritten instead."""
+        from redis import WatchError
+
+        sender_id = tracker.sender_id
+        first_index, n_stored, last_stored, version = self._event_list_marks.get(
+            sender_id, (0, None, None, None)
+        )
+        replace_events = n_stored is None or not self._extends_stored_events(
+            tracker, n_stored, last_stored
+        )
+
+        while True:
+            try:
+                self._write_event_list(
+                    tracker, first_index, n_stored, version, replace_events, timeout
+                )
+                return
+            except WatchError:
+                # the conversation was written by another process meanwhile
+                replace_events = True
+
+    def _write_event_list(
+        self,
+        tracker: DialogueStateTracker,
+        first_index: int,
+        n_stored: Optional[int],
+        version: Optional[Text],
+        replace_events: bool,
+        timeout: Optional[int] = None,
+    ) -> None:
+        sender_id = tracker.sender_id
+        events_key = self._events_key(sender_id)
+        state_key = self._state_key(sender_id)
+
+        with self.red.pipeline(transaction=True) as pipe:
+            pipe.watch(state_key)
+            if not replace_events:
+                stored_version, stored_n_events = pipe.hmget(
+                    state_key, "events_version", "n_events"
+                )
+                if stored_version is not None:
+                    stored_version = stored_version.decode("utf-8")
+                replace_events = stored_version != version or int(
+                    stored_n_events or 0
+                ) != (first_index + n_stored)
+
+            if replace_events:
+                first_index, n_stored = 0, 0
+
+            new_events = list(
+                itertools.islice(tracker.events, n_stored, len(tracker.events))
+            )
+
+            snapshot = tracker.as_snapshot()
+            # the offset within the stored list, not within the loaded events
+            snapshot["event_offset"] += first_index
+            version = uuid.uuid4().hex
+            state = {
+                "snapshot": json.dumps(snapshot),
+                "events_version": version,
+                "n_events": first_index + len(tracker.events),
+            }
+            if replace_events:
+                state["restart_offset"] = 0
+            for i, evt in enumerate(new_events):
+                if isinstance(evt, Restarted):
+                    state["restart_offset"] = first_index + n_stored + i
+
+            pipe.multi()
+            if replace_events:
+                pipe.delete(events_key)
+            if new_events:
+                pipe.rpush(events_key, *[json.dumps(e.as_dict()) for e in new_events])
+            pipe.hmset(state_key, state)
+            if timeout:
+                pipe.expire(events_key, timeout)
+                pipe.expire(state_key, timeout)
+            pipe.execute()
+
+        if self.event_broker:
+            self._publish_events(sender_id, new_events)
+
+        mark = (
+            first_index,
+            len(tracker.events),
+            tracker.events[-1] if tracker.events else None,
+            version,
+        )
+        self._remember_mark(self._event_list_marks, sender_id, mark)
+
+    def _retrieve_from_event_list(
+        self, sender_id: Text
+    ) -> Optional[DialogueStateTracker]:
+        """Recreate a tracker from its stored snapshot and the events in its
+        event list."""
+
+        state = self.red.hgetall(self._state_key(sender_id))
+        if not state:
+            self._remember_mark(self._event_list_marks, sender_id, (0, 0, None, None))
             return None
+
+        first_index = 0
+        if self.load_events_after_restart:
+            first_index = int(state.get(b"restart_offset", 0))
+
+        stored = self.red.lrange(self._events_key(sender_id), first_index, -1)
+        evts = events.deserialise_events([json.loads(e) for e in stored])
+        version = state.get(b"events_version")
+        mark = (
+            first_index,
+            len(evts),
+            evts[-1] if evts else None,
+            version.decode("utf-8") if version is not None else None,
+        )
+        self._remember_mark(self._event_list_marks, sender_id, mark)
+
+        snapshot = json.loads(state[b"snapshot"])
+        snapshot["event_offset"] = max(snapshot["event_offset"] - first_index, 0)
+
+        return DialogueStateTracker.from_snapshot(
+            sender_id,
+            snapshot,
+            evts,
+            self.domain.slots if self.domain else None,
+            self.max_event_history,
+        )
+
+
 # 使用redis来存储tracker的方法：
 #     1.启动redis服务
 #
@@ -238,6 +653,19 @@ class RedisTrackerStore(TrackerStore):
 # #################################################
 
 class MongoTrackerStore(TrackerStore):
+    """Store which can save and retrieve trackers from MongoDB.
+
+    Every conversation is stored as a single document. On every save only the
+    new events are appended to the `events` array of the document and only the
+    state fields which changed are updated. Every write stores a new
+    `events_version` in the document, so that events are only appended if no
+    other process wrote the document since it was loaded. Otherwise, or if the
+    events of the tracker were replaced, all events are rewritten."""
+
+    # `$slice` requires a limit when skipping elements, this limit covers all
+    # remaining events of a conversation
+    MAX_EVENTS_LIMIT = 2 ** 31 - 1
+
     def __init__(
         self,
         domain,
@@ -248,6 +676,7 @@ class MongoTrackerStore(TrackerStore):
         auth_source="admin",
         collection="conversations",
         event_broker=None,
+        load_events_after_restart=False,
     ):
         from pymongo.database import Database
         from pymongo import MongoClient
@@ -263,6 +692,17 @@ class MongoTrackerStore(TrackerStore):
 
         self.db = Database(self.client, db)
         self.collection = collection
+        self.load_events_after_restart = load_events_after_restart
+        # index of the first loaded event, number of tracker events which are
+        # already stored in the document, the last stored event and the version
+        # of the stored events, per sender
+        self._event_marks = (
+            OrderedDict()
+        )  # type: OrderedDict[Text, Tuple[int, int, Optional[Event], Optional[Text]]]
+        # state fields of the stored document, per sender
+        self._stored_states = (
+            OrderedDict()
+        )  # type: OrderedDict[Text, Dict[Text, Any]]
         super(MongoTrackerStore, self).__init__(domain, event_broker)
 
         self._ensure_indices()
@@ -272,20 +712,154 @@ class MongoTrackerStore(TrackerStore):
         return self.db[self.collection]
 
     def _ensure_indices(self):
-        self.conversations.create_index("sender_id")
+        from pymongo.errors import OperationFailure
+
+        try:
+            self.conversations.create_index("sender_id", unique=True)
+        except OperationFailure as e:
+            # e.g. the collection still has the non-unique index of earlier
+            # versions or contains several documents for the same sender
+            logger.warning(
+                "Could not create a unique index on 'sender_id' in the "
+                "collection '{}': {}. Drop the existing 'sender_id' index "
+                "to create it.".format(self.collection, e)
+            )
 
     def save(self, tracker, timeout=None):
         if self.event_broker:
             self.stream_events(tracker)
 
-        state = tracker.current_state(EventVerbosity.ALL)
+        first_index, n_stored, last_stored, version = self._event_marks.get(
+            tracker.sender_id, (0, None, None, None)
+        )
+        # the stored events are unknown or the tracker does not start with them,
+        # e.g. because its events were replaced
+        if n_stored is None or not self._extends_stored_events(
+            tracker, n_stored, last_stored
+        ):
+            self._replace_document(tracker)
+        elif not self._update_document(tracker, first_index, n_stored, version):
+            logger.debug(
+                "Conversation '{}' was changed by another process. Rewriting "
+                "all of its events.".format(tracker.sender_id)
+            )
+            self._replace_document(tracker)
 
+    def _update_document(
+        self,
+        tracker: DialogueStateTracker,
+        first_index: int,
+        n_stored: int,
+        version: Optional[Text],
+    ) -> bool:
+        """Append the new events of the tracker to the stored events and update
+        the changed state fields.
+
+        Returns `False` if the stored events are not of the expected version."""
+        from pymongo.errors import DuplicateKeyError
+
+        sender_id = tracker.sender_id
+        stored_state = self._stored_states.get(sender_id, {})
+        new_events = list(
+            itertools.islice(tracker.events, n_stored, len(tracker.events))
+        )
+        state = self._document_state(
+            tracker,
+            first_index,
+            n_stored,
+            new_events,
+            stored_state.get("restart_offset", 0),
+        )
+
+        changed = {
+            key: value
+            for key, value in state.items()
+            if key not in stored_state or stored_state[key] != value
+        }
+        if new_events or changed:
+            changed["events_version"] = uuid.uuid4().hex
+            update = {"$set": changed}
+            if new_events:
+                serialised = [e.as_dict() for e in new_events]
+                update["$push"] = {"events": {"$each": serialised}}
+
+            # conversations without stored events are created by the update
+            created = n_stored == 0
+            try:
+                result = self.conversations.update_one(
+                    {"sender_id": sender_id, "events_version": version},
+                    update,
+                    upsert=created,
+                )
+            except DuplicateKeyError:
+                return False
+            if not created and result.matched_count == 0:
+                return False
+            version = changed["events_version"]
+
+        self._remember_stored(tracker, first_index, version, state)
+        return True
+
+    def _replace_document(self, tracker: DialogueStateTracker) -> None:
+        """Rewrite all events and state fields of the stored conversation."""
+
+        evts = list(tracker.events)
+        state = self._document_state(tracker, 0, 0, evts, 0)
+        version = uuid.uuid4().hex
+
+        document = dict(state)
+        document["events"] = [e.as_dict() for e in evts]
+        document["events_version"] = version
         self.conversations.update_one(
-            {"sender_id": tracker.sender_id}, {"$set": state}, upsert=True
+            {"sender_id": tracker.sender_id}, {"$set": document}, upsert=True
         )
 
+        self._remember_stored(tracker, 0, version, state)
+
+    def _remember_stored(
+        self,
+        tracker: DialogueStateTracker,
+        first_index: int,
+        version: Optional[Text],
+        state: Dict[Text, Any],
+    ) -> None:
+        evts = tracker.events
+        mark = (first_index, len(evts), evts[-1] if evts else None, version)
+        self._remember_mark(self._event_marks, tracker.sender_id, mark)
+        self._remember_mark(self._stored_states, tracker.sender_id, state)
+
+    @staticmethod
+    def _document_state(
+        tracker: DialogueStateTracker,
+        first_index: int,
+        n_stored: int,
+        new_events: List[Event],
+        restart_offset: int,
+    ) -> Dict[Text, Any]:
+        """Create the fields of a conversation document besides its events."""
+
+        state = tracker.current_state(EventVerbosity.NONE)
+        del state["events"]
+
+        snapshot = tracker.as_snapshot()
+        # the offset within the stored events, not within the loaded events
+        snapshot["event_offset"] += first_index
+        state["snapshot"] = snapshot
+
+        for i, evt in enumerate(new_events):
+            if isinstance(evt, Restarted):
+                restart_offset = first_index + n_stored + i
+        state["restart_offset"] = restart_offset
+
+        return state
+
     def retrieve(self, sender_id):
-        stored = self.conversations.find_one({"sender_id": sender_id})
+        projection = {"_id": 0}
+        if self.load_events_after_restart:
+            # the events are loaded separately, starting with the latest restart
+            projection["events"] = 0
+
+        stored = self.conversations.find_one({"sender_id": sender_id}, projection)
 
         # look for conversations which have used an `int` sender_id in the past
         # and update them.
@@ -295,26 +869,86 @@ class MongoTrackerStore(TrackerStore):
             stored = self.conversations.find_one_and_update(
                 {"sender_id": int(sender_id)},
                 {"$set": {"sender_id": str(sender_id)}},
+                projection=projection,
                 return_document=ReturnDocument.AFTER,
             )
 
-        if stored is not None:
-            if self.domain:
-                return DialogueStateTracker.from_dict(
-                    sender_id, stored.get("events"), self.domain.slots
-                )
-            else:
-                logger.warning(
-                    "Can't recreate tracker from mongo storage "
-                    "because no domain is set. Returning `None` "
-                    "instead."
-                )
-                return None
-        else:
+        if stored is None:
+            self._remember_mark(self._event_marks, sender_id, (0, 0, None, None))
+            self._remember_mark(self._stored_states, sender_id, {})
+            self._remember_streamed_events(sender_id, None)
+            return None
+
+        if not self.domain:
+            logger.warning(
+                "Can't recreate tracker from mongo storage "
+                "because no domain is set. Returning `None` "
+                "instead."
+            )
             return None
 
+        first_index = 0
+        if self.load_events_after_restart:
+            first_index = stored.get("restart_offset") or 0
+            stored["events"] = self._stored_events(sender_id, first_index)
+
+        evts = events.deserialise_events(stored.pop("events", None) or [])
+        mark = (
+            first_index,
+            len(evts),
+            evts[-1] if evts else None,
+            stored.get("events_version"),
+        )
+        self._remember_mark(self._event_marks, sender_id, mark)
+        self._remember_mark(self._stored_states, sender_id, stored)
+
+        tracker = self._tracker_from_stored(sender_id, stored, evts, first_index)
+        self._remember_streamed_events(sender_id, tracker)
+        return tracker
+
+    def _stored_events(
+        self, sender_id: Text, first_index: int
+    ) -> List[Dict[Text, Any]]:
+        """Load the stored events of a conversation starting with the event at
+        `first_index`."""
+
+        if first_index > 0:
+            events_projection = {"$slice": [first_index, self.MAX_EVENTS_LIMIT]}
+        else:
+            events_projection = 1
+
+        stored = self.conversations.find_one(
+            {"sender_id": sender_id}, {"_id": 0, "events": events_projection}
+        )
+        return (stored.get("events") or []) if stored else []
+
+    def _tracker_from_stored(
+        self,
+        sender_id: Text,
+        stored: Dict[Text, Any],
+        evts: List[Event],
+        first_index: int = 0,
+    ) -> DialogueStateTracker:
+        """Recreate a tracker from the fields of a stored conversation document
+        and its loaded events, which start with the event at `first_index`."""
+
+        snapshot = stored.get("snapshot")
+        if snapshot is None:
+            # conversation was stored before snapshots were persisted
+            return DialogueStateTracker.from_events(
+                sender_id, evts, self.domain.slots
+            )
+
+        snapshot = dict(snapshot)
+        snapshot["event_offset"] = max(snapshot["event_offset"] - first_index, 0)
+        return DialogueStateTracker.from_snapshot(
+            sender_id, snapshot, evts, self.domain.slots
+        )
+
     def keys(self) -> Iterable[Text]:
-        return [c["sender_id"] for c in self.conversations.find()]
+        # only the sender ids are fetched, not the whole conversations
+        cursor = self.conversations.find({}, {"_id": 0, "sender_id": 1})
+        return (c["sender_id"] for c in cursor)
 
 
 # 使用mongoDB来存储tracker的方法
@@ -362,6 +996,20 @@ class SQLTrackerStore(TrackerStore):
         action_name = Column(String(255))
         data = Column(Text)
 
+    class SQLTrackerSnapshot(Base):
+        from sqlalchemy import Column, Integer, String, Text
+
+        __tablename__ = "tracker_snapshots"
+
+        sender_id = Column(String(255), primary_key=True)
+        # id of the last event in the `events` table which the snapshot covers
+        event_id = Column(Integer, nullable=False)
+        data = Column(Text)
+
+    # rows per `INSERT` statement, which keeps the number of bound parameters
+    # below the limit of SQLite (999 by default) and other databases
+    MAX_INSERT_ROWS = 100
+
     # 连接数据库，建库建表
     def __init__(
         self,
@@ -374,6 +1022,7 @@ class SQLTrackerStore(TrackerStore):
         password: Text = None,
         event_broker: Optional[EventChannel] = None,
         login_db: Optional[Text] = None,
+        load_events_after_restart: bool = False,
     ) -> None:
         import sqlalchemy
         from sqlalchemy.orm import sessionmaker
@@ -419,6 +1068,14 @@ class SQLTrackerStore(TrackerStore):
 
         logger.debug("Connection to SQL database '{}' successful".format(db))
 
+        # only load the events after the most recent `Restarted` event when
+        # recreating a tracker (the tracker state does not depend on earlier events)
+        self.load_events_after_restart = load_events_after_restart
+        # high-water mark per sender: number of leading events of the most recently
+        # retrieved / saved tracker which are already stored in the database,
+        # for the most recently used senders only
+        self._persisted_events = OrderedDict()  # type: OrderedDict[Text, int]
+
         super(SQLTrackerStore, self).__init__(domain, event_broker)
 
     @staticmethod
@@ -510,18 +1167,39 @@ class SQLTrackerStore(TrackerStore):
         sender_ids = self.session.query(self.SQLEvent.sender_id).distinct().all()  # 无重复的所有senderID
         return [sender_id for (sender_id,) in sender_ids]
 
+    def _event_query(self, sender_id: Text):
+        """Provide the query to retrieve the stored events of a conversation.
+
+        If `load_events_after_restart` is set, only the events starting with the
+        most recent `Restarted` event are selected."""
+        from sqlalchemy import func
+
+        query = self.session.query(self.SQLEvent).filter_by(sender_id=sender_id)
+
+        if self.load_events_after_restart:
+            latest_restart = (
+                self.session.query(func.max(self.SQLEvent.id))
+                .filter_by(sender_id=sender_id, type_name=Restarted.type_name)
+                .scalar()
+            )
+            if latest_restart is not None:
+                query = query.filter(self.SQLEvent.id >= latest_restart)
+
+        return query.order_by(self.SQLEvent.id)
+
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         """Create a tracker from all previously stored events."""
         # 基于数据库中记录的events，重放出一个tracker
-        query = self.session.query(self.SQLEvent)
-        result = query.filter_by(sender_id=sender_id).all()
-        events = [json.loads(event.data) for event in result]
+        result = self._event_query(sender_id).all()
+
+        # every event loaded into the tracker is already stored in the database
+        self._remember_mark(self._persisted_events, sender_id, len(result))
 
-        if self.domain and len(events) > 0:
+        if self.domain and len(result) > 0:
             # store定义了domain，并且存在至少一条event
             logger.debug("Recreating tracker from sender id '{}'".format(sender_id))
 
-            return DialogueStateTracker.from_dict(sender_id, events, self.domain.slots)  # 基于事件创建tracker
+            return self._tracker_from_rows(sender_id, result)
         else:
             # 要么store没定义domain， 要么对应sender id 没有事件
             logger.debug(
@@ -531,41 +1209,88 @@ class SQLTrackerStore(TrackerStore):
             )
             return None
 
+    def _tracker_from_rows(
+        self, sender_id: Text, rows: List["SQLTrackerStore.SQLEvent"]
+    ) -> DialogueStateTracker:
+        """Recreate a tracker from its stored events and its latest snapshot."""
+
+        evts = events.deserialise_events([json.loads(row.data) for row in rows])
+        stored_snapshot = self.session.query(self.SQLTrackerSnapshot).get(sender_id)
+
+        if stored_snapshot is None:
+            # 基于事件创建tracker
+            return DialogueStateTracker.from_events(sender_id, evts, self.domain.slots)
+
+        snapshot = json.loads(stored_snapshot.data)
+        # the loaded events might start after the first stored event, hence the
+        # offset needs to be relative to the loaded events
+        snapshot["event_offset"] = len(
+            [row for row in rows if row.id <= stored_snapshot.event_id]
+        )
+        return DialogueStateTracker.from_snapshot(
+            sender_id, snapshot, evts, self.domain.slots
+        )
+
     def save(self, tracker: DialogueStateTracker) -> None:
         """Update database with events from the current conversation."""
 
         if self.event_broker:  # 好几处都出现了这段代码，搞成装饰器？
             self.stream_events(tracker)
 
-        events = self._additional_events(tracker)  # only store recent events
+        new_events = list(self._additional_events(tracker))  # only store recent events
         # 写在tracker中，但还不在数据库中的新events
-        for event in events:
-            # 从单个事件中抽取信息
-            data = event.as_dict()
-
-            intent = data.get("parse_data", {}).get("intent", {}).get("name")
-            action = data.get("name")
-            timestamp = data.get("timestamp")
-
-            # noinspection PyArgumentList
-            self.session.add(
-                self.SQLEvent(
-                    sender_id=tracker.sender_id,
-                    type_name=event.type_name,
-                    timestamp=timestamp,
-                    intent_name=intent,
-                    action_name=action,
-                    data=json.dumps(data),
-                )
-            )
-        # 逐条保存新发生的事件到数据库中
-        self.session.commit()
+        if new_events:
+            rows = [self._event_row(tracker.sender_id, e) for e in new_events]
+            # multi-row `INSERT ... VALUES` statements instead of one per event
+            for i in range(0, len(rows), self.MAX_INSERT_ROWS):
+                chunk = rows[i : i + self.MAX_INSERT_ROWS]
+                self.session.execute(self.SQLEvent.__table__.insert().values(chunk))
+            self._save_snapshot(tracker)
+            self.session.commit()
+
+        n_events = len(tracker.events)
+        self._remember_mark(self._persisted_events, tracker.sender_id, n_events)
 
         logger.debug(
             "Tracker with sender_id '{}' "
             "stored to database".format(tracker.sender_id)
         )
 
+    def _save_snapshot(self, tracker: DialogueStateTracker) -> None:
+        """Store a snapshot of the tracker next to its events."""
+        from sqlalchemy import func
+
+        latest_event_id = (
+            self.session.query(func.max(self.SQLEvent.id))
+            .filter_by(sender_id=tracker.sender_id)
+            .scalar()
+        )
+        self.session.merge(
+            self.SQLTrackerSnapshot(
+                sender_id=tracker.sender_id,
+                event_id=latest_event_id,
+                data=json.dumps(tracker.as_snapshot()),
+            )
+        )
+
+    @staticmethod
+    def _event_row(sender_id: Text, event: Event) -> Dict[Text, Any]:
+        """Convert an event to the column values of an `events` table row."""
+
+        data = event.as_dict()
+
+        return {
+            "sender_id": sender_id,
+            "type_name": event.type_name,
+            "timestamp": data.get("timestamp"),
+            "intent_name": data.get("parse_data", {}).get("intent", {}).get("name"),
+            "action_name": data.get("name"),
+            "data": json.dumps(data),
+        }
+
+    def stream_events(self, tracker: DialogueStateTracker) -> None:
+        self._publish_events(tracker.sender_id, self._additional_events(tracker))
+
     def number_of_existing_events(self, sender_id: Text) -> int:
         """Return number of stored events for a given sender id."""
 
@@ -574,7 +1299,14 @@ class SQLTrackerStore(TrackerStore):
         return query.filter_by(sender_id=sender_id).count() or 0
 
     def _additional_events(self, tracker: DialogueStateTracker) -> Iterator:
-        """Return events from the tracker which aren't currently stored."""
-        n_events = self.number_of_existing_events(tracker.sender_id)
+        """Return events from the tracker which aren't currently stored.
+
+        Uses the high-water mark of the last `retrieve` / `save` for this sender
+        and only falls back to counting the stored events if there is none. The
+        counted events are the ones `retrieve` loads into the tracker."""
+
+        n_events = self._persisted_events.get(tracker.sender_id)
+        if n_events is None:
+            n_events = self._event_query(tracker.sender_id).count()
         # 返回在tracker中新加的(没来得及写入数据库的)events
         return itertools.islice(tracker.events, n_events, len(tracker.events))
@@ -2,7 +2,7 @@ import copy
 import logging
 from collections import deque
 from enum import Enum
-from typing import Dict, Text, Any, Optional, Iterator, Generator, Type, List
+from typing import Dict, Text, Any, Optional, Iterable, Iterator, Generator, Type, List
 
 from rasa.core import events  # pytype: disable=pyi-error
 from rasa.core.actions.action import ACTION_LISTEN_NAME  # pytype: disable=pyi-error
@@ -64,6 +64,10 @@ class DialogueStateTracker(object):
     The field max_event_history will only give you these last events,
     it can be set in the tracker_store"""
 
+    # keep the past states up to date while events are applied instead of
+    # replaying the whole history for every prediction
+    cache_past_states = True
+
     # 这个是rasa core的核心类之一，一个DST类的实例用来保存一个会话的所有信息
     @classmethod
     def from_dict(
@@ -94,6 +98,25 @@ class DialogueStateTracker(object):
             tracker.update(e)  # 逐条重放
         return tracker
 
+    @classmethod
+    def from_snapshot(
+            cls,
+            sender_id: Text,
+            snapshot: Dict[Text, Any],
+            evts: List[Event],
+            slots: Optional[List[Slot]] = None,
+            max_event_history: Optional[int] = None,
+    ) -> "DialogueStateTracker":
+        """Create a tracker from a snapshot and the events it was taken for.
+
+        The first ``snapshot["event_offset"]`` events of ``evts`` are the events
+        which are already reflected in the snapshot. Only the events after them
+        are replayed."""
+
+        tracker = cls(sender_id, slots, max_event_history)
+        tracker.restore_from_snapshot(snapshot, evts)
+        return tracker
+
     def __init__(self, sender_id, slots, max_event_history=None):
         """Initialize the tracker.
 
@@ -133,6 +156,11 @@ class DialogueStateTracker(object):
         # Stores the most recent message sent by the user
         self.latest_message = None  # 上一条用户说的话
         self.latest_bot_utterance = None  # 上一条机器人说的话
+        # (domain, number of events, past states) of the last featurisation
+        self._cached_states = None
+        # the past states of trackers with forms can't be updated incrementally,
+        # as `generate_all_prior_trackers` overrides their latest messages
+        self._has_form_events = False
         self._reset()  # 初始化
         self.active_form = {}  # 当前操作的表单，这一句其实可以删掉，因为self._reset()就已经把active_form设成空字典了
 
@@ -170,11 +198,120 @@ class DialogueStateTracker(object):
             "latest_action_name": self.latest_action_name,
         }
 
+    def as_snapshot(self) -> Dict[Text, Any]:
+        """Return a compact, serialisable representation of the tracker state.
+
+        Together with the events of the tracker the snapshot can be used to
+        recreate the tracker without replaying all of its events."""
+
+        return {
+            "slots": self.current_slot_values(),
+            "latest_message": self.latest_message.as_dict(),
+            "latest_bot_utterance": self.latest_bot_utterance.as_dict(),
+            "latest_action_name": self.latest_action_name,
+            "followup_action": self.followup_action,
+            "paused": self._paused,
+            "active_form": copy.deepcopy(self.active_form),
+            "event_offset": len(self.events),
+        }
+
+    def restore_from_snapshot(
+            self, snapshot: Dict[Text, Any], evts: List[Event]
+    ) -> None:
+        """Restore the tracker state from a snapshot of it.
+
+        ``evts`` are the events covered by the snapshot followed by the events
+        which were logged after the snapshot was taken. If the snapshot does not
+        match the events, all events are replayed instead."""
+
+        offset = snapshot.get("event_offset", 0)
+        self._reset()
+        self._remember_form_events(evts)
+
+        if offset > len(evts):
+            logger.debug(
+                "Snapshot of tracker '{}' does not match its events. "
+                "Replaying all events instead.".format(self.sender_id)
+            )
+            self.events.extend(evts)
+            self.replay_events()
+            return
+
+        self.events.extend(evts[:offset])
+
+        for key, value in snapshot.get("slots", {}).items():
+            if key in self.slots:
+                self.slots[key].value = value
+        self.latest_message = Event.from_parameters(
+            snapshot["latest_message"], default=UserUttered
+        )
+        self.latest_bot_utterance = Event.from_parameters(
+            snapshot["latest_bot_utterance"], default=BotUttered
+        )
+        self.latest_action_name = snapshot.get("latest_action_name")
+        self.followup_action = snapshot.get("followup_action")
+        self._paused = snapshot.get("paused", False)
+        self.active_form = copy.deepcopy(snapshot.get("active_form", {}))
+
+        for event in evts[offset:]:
+            self.update(event)
+
     def past_states(self, domain) -> deque:
-        """Generate the past states of this tracker based on the history."""
+        """Generate the past states of this tracker based on the history.
+
+        The states are cached and updated incrementally by `update`, so that
+        consecutive predictions and all policies of an ensemble share them.
+        The cache is dropped if events are reverted and not used for trackers
+        which contain any `Form` event."""
+
+        if self._cached_states is not None:
+            cached_domain, number_of_events, states = self._cached_states
+            if cached_domain is domain and number_of_events == len(self.events):
+                return states
 
         generated_states = domain.states_for_tracker_history(self)
-        return deque((frozenset(s.items()) for s in generated_states))
+        states = deque((frozenset(s.items()) for s in generated_states))
+
+        if self._can_cache_states():
+            self._cached_states = (domain, len(self.events), states)
+        else:
+            self._cached_states = None
+        return states
+
+    def _can_cache_states(self) -> bool:
+        return (
+            self.cache_past_states
+            and self._max_event_history is None
+            and not self.active_form
+            and not self._has_form_events
+        )
+
+    def _remember_form_events(self, evts: Iterable[Event]) -> None:
+        if not self._has_form_events:
+            self._has_form_events = any(isinstance(e, Form) for e in evts)
+
+    def _update_cached_states(self, event: Event) -> None:
+        """Apply the state change caused by `event` to the cached states."""
+
+        if self._cached_states is None:
+            return
+
+        domain, number_of_events, states = self._cached_states
+        if (
+            number_of_events != len(self.events) - 1
+            or not self._can_cache_states()
+            or isinstance(
+                event, (ActionReverted, UserUtteranceReverted, Restarted, Form)
+            )
+        ):
+            self._cached_states = None
+            return
+
+        if not isinstance(event, ActionExecuted):
+            # the event changed the current state instead of starting a new one
+            states.pop()
+        states.append(frozenset(domain.get_active_states(self).items()))
+        self._cached_states = (domain, len(self.events), states)
 
     def change_form_to(self, form_name: Text) -> None:
         """Activate or deactivate a form"""
@@ -396,13 +533,22 @@ class DialogueStateTracker(object):
                 "Have you deserialized it?".format(dialogue)
             )
 
+        snapshot = getattr(dialogue, "snapshot", None)
+        if snapshot is not None:
+            # only replay the events which happened after the snapshot
+            self.restore_from_snapshot(snapshot, dialogue.events)
+            return
+
         self._reset()
         self.events.extend(dialogue.events)  # 添加dialogue中的事件
+        self._remember_form_events(dialogue.events)
         self.replay_events()
 
     def copy(self):
         """Creates a duplicate of this tracker"""
-        return self.travel_back_in_time(float("inf"))
+        tracker = self.init_copy()
+        tracker.restore_from_snapshot(self.as_snapshot(), list(self.events))
+        return tracker
 
     def travel_back_in_time(self, target_time: float) -> "DialogueStateTracker":
         """Creates a new tracker with a state at a specific timestamp.
@@ -427,7 +573,7 @@ class DialogueStateTracker(object):
         This can be serialised and later used to recover the state
         of this tracker exactly."""
 
-        return Dialogue(self.sender_id, list(self.events))
+        return Dialogue(self.sender_id, list(self.events), self.as_snapshot())
 
     def update(self, event: Event, domain: Optional[Domain] = None) -> None:
         """Modify the state of the tracker according to an ``Event``. """
@@ -436,6 +582,9 @@ class DialogueStateTracker(object):
 
         self.events.append(event)
         event.apply_to(self)
+        if isinstance(event, Form):
+            self._has_form_events = True
+        self._update_cached_states(event)
 
         if domain and isinstance(event, UserUttered):
             # store all entities as slots
@@ -521,6 +670,7 @@ class DialogueStateTracker(object):
         self.latest_bot_utterance = BotUttered.empty()
         self.followup_action = ACTION_LISTEN_NAME
         self.active_form = {}
+        self._cached_states = None
 
     def _reset_slots(self) -> None:
         """Set all the slots to their initial value."""
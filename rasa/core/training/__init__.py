@@ -65,6 +65,7 @@ async def load_data(
             tracker_limit,
             use_story_concatenation,
             debug_plots,
+            use_cache=True,
         )
         return g.generate()
     else:
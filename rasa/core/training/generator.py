@@ -2,11 +2,22 @@
 from collections import defaultdict, namedtuple, deque
 
 import copy
+import json
 import logging
+import os
+import pickle
 import random
+import re
+import tempfile
 from tqdm import tqdm
 from typing import Optional, List, Text, Set, Dict, Tuple
 
+import rasa
+from rasa.constants import (
+    DEFAULT_TRAINING_DATA_CACHE_PATH,
+    DEFAULT_TRAINING_DATA_CACHE_SIZE,
+    ENV_TRAINING_DATA_CACHE_PATH,
+)
 from rasa.core import utils
 from rasa.core.domain import Domain
 from rasa.core.events import (
@@ -43,6 +54,9 @@ ExtractorConfig = namedtuple(
 class TrackerWithCachedStates(DialogueStateTracker):
     """A tracker wrapper that caches the state creation of the tracker."""
 
+    # the states are cached by the wrapper itself
+    cache_past_states = False
+
     def __init__(
         self, sender_id, slots, max_event_history=None, domain=None, is_augmented=False
     ):
@@ -155,14 +169,21 @@ class TrainingDataGenerator(object):
         tracker_limit: Optional[int] = None,
         use_story_concatenation: bool = True,
         debug_plots: bool = False,
+        use_cache: bool = False,
     ):
         """Given a set of story parts, generates all stories that are possible.
 
         The different story parts can end and start with checkpoints
         and this generator will match start and end checkpoints to
         connect complete stories. Afterwards, duplicate stories will be
-        removed and the data is augmented (if augmentation is enabled)."""
+        removed and the data is augmented (if augmentation is enabled).
 
+        If `use_cache` is `True`, the generated trackers are cached on disk,
+        keyed by the stories, the domain and the generator parameters."""
+
+        # the checkpoints generated when removing cycles get random names, hence
+        # the cache key is based on the original stories
+        self._original_story_graph = story_graph
         self.story_graph = story_graph.with_cycles_removed()
         if debug_plots:
             self.story_graph.visualize("story_blocks_connections.html")
@@ -183,6 +204,7 @@ class TrainingDataGenerator(object):
         )
         # hashed featurization of all finished trackers
         self.hashed_featurizations = set()
+        self.use_cache = use_cache
 
     @staticmethod
     def _phase_name(everything_reachable_is_reached, phase):
@@ -191,7 +213,129 @@ class TrainingDataGenerator(object):
         else:
             return "data generation round {}".format(phase)
 
+    @staticmethod
+    def _stories_hash(story_graph: StoryGraph) -> Text:
+        """Hash the stories independently of the random names of the checkpoints
+        which were generated for OR statements."""
+
+        generated_names = {}  # type: Dict[Text, Text]
+
+        def rename(match) -> Text:
+            name = match.group(0)
+            if name not in generated_names:
+                generated_names[name] = "{}{}".format(
+                    GENERATED_CHECKPOINT_PREFIX, len(generated_names)
+                )
+            return generated_names[name]
+
+        story_string = re.sub(
+            re.escape(GENERATED_CHECKPOINT_PREFIX) + r"\w+",
+            rename,
+            story_graph.as_story_string(),
+        )
+        return utils.get_text_hash(story_string)
+
+    def _cache_key(self) -> Text:
+        """Returns the key of the generated trackers within the cache."""
+
+        parameters = {
+            "version": rasa.__version__,
+            "stories": self._stories_hash(self._original_story_graph),
+            "domain": hash(self.domain),
+            "config": [
+                self.config.remove_duplicates,
+                self.config.unique_last_num_states,
+                self.config.augmentation_factor,
+                self.config.tracker_limit,
+                self.config.use_story_concatenation,
+            ],
+        }
+        return utils.get_text_hash(json.dumps(parameters, sort_keys=True))
+
+    def _cache_file(self) -> Text:
+        cache_directory = os.environ.get(
+            ENV_TRAINING_DATA_CACHE_PATH, DEFAULT_TRAINING_DATA_CACHE_PATH
+        )
+        return os.path.join(cache_directory, self._cache_key() + ".pkl")
+
+    def _load_cached_trackers(
+        self, cache_file: Text
+    ) -> Optional[List[TrackerWithCachedStates]]:
+        if not os.path.isfile(cache_file):
+            return None
+
+        try:
+            with open(cache_file, "rb") as f:
+                trackers = pickle.load(f)
+        except Exception as e:
+            logger.warning(
+                "Failed to load the cached training data from '{}'. Generating "
+                "the training data instead. Error: {}".format(cache_file, e)
+            )
+            return None
+
+        for tracker in trackers:
+            tracker.domain = self.domain
+
+        try:
+            # the modification time orders the cached training data for the
+            # eviction
+            os.utime(cache_file, None)
+        except OSError:
+            pass
+        logger.debug(
+            "Loaded {} cached training trackers from '{}'.".format(
+                len(trackers), cache_file
+            )
+        )
+        return trackers
+
+    @staticmethod
+    def _cache_trackers(
+        cache_file: Text, trackers: List[TrackerWithCachedStates]
+    ) -> None:
+        cache_directory = os.path.dirname(cache_file)
+        try:
+            os.makedirs(cache_directory, exist_ok=True)
+            # the file is renamed once it was written completely, so that
+            # other processes never load partially written training data
+            fd, temporary_file = tempfile.mkstemp(dir=cache_directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(trackers, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary_file, cache_file)
+            except Exception:
+                os.remove(temporary_file)
+                raise
+
+            cached_files = sorted(
+                (entry.stat().st_mtime, entry.path)
+                for entry in os.scandir(cache_directory)
+                if entry.name.endswith(".pkl")
+            )
+            for _, path in cached_files[:-DEFAULT_TRAINING_DATA_CACHE_SIZE]:
+                os.remove(path)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(
+                "Failed to cache the training data in '{}'. Error: {}".format(
+                    cache_directory, e
+                )
+            )
+
     def generate(self) -> List[TrackerWithCachedStates]:
+        """Generates the training trackers, or loads them from the cache."""
+
+        if not self.use_cache:
+            return self._generate()
+
+        cache_file = self._cache_file()
+        trackers = self._load_cached_trackers(cache_file)
+        if trackers is None:
+            trackers = self._generate()
+            self._cache_trackers(cache_file, trackers)
+        return trackers
+
+    def _generate(self) -> List[TrackerWithCachedStates]:
         if self.config.remove_duplicates and self.config.unique_last_num_states:
             logger.debug(
                 "Generated trackers will be deduplicated "
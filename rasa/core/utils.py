@@ -397,9 +397,10 @@ class AvailableEndpoints(object):
         tracker_store = read_endpoint_config(
             endpoint_file, endpoint_type="tracker_store"
         )
+        lock_store = read_endpoint_config(endpoint_file, endpoint_type="lock_store")
         event_broker = read_endpoint_config(endpoint_file, endpoint_type="event_broker")
 
-        return cls(nlg, nlu, action, model, tracker_store, event_broker)
+        return cls(nlg, nlu, action, model, tracker_store, event_broker, lock_store)
 
     def __init__(
         self,
@@ -409,6 +410,7 @@ class AvailableEndpoints(object):
         model=None,
         tracker_store=None,
         event_broker=None,
+        lock_store=None,
     ):
         self.model = model
         self.action = action
@@ -416,6 +418,7 @@ class AvailableEndpoints(object):
         self.nlg = nlg
         self.tracker_store = tracker_store
         self.event_broker = event_broker
+        self.lock_store = lock_store
 
 
 # noinspection PyProtectedMember
@@ -1,10 +1,15 @@
 import glob
+import hashlib
+import json
 import logging
 import os
 import shutil
 import tempfile
+import time
 import typing
-from typing import Text, Tuple, Union, Optional, List, Dict
+import uuid
+from types import TracebackType
+from typing import Text, Tuple, Union, Optional, List, Dict, Type
 
 import rasa.utils.io
 from rasa.cli.utils import print_success, create_output_path
@@ -13,11 +18,17 @@ from rasa.constants import (
     CONFIG_MANDATORY_KEYS_CORE,
     CONFIG_MANDATORY_KEYS_NLU,
     CONFIG_MANDATORY_KEYS,
+    DEFAULT_MODEL_CACHE_PATH,
+    DEFAULT_MODEL_CACHE_SIZE_MB,
+    ENV_MODEL_CACHE_PATH,
+    ENV_MODEL_CACHE_SIZE_MB,
+    ENV_MODEL_CACHE_READ_ONLY,
 )
 
 from rasa.core.utils import get_dict_hash
 from rasa.exceptions import ModelNotFound
 from rasa.utils.common import TempDirectoryPath
+from rasa.utils.metrics import registry
 
 if typing.TYPE_CHECKING:
     from rasa.importers.importer import TrainingDataImporter
@@ -38,6 +49,12 @@ FINGERPRINT_STORIES_KEY = "stories"
 FINGERPRINT_NLU_DATA_KEY = "messages"
 FINGERPRINT_TRAINED_AT_KEY = "trained_at"
 
+# prefixes of directories within the model cache which are not (yet) a model
+MODEL_CACHE_UNPACKING_PREFIX = ".unpacking-"
+MODEL_CACHE_EVICTED_PREFIX = ".evicted-"
+# seconds after which an abandoned unpacking directory is removed
+MODEL_CACHE_STALE_UNPACKING = 60 * 60
+
 
 def get_model(model_path: Text = DEFAULT_MODELS_PATH) -> TempDirectoryPath:
     """Gets a model and unpacks it. Raises a `ModelNotFound` exception if
@@ -67,7 +84,7 @@ def get_model(model_path: Text = DEFAULT_MODELS_PATH) -> TempDirectoryPath:
             "Path '{}' does not point to a Rasa model file.".format(model_path)
         )
 
-    return unpack_model(model_path)
+    return unpack_model(model_path, use_cache=True)
 
 
 def get_latest_model(model_path: Text = DEFAULT_MODELS_PATH) -> Optional[Text]:
@@ -92,7 +109,9 @@ def get_latest_model(model_path: Text = DEFAULT_MODELS_PATH) -> Optional[Text]:
 
 
 def unpack_model(
-    model_file: Text, working_directory: Optional[Text] = None
+    model_file: Text,
+    working_directory: Optional[Text] = None,
+    use_cache: bool = False,
 ) -> TempDirectoryPath:
     """Unpacks a zipped Rasa model.
 
@@ -100,6 +119,9 @@ def unpack_model(
         model_file: Path to zipped model.
         working_directory: Location where the model should be unpacked to.
                            If `None` a temporary directory will be created.
+        use_cache: Whether the model should be taken from the model cache, see
+                   `ModelCache`. Only used if no `working_directory` is given.
+                   Models from the cache must not be modified.
 
     Returns:
         Path to unpacked Rasa model.
@@ -107,6 +129,11 @@ def unpack_model(
     """
     import tarfile
 
+    if working_directory is None and use_cache:
+        cached_model = _unpack_model_into_cache(model_file)
+        if cached_model is not None:
+            return cached_model
+
     if working_directory is None:
         working_directory = tempfile.mkdtemp()
 
@@ -123,6 +150,225 @@ def unpack_model(
     return TempDirectoryPath(working_directory)
 
 
+class CachedModelPath(TempDirectoryPath):
+    """Represents a path to a model within the model cache. In contrast to a
+    `TempDirectoryPath`, the model is kept when used as a context manager.
+
+    """
+
+    def __exit__(
+        self,
+        _exc: Optional[Type[BaseException]],
+        _value: Optional[Exception],
+        _tb: Optional[TracebackType],
+    ) -> bool:
+        return False
+
+
+class ModelCache(object):
+    """Cache of unpacked models, keyed by the fingerprint within the archive.
+
+    A model is unpacked into a temporary directory within the cache, which is
+    renamed to its final name once all files were extracted. Hence, processes
+    which unpack the same model at the same time never see a partially
+    unpacked model. If the cache grows larger than `max_size` bytes, the least
+    recently used models are removed.
+
+    A `read_only` cache, e.g. a cache populated in advance which is shared by
+    several servers, is never modified. Models which are missing from it are
+    unpacked into temporary directories instead.
+
+    """
+
+    def __init__(
+        self, directory: Text, max_size: int, read_only: bool = False
+    ) -> None:
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        self.read_only = read_only
+
+    @classmethod
+    def from_environment(cls) -> Optional["ModelCache"]:
+        """Creates the cache configured by the environment variables
+        `RASA_MODEL_CACHE_PATH`, `RASA_MODEL_CACHE_SIZE_MB` and
+        `RASA_MODEL_CACHE_READ_ONLY`. A size of 0 disables the cache.
+
+        """
+        max_size_mb = float(
+            os.environ.get(ENV_MODEL_CACHE_SIZE_MB, DEFAULT_MODEL_CACHE_SIZE_MB)
+        )
+        if max_size_mb <= 0:
+            return None
+
+        directory = os.environ.get(ENV_MODEL_CACHE_PATH, DEFAULT_MODEL_CACHE_PATH)
+        read_only = os.environ.get(ENV_MODEL_CACHE_READ_ONLY, "false").lower()
+
+        return cls(directory, int(max_size_mb * 1024 * 1024), read_only == "true")
+
+    def contains(self, path: Optional[Text]) -> bool:
+        """Checks whether `path` points to a model within this cache."""
+
+        if not path:
+            return False
+        return os.path.dirname(os.path.abspath(path)) == self.directory
+
+    def get(self, model_file: Text) -> Optional[Text]:
+        """Returns the unpacked model of `model_file`.
+
+        The model is unpacked if it is not cached yet. Returns `None` if the
+        model is missing from a read-only cache.
+
+        """
+        path = os.path.join(self.directory, model_cache_key(model_file))
+
+        if os.path.isdir(path):
+            registry.increment("model_cache.hits")
+            if not self.read_only:
+                # the modification time orders the models for the eviction
+                os.utime(path, None)
+            logger.debug("Using cached model '{}'.".format(path))
+            return path
+
+        registry.increment("model_cache.misses")
+        if self.read_only:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        unpacking_directory = tempfile.mkdtemp(
+            prefix=MODEL_CACHE_UNPACKING_PREFIX, dir=self.directory
+        )
+        try:
+            unpack_model(model_file, unpacking_directory)
+        except Exception:
+            shutil.rmtree(unpacking_directory, ignore_errors=True)
+            raise
+
+        try:
+            os.rename(unpacking_directory, path)
+        except OSError:
+            # another process cached the same model in the meantime
+            shutil.rmtree(unpacking_directory, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+
+        logger.debug("Cached model '{}' in '{}'.".format(model_file, path))
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Text] = None) -> None:
+        """Removes the least recently used models until the cache is not
+        larger than `max_size` anymore. The model `keep` is never removed.
+
+        """
+        if self.read_only or not os.path.isdir(self.directory):
+            return
+
+        models = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            if entry.name.startswith(MODEL_CACHE_UNPACKING_PREFIX):
+                if time.time() - entry.stat().st_mtime > MODEL_CACHE_STALE_UNPACKING:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            elif not entry.name.startswith("."):
+                models.append(
+                    (entry.stat().st_mtime, _directory_size(entry.path), entry.path)
+                )
+
+        cache_size = sum(size for _, size, _ in models)
+        for _, size, path in sorted(models):
+            if cache_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+
+            # the model is renamed first, so that no process picks up a
+            # partially removed model
+            evicted = os.path.join(
+                self.directory, MODEL_CACHE_EVICTED_PREFIX + uuid.uuid4().hex
+            )
+            try:
+                os.rename(path, evicted)
+            except OSError:
+                # another process evicted the model already
+                continue
+            shutil.rmtree(evicted, ignore_errors=True)
+
+            cache_size -= size
+            registry.increment("model_cache.evictions")
+            logger.debug("Evicted model '{}' from the model cache.".format(path))
+
+
+def model_cache_key(model_file: Text) -> Text:
+    """Returns the key of a zipped model within the model cache.
+
+    The key is the hash of the fingerprint stored within the archive, or the
+    hash of the archive itself if it does not contain a fingerprint.
+
+    """
+    import tarfile
+
+    with tarfile.open(model_file) as tar:
+        for member in tar:
+            if member.name.lstrip("./") == FINGERPRINT_FILE_PATH:
+                fingerprint = json.loads(
+                    tar.extractfile(member).read().decode("utf-8")
+                )
+                return get_dict_hash(fingerprint)
+
+    file_hash = hashlib.sha256()
+    with open(model_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _directory_size(path: Text) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+def _unpack_model_into_cache(model_file: Text) -> Optional[CachedModelPath]:
+    cache = ModelCache.from_environment()
+    if cache is None:
+        return None
+
+    try:
+        cached_model = cache.get(model_file)
+    except OSError as e:
+        logger.warning(
+            "Failed to use the model cache in '{}'. Unpacking the model into a "
+            "temporary directory instead. Error: {}".format(cache.directory, e)
+        )
+        return None
+
+    return CachedModelPath(cached_model) if cached_model else None
+
+
+def is_cached_model(model_path: Optional[Text]) -> bool:
+    """Checks whether a path points to a model within the model cache.
+
+    Args:
+        model_path: Path to check.
+
+    Returns:
+        `True` if the model is managed by the model cache and must not be
+        removed or modified.
+
+    """
+    if isinstance(model_path, CachedModelPath):
+        return True
+
+    cache = ModelCache.from_environment()
+    return cache is not None and cache.contains(model_path)
+
+
 def get_model_subdirectories(
     unpacked_model_path: Text
 ) -> Tuple[Optional[Text], Optional[Text]]:
@@ -156,6 +402,25 @@ def get_model_subdirectories(
     return core_path, nlu_path
 
 
+def is_unpacked_model(model_path: Optional[Text]) -> bool:
+    """Checks whether a path points to an already unpacked Rasa model.
+
+    Args:
+        model_path: Path to check.
+
+    Returns:
+        `True` if the path is a directory containing a Core or NLU model.
+
+    """
+    if not model_path or not os.path.isdir(model_path):
+        return False
+
+    return any(
+        os.path.isdir(os.path.join(model_path, sub_directory))
+        for sub_directory in ["core", "nlu"]
+    )
+
+
 def create_package_rasa(
     training_directory: Text,
     output_filename: Text,
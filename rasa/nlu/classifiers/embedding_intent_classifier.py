@@ -573,6 +573,26 @@ class EmbeddingIntentClassifier(Component):
         )
         message_sim = message_sim.flatten()  # sim is a matrix
 
+        return self._rank_message_sim(message_sim)
+
+    def _calculate_message_sims(
+        self, X: np.ndarray
+    ) -> List[Tuple[np.ndarray, List[float]]]:
+        """Calculate the similarities of several messages with one tf call"""
+
+        all_Y = self._create_all_Y(X.shape[0])
+        message_sims = self.session.run(
+            self.sim_op, feed_dict={self.a_in: X, self.b_in: all_Y}
+        )
+
+        # one row of similarities per message
+        return [self._rank_message_sim(message_sim) for message_sim in message_sims]
+
+    def _rank_message_sim(
+        self, message_sim: np.ndarray
+    ) -> Tuple[np.ndarray, List[float]]:
+        """Sort the similarities of a message to all intents"""
+
         intent_ids = message_sim.argsort()[::-1]
         message_sim[::-1].sort()
 
@@ -587,18 +607,44 @@ class EmbeddingIntentClassifier(Component):
         # transform sim to python list for JSON serializing
         return intent_ids, message_sim.tolist()
 
-    def process(self, message: "Message", **kwargs: Any) -> None:
-        """Return the most likely intent and its similarity to the input."""
-
+    def _set_intent(
+        self,
+        message: "Message",
+        X: np.ndarray,
+        intent_ids: np.ndarray,
+        message_sim: List[float],
+    ) -> None:
         intent = {"name": None, "confidence": 0.0}
         intent_ranking = []
 
+        # if X contains all zeros do not predict some label
+        if X.any() and intent_ids.size > 0:
+            intent = {
+                "name": self.inv_intent_dict[intent_ids[0]],
+                "confidence": message_sim[0],
+            }
+
+            ranking = list(zip(list(intent_ids), message_sim))
+            ranking = ranking[:INTENT_RANKING_LENGTH]
+            intent_ranking = [
+                {"name": self.inv_intent_dict[intent_idx], "confidence": score}
+                for intent_idx, score in ranking
+            ]
+
+        message.set("intent", intent, add_to_output=True)
+        message.set("intent_ranking", intent_ranking, add_to_output=True)
+
+    def process(self, message: "Message", **kwargs: Any) -> None:
+        """Return the most likely intent and its similarity to the input."""
+
         if self.session is None:
             logger.error(
                 "There is no trained tf.session: "
                 "component is either not trained or "
                 "didn't receive enough training data"
             )
+            message.set("intent", {"name": None, "confidence": 0.0}, add_to_output=True)
+            message.set("intent_ranking", [], add_to_output=True)
 
         else:
             # get features (bag of words) for a message
@@ -613,22 +659,23 @@ class EmbeddingIntentClassifier(Component):
             # load tf graph and session
             intent_ids, message_sim = self._calculate_message_sim(X, all_Y)
 
-            # if X contains all zeros do not predict some label
-            if X.any() and intent_ids.size > 0:
-                intent = {
-                    "name": self.inv_intent_dict[intent_ids[0]],
-                    "confidence": message_sim[0],
-                }
+            self._set_intent(message, X, intent_ids, message_sim)
 
-                ranking = list(zip(list(intent_ids), message_sim))
-                ranking = ranking[:INTENT_RANKING_LENGTH]
-                intent_ranking = [
-                    {"name": self.inv_intent_dict[intent_idx], "confidence": score}
-                    for intent_idx, score in ranking
-                ]
+    def process_batch(self, messages: List["Message"], **kwargs: Any) -> None:
+        """Classify the intents of all messages with a single tf call."""
 
-        message.set("intent", intent, add_to_output=True)
-        message.set("intent_ranking", intent_ranking, add_to_output=True)
+        if self.session is None or not messages:
+            for message in messages:
+                self.process(message, **kwargs)
+            return
+
+        # noinspection PyPep8Naming
+        X = np.stack([message.get("text_features") for message in messages])
+
+        for message, x, (intent_ids, message_sim) in zip(
+            messages, X, self._calculate_message_sims(X)
+        ):
+            self._set_intent(message, x, intent_ids, message_sim)
 
     def persist(self, file_name: Text, model_dir: Text) -> Dict[Text, Any]:
         """Persist this model into the passed directory.
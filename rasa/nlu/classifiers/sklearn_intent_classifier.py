@@ -141,28 +141,48 @@ class SklearnIntentClassifier(Component):
             # receive enough training data
             intent = None
             intent_ranking = []
+            message.set("intent", intent, add_to_output=True)
+            message.set("intent_ranking", intent_ranking, add_to_output=True)
         else:
             X = message.get("text_features").reshape(1, -1)
             intent_ids, probabilities = self.predict(X)
-            intents = self.transform_labels_num2str(np.ravel(intent_ids))
-            # `predict` returns a matrix as it is supposed
-            # to work for multiple examples as well, hence we need to flatten
-            probabilities = probabilities.flatten()
-
-            if intents.size > 0 and probabilities.size > 0:
-                ranking = list(zip(list(intents), list(probabilities)))[
-                    :INTENT_RANKING_LENGTH
-                ]
+            self._set_intent(message, intent_ids[0], probabilities[0])
 
-                intent = {"name": intents[0], "confidence": probabilities[0]}
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Classify the intents of all messages with a single prediction."""
 
-                intent_ranking = [
-                    {"name": intent_name, "confidence": score}
-                    for intent_name, score in ranking
-                ]
-            else:
-                intent = {"name": None, "confidence": 0.0}
-                intent_ranking = []
+        if not self.clf or not messages:
+            for message in messages:
+                self.process(message, **kwargs)
+            return
+
+        X = np.stack([message.get("text_features") for message in messages])
+        intent_ids, probabilities = self.predict(X)
+        for message, ids, probs in zip(messages, intent_ids, probabilities):
+            self._set_intent(message, ids, probs)
+
+    def _set_intent(
+        self, message: Message, intent_ids: np.ndarray, probabilities: np.ndarray
+    ) -> None:
+        intents = self.transform_labels_num2str(np.ravel(intent_ids))
+        # `predict` returns a matrix as it is supposed
+        # to work for multiple examples as well, hence we need to flatten
+        probabilities = probabilities.flatten()
+
+        if intents.size > 0 and probabilities.size > 0:
+            ranking = list(zip(list(intents), list(probabilities)))[
+                :INTENT_RANKING_LENGTH
+            ]
+
+            intent = {"name": intents[0], "confidence": probabilities[0]}
+
+            intent_ranking = [
+                {"name": intent_name, "confidence": score}
+                for intent_name, score in ranking
+            ]
+        else:
+            intent = {"name": None, "confidence": 0.0}
+            intent_ranking = []
 
         message.set("intent", intent, add_to_output=True)
         message.set("intent_ranking", intent_ranking, add_to_output=True)
@@ -190,7 +210,10 @@ class SklearnIntentClassifier(Component):
         # sort the probabilities retrieving the indices of
         # the elements in sorted order
         sorted_indices = np.fliplr(np.argsort(pred_result, axis=1))
-        return sorted_indices, pred_result[:, sorted_indices]
+        # select the sorted probabilities row by row, so that every example
+        # only gets its own probabilities
+        rows = np.arange(pred_result.shape[0])[:, np.newaxis]
+        return sorted_indices, pred_result[rows, sorted_indices]
 
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this model into the passed directory."""
@@ -289,6 +289,16 @@ class Component(object, metaclass=ComponentMetaclass):
         of components previous to this one."""
         pass
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Process a batch of incoming messages.
+
+        Components which can vectorise their computation should overwrite
+        this method. By default, every message is processed on its own
+        using :meth:`rasa.nlu.components.Component.process`."""
+
+        for message in messages:
+            self.process(message, **kwargs)
+
     def persist(self, file_name: Text, model_dir: Text) -> Optional[Dict[Text, Any]]:
         """Persist this component to disk for future loading."""
 
@@ -171,6 +171,18 @@ class CRFEntityExtractor(EntityExtractor):
             "entities", message.get("entities", []) + extracted, add_to_output=True
         )
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+        """Tag the entities of all messages with a single call of the tagger."""
+
+        for message in messages:
+            self._check_spacy_doc(message)
+
+        for message, entities in zip(messages, self.extract_entities_batch(messages)):
+            extracted = self.add_extractor_name(entities)
+            message.set(
+                "entities", message.get("entities", []) + extracted, add_to_output=True
+            )
+
     @staticmethod
     def _convert_example(example: Message) -> List[Tuple[int, int, Text]]:
         def convert_entity(entity):
@@ -189,6 +201,24 @@ class CRFEntityExtractor(EntityExtractor):
         else:
             return []
 
+    def extract_entities_batch(
+        self, messages: List[Message]
+    ) -> List[List[Dict[Text, Any]]]:
+        """Take several sentences and return their entities in json format"""
+
+        if self.ent_tagger is None:
+            return [[] for _ in messages]
+
+        features = [
+            self._sentence_to_features(self._from_text_to_crf(message))
+            for message in messages
+        ]
+        entities = self.ent_tagger.predict_marginals(features)
+        return [
+            self._from_crf_to_json(message, ents)
+            for message, ents in zip(messages, entities)
+        ]
+
     def most_likely_entity(self, idx, entities):
         if len(entities) > idx:
             entity_probs = entities[idx]
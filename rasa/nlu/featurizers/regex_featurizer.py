@@ -4,7 +4,7 @@ import numpy as np
 import os
 import re
 import typing
-from typing import Any, Dict, Optional, Text
+from typing import Any, Dict, List, Optional, Pattern, Text, Tuple
 
 from rasa.nlu import utils
 from rasa.nlu.config import RasaNLUModelConfig
@@ -48,9 +48,22 @@ class RegexFeaturizer(Featurizer):
         updated = self._text_features_with_regex(message)
         message.set("text_features", updated)
 
-    def _text_features_with_regex(self, message):
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+
+        # compile the patterns only once for the whole batch
+        patterns = self._compiled_patterns()
+        for message in messages:
+            updated = self._text_features_with_regex(message, patterns)
+            message.set("text_features", updated)
+
+    def _compiled_patterns(self) -> List[Tuple[Text, Pattern]]:
+        return [
+            (exp["name"], re.compile(exp["pattern"])) for exp in self.known_patterns
+        ]
+
+    def _text_features_with_regex(self, message, patterns=None):
         if self.known_patterns:
-            extras = self.features_for_patterns(message)
+            extras = self.features_for_patterns(message, patterns)
             return self._combine_with_existing_text_features(message, extras)
         else:
             return message.get("text_features")
@@ -63,26 +76,32 @@ class RegexFeaturizer(Featurizer):
             lookup_regex = {"name": table["name"], "pattern": regex_pattern}
             self.known_patterns.append(lookup_regex)
 
-    def features_for_patterns(self, message):
+    def features_for_patterns(self, message, compiled_patterns=None):
         """Checks which known patterns match the message.
 
         Given a sentence, returns a vector of {1,0} values indicating which
         regexes did match. Furthermore, if the
         message is tokenized, the function will mark all tokens with a dict
-        relating the name of the regex to whether it was matched."""
+        relating the name of the regex to whether it was matched.
+        Already compiled patterns can be passed as `compiled_patterns`."""
+
+        if compiled_patterns is None:
+            compiled_patterns = [
+                (exp["name"], exp["pattern"]) for exp in self.known_patterns
+            ]
 
         found_patterns = []
-        for exp in self.known_patterns:
-            matches = re.finditer(exp["pattern"], message.text)
+        for name, pattern in compiled_patterns:
+            matches = re.finditer(pattern, message.text)
             matches = list(matches)
             found_patterns.append(False)
             for token_index, t in enumerate(message.get("tokens", [])):
                 patterns = t.get("pattern", default={})
-                patterns[exp["name"]] = False
+                patterns[name] = False
 
                 for match in matches:
                     if t.offset < match.end() and t.end > match.start():
-                        patterns[exp["name"]] = True
+                        patterns[name] = True
                         found_patterns[-1] = True
 
                 t.set("pattern", patterns)
@@ -1,6 +1,6 @@
 import numpy as np
 import typing
-from typing import Any
+from typing import Any, List
 
 from rasa.nlu.config import RasaNLUModelConfig
 from rasa.nlu.featurizers import Featurizer
@@ -38,6 +38,13 @@ class SpacyFeaturizer(Featurizer):
 
         self._set_spacy_features(message)
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+
+        # the docs are created by `SpacyNLP.process_batch` with a single
+        # `nlp.pipe` call, which preprocesses the texts like `process`
+        for message in messages:
+            self._set_spacy_features(message)
+
     def _set_spacy_features(self, message):
         """Adds the spacy word vectors to the messages text features."""
 
@@ -378,3 +378,44 @@ class Interpreter(object):
         output = self.default_output_attributes()
         output.update(message.as_dict(only_output_properties=only_output_properties))
         return output
+
+    def parse_batch(
+        self,
+        texts: List[Text],
+        time: Optional[datetime.datetime] = None,
+        only_output_properties: bool = True,
+    ) -> List[Dict[Text, Any]]:
+        """Parse several input texts at once and return their pipeline results.
+
+        The messages are passed through the pipeline together, so that
+        components can process them as a batch (see
+        :meth:`rasa.nlu.components.Component.process_batch`). The results
+        are returned in the order of the texts."""
+
+        outputs = [None] * len(texts)  # type: List[Optional[Dict[Text, Any]]]
+        messages = []
+        indices = []
+
+        for i, text in enumerate(texts):
+            if text:
+                messages.append(
+                    Message(text, self.default_output_attributes(), time=time)
+                )
+                indices.append(i)
+            else:
+                # same as `parse`, empty strings are not passed to the components
+                outputs[i] = self.default_output_attributes()
+                outputs[i]["text"] = ""
+
+        if messages:
+            for component in self.pipeline:
+                component.process_batch(messages, **self.context)
+
+        for i, message in zip(indices, messages):
+            output = self.default_output_attributes()
+            output.update(
+                message.as_dict(only_output_properties=only_output_properties)
+            )
+            outputs[i] = output
+
+        return outputs
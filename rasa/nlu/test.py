@@ -29,6 +29,7 @@ from rasa.nlu.extractors.crf_entity_extractor import CRFEntityExtractor
 from rasa.nlu.model import Interpreter, Trainer, TrainingData
 from rasa.nlu.components import Component
 from rasa.nlu.tokenizers import Token
+from rasa.nlu.training_data import Message
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,9 @@ PRETRAINED_EXTRACTORS = {"DucklingHTTPExtractor", "SpacyEntityExtractor"}
 
 ENTITY_PROCESSORS = {"EntitySynonymMapper"}
 
+# number of test examples which are parsed together
+EVALUATION_BATCH_SIZE = 64
+
 CVEvaluationResult = namedtuple("Results", "train test")
 
 IntentEvaluationResult = namedtuple(
@@ -608,6 +612,23 @@ def align_all_entity_predictions(
     return aligned_predictions
 
 
+def _parse_in_batches(
+    interpreter: Interpreter, examples: List[Message]
+) -> Iterator[Dict[Text, Any]]:  # pragma: no cover
+    """Parses the examples batch-wise and yields the result for every example."""
+
+    with tqdm(total=len(examples)) as progress_bar:
+        for start in range(0, len(examples), EVALUATION_BATCH_SIZE):
+            batch = examples[start : start + EVALUATION_BATCH_SIZE]
+            results = interpreter.parse_batch(
+                [example.text for example in batch], only_output_properties=False
+            )
+            progress_bar.update(len(batch))
+
+            for result in results:
+                yield result
+
+
 def get_eval_data(
     interpreter: Interpreter, test_data: TrainingData
 ) -> Tuple[
@@ -629,9 +650,10 @@ def get_eval_data(
     )
     should_eval_entities = is_entity_extractor_present(interpreter)
 
-    for example in tqdm(test_data.training_examples):
-        result = interpreter.parse(example.text, only_output_properties=False)
-
+    for example, result in zip(
+        test_data.training_examples,
+        _parse_in_batches(interpreter, test_data.training_examples),
+    ):
         if should_eval_intents:
             intent_prediction = result.get("intent", {}) or {}
             intent_results.append(
@@ -101,16 +101,17 @@ class SpacyNLP(Component):
         else:
             return self.nlp(text.lower())
 
-    def docs_for_training_data(self, training_data: TrainingData) -> List[Any]:
+    def docs_for_texts(self, texts: List[Text]) -> List["Doc"]:
+        """Create the docs of several texts with a single `nlp.pipe` call."""
+
+        if not self.component_config.get("case_sensitive"):
+            texts = [text.lower() for text in texts]
 
-        texts = [
-            e.text if self.component_config.get("case_sensitive") else e.text.lower()
-            for e in training_data.intent_examples
-        ]
+        return [doc for doc in self.nlp.pipe(texts, batch_size=50)]
 
-        docs = [doc for doc in self.nlp.pipe(texts, batch_size=50)]
+    def docs_for_training_data(self, training_data: TrainingData) -> List[Any]:
 
-        return docs
+        return self.docs_for_texts([e.text for e in training_data.intent_examples])
 
     def train(
         self, training_data: TrainingData, config: RasaNLUModelConfig, **kwargs: Any
@@ -125,6 +126,12 @@ class SpacyNLP(Component):
 
         message.set("spacy_doc", self.doc_for_text(message.text))
 
+    def process_batch(self, messages: List[Message], **kwargs: Any) -> None:
+
+        docs = self.docs_for_texts([message.text for message in messages])
+        for message, doc in zip(messages, docs):
+            message.set("spacy_doc", doc)
+
     @classmethod
     def load(
         cls,
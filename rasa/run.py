@@ -58,6 +58,7 @@ def run(
 
 def create_agent(model: Text, endpoints: Text = None) -> "Agent":
     from rasa.core.tracker_store import TrackerStore
+    from rasa.core.lock_store import LockStore
     from rasa.core import broker
     from rasa.core.utils import AvailableEndpoints
     from rasa.core.agent import Agent
@@ -69,10 +70,12 @@ def create_agent(model: Text, endpoints: Text = None) -> "Agent":
     _tracker_store = TrackerStore.find_tracker_store(
         None, _endpoints.tracker_store, _broker
     )
+    _lock_store = LockStore.find_lock_store(_endpoints.lock_store)
 
     return Agent.load(
         model,
         generator=_endpoints.nlg,
         tracker_store=_tracker_store,
+        lock_store=_lock_store,
         action_endpoint=_endpoints.action,
     )
@@ -15,6 +15,7 @@ import rasa
 import rasa.utils.common
 import rasa.utils.endpoints
 import rasa.utils.io
+import rasa.utils.metrics
 from rasa.core.domain import InvalidDomain
 from rasa.utils.endpoints import EndpointConfig
 from rasa.constants import (
@@ -37,6 +38,7 @@ from rasa.core.utils import dump_obj_as_str_to_file, AvailableEndpoints
 from rasa.model import get_model_subdirectories, fingerprint_from_path
 from rasa.nlu.emulators.no_emulator import NoEmulator
 from rasa.nlu.test import run_evaluation
+from rasa.core.lock_store import LockStore
 from rasa.core.tracker_store import TrackerStore
 
 logger = logging.getLogger(__name__)
@@ -246,6 +248,7 @@ async def _load_agent(
 ) -> Agent:
     try:
         tracker_store = None
+        lock_store = None
         generator = None
         action_endpoint = None
 
@@ -254,6 +257,7 @@ async def _load_agent(
             tracker_store = TrackerStore.find_tracker_store(
                 None, endpoints.tracker_store, _broker
             )
+            lock_store = LockStore.find_lock_store(endpoints.lock_store)
             generator = endpoints.nlg
             action_endpoint = endpoints.action
 
@@ -263,6 +267,7 @@ async def _load_agent(
             remote_storage,
             generator=generator,
             tracker_store=tracker_store,
+            lock_store=lock_store,
             action_endpoint=action_endpoint,
         )
     except Exception as e:
@@ -352,6 +357,13 @@ def create_app(
             }
         )
 
+    @app.get("/metrics")
+    @requires_auth(app, auth_token)
+    async def metrics(request: Request):
+        """Respond with the counters, gauges and timings collected by the server."""
+
+        return response.json(rasa.utils.metrics.registry.as_dict())
+
     @app.get("/conversations/<conversation_id>/tracker")
     @requires_auth(app, auth_token)
     @ensure_loaded_agent(app)
@@ -416,15 +428,18 @@ def create_app(
             )
 
         verbosity = event_verbosity_parameter(request, EventVerbosity.AFTER_RESTART)
-        tracker = obtain_tracker_store(app.agent, conversation_id)
 
         try:
-            for event in events:
-                tracker.update(event, app.agent.domain)
+            async with app.agent.lock_store.lock(conversation_id):
+                tracker = obtain_tracker_store(app.agent, conversation_id)
+                for event in events:
+                    tracker.update(event, app.agent.domain)
 
-            app.agent.tracker_store.save(tracker)
+                app.agent.tracker_store.save(tracker)
 
             return response.json(tracker.current_state(verbosity))
+        except ErrorResponse:
+            raise
         except Exception as e:
             logger.debug(traceback.format_exc())
             raise ErrorResponse(
@@ -452,7 +467,8 @@ def create_app(
             )
 
             # will override an existing tracker with the same id!
-            app.agent.tracker_store.save(tracker)
+            async with app.agent.lock_store.lock(conversation_id):
+                app.agent.tracker_store.save(tracker)
             return response.json(tracker.current_state(verbosity))
         except Exception as e:
             logger.debug(traceback.format_exc())
@@ -517,11 +533,16 @@ def create_app(
         verbosity = event_verbosity_parameter(request, EventVerbosity.AFTER_RESTART)
 
         try:
-            tracker = obtain_tracker_store(app.agent, conversation_id)
-            output_channel = _get_output_channel(request, tracker)
-            await app.agent.execute_action(
-                conversation_id, action_to_execute, output_channel, policy, confidence
-            )
+            async with app.agent.lock_store.lock(conversation_id):
+                tracker = obtain_tracker_store(app.agent, conversation_id)
+                output_channel = _get_output_channel(request, tracker)
+                await app.agent.execute_action(
+                    conversation_id,
+                    action_to_execute,
+                    output_channel,
+                    policy,
+                    confidence,
+                )
         except Exception as e:
             logger.debug(traceback.format_exc())
             raise ErrorResponse(
@@ -589,7 +610,8 @@ def create_app(
 
         try:
             user_message = UserMessage(message, None, conversation_id, parse_data)
-            tracker = await app.agent.log_message(user_message)
+            async with app.agent.lock_store.lock(conversation_id):
+                tracker = await app.agent.log_message(user_message)
             return response.json(tracker.current_state(verbosity))
         except Exception as e:
             logger.debug(traceback.format_exc())
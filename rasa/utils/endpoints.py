@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import os
+import time
+import weakref
 
 import aiohttp
 from typing import Any, Optional, Text, Dict
@@ -8,10 +11,19 @@ from sanic.request import Request
 
 import rasa.utils.io
 from rasa.constants import DEFAULT_REQUEST_TIMEOUT
+from rasa.utils.metrics import registry
 
 
 logger = logging.getLogger(__name__)
 
+# maximum number of simultaneous connections to the host of an endpoint
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 20
+# seconds an idle connection is kept open for later requests
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+
+# endpoints which currently hold an open pooled session
+_endpoints_with_sessions = weakref.WeakValueDictionary()  # type: Dict[int, Any]
+
 
 def read_endpoint_config(
     filename: Text, endpoint_type: Text
@@ -81,10 +93,23 @@ class EndpointConfig(object):
         self.basic_auth = basic_auth
         self.token = token
         self.token_name = token_name
+        self.connection_limit_per_host = kwargs.pop(
+            "connection_limit_per_host", DEFAULT_CONNECTION_LIMIT_PER_HOST
+        )
+        self.keepalive_timeout = kwargs.pop(
+            "keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT
+        )
         self.type = kwargs.pop("store_type", kwargs.pop("type", None))
         self.kwargs = kwargs
 
-    def session(self):
+        # pooled sessions by the event loop they were created in
+        self._pooled_sessions = (
+            {}
+        )  # type: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+
+    def session(
+        self, connector: Optional[aiohttp.BaseConnector] = None
+    ) -> aiohttp.ClientSession:
         # create authentication parameters
         if self.basic_auth:
             auth = aiohttp.BasicAuth(
@@ -94,11 +119,69 @@ class EndpointConfig(object):
             auth = None
 
         return aiohttp.ClientSession(
+            connector=connector,
             headers=self.headers,
             auth=auth,
             timeout=aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
         )
 
+    def pooled_session(self) -> aiohttp.ClientSession:
+        """Return the long-lived session of this endpoint.
+
+        The session keeps connections to the endpoint alive between requests.
+        It is created on the first request within the running event loop, as
+        sessions are bound to their loop. Sessions are kept per event loop and
+        all of them are closed by `close_session`."""
+
+        loop = asyncio.get_event_loop()
+        session = self._pooled_sessions.get(loop)
+        if session is None or session.closed:
+            self._forget_closed_loops()
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = self._pooled_sessions[loop] = self.session(connector)
+            _endpoints_with_sessions[id(self)] = self
+
+        return session
+
+    def _forget_closed_loops(self) -> None:
+        """Drop the sessions of closed event loops, so that the loops and their
+        connectors can be freed."""
+
+        for loop in [loop for loop in self._pooled_sessions if loop.is_closed()]:
+            del self._pooled_sessions[loop]
+
+    async def close_session(self) -> None:
+        """Close the pooled sessions of this endpoint and their connections."""
+
+        sessions, self._pooled_sessions = self._pooled_sessions, {}
+        _endpoints_with_sessions.pop(id(self), None)
+
+        current_loop = asyncio.get_event_loop()
+        for loop, session in sessions.items():
+            if session.closed:
+                continue
+
+            if loop is not current_loop and loop.is_running():
+                # the session is used by the event loop of another thread
+                future = asyncio.run_coroutine_threadsafe(session.close(), loop)
+                await asyncio.wrap_future(future)
+                continue
+
+            try:
+                await session.close()
+            except RuntimeError as e:
+                # the connections can't be closed anymore if their loop is closed
+                logger.debug(
+                    "Failed to close the pooled session of endpoint '{}'. "
+                    "Error: {}".format(self.url, e)
+                )
+
+    def _metric(self, name: Text) -> Text:
+        return "endpoint.{}.{}".format(self.url, name)
+
     def combine_parameters(self, kwargs=None):
         # construct GET parameters
         params = self.params.copy()
@@ -135,8 +218,9 @@ class EndpointConfig(object):
             del kwargs["headers"]
 
         url = concat_url(self.url, subpath)
-        async with self.session() as session:
-            async with session.request(
+        start = time.time()
+        try:
+            async with self.pooled_session().request(
                 method,
                 url,
                 headers=headers,
@@ -148,6 +232,11 @@ class EndpointConfig(object):
                         resp.status, resp.reason, await resp.content.read()
                     )
                 return await getattr(resp, return_method)()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            registry.increment(self._metric("errors"))
+            raise
+        finally:
+            registry.observe(self._metric("latency"), time.time() - start)
 
     @classmethod
     def from_dict(cls, data):
@@ -161,6 +250,8 @@ class EndpointConfig(object):
             self.basic_auth,
             self.token,
             self.token_name,
+            connection_limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
             **self.kwargs
         )
 
@@ -181,6 +272,13 @@ class EndpointConfig(object):
         return not self.__eq__(other)
 
 
+async def close_pooled_sessions() -> None:
+    """Close the pooled sessions of all endpoints, e.g. on server shutdown."""
+
+    for endpoint in list(_endpoints_with_sessions.values()):
+        await endpoint.close_session()
+
+
 class ClientResponseError(aiohttp.ClientError):
     def __init__(self, status, message, text):
         self.status = status
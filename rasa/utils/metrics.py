@@ -0,0 +1,85 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Text
+
+
+class Timing(object):
+    """Aggregated durations of a repeatedly measured operation."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> Dict[Text, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class MetricsRegistry(object):
+    """In-process collection of counters, gauges and timings.
+
+    The registry is thread safe, as some of the measured operations run in
+    executor threads rather than on the event loop."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters = {}  # type: Dict[Text, int]
+        self.gauges = {}  # type: Dict[Text, float]
+        self.timings = {}  # type: Dict[Text, Timing]
+
+    def increment(self, name: Text, value: int = 1) -> None:
+        """Increase the counter `name` by `value`."""
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: Text, value: float) -> None:
+        """Set the current value of the gauge `name`."""
+
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: Text, seconds: float) -> None:
+        """Record a duration for the timing `name`."""
+
+        with self._lock:
+            self.timings.setdefault(name, Timing()).observe(seconds)
+
+    @contextmanager
+    def measure(self, name: Text) -> Iterator[None]:
+        """Record the duration of the wrapped block for the timing `name`."""
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(name, time.time() - start)
+
+    def as_dict(self) -> Dict[Text, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "timings": {k: v.as_dict() for k, v in self.timings.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters = {}
+            self.gauges = {}
+            self.timings = {}
+
+
+# registry shared by all components of a Rasa process
+registry = MetricsRegistry()
@@ -3,6 +3,11 @@ import logging
 
 from rasa.core.run import _create_app_without_api
 from rasa import server
+from rasa.constants import (
+    ENV_MODEL_CACHE_PATH,
+    ENV_MODEL_DOWNLOAD_PATH,
+    ENV_TRAINING_DATA_CACHE_PATH,
+)
 from rasa.core import config
 from rasa.core.agent import Agent, load_agent
 from rasa.core.channels.channel import RestInput
@@ -34,6 +39,21 @@ def set_log_level_debug(caplog):
     caplog.set_level(logging.DEBUG)
 
 
+@pytest.fixture(autouse=True)
+def use_temporary_model_cache(tmpdir_factory, monkeypatch):
+    # keep the models of the tests out of the user's model cache and downloads
+    cache_directory = tmpdir_factory.getbasetemp().join("model_cache").strpath
+    monkeypatch.setenv(ENV_MODEL_CACHE_PATH, cache_directory)
+    download_directory = tmpdir_factory.mktemp("model_downloads").strpath
+    monkeypatch.setenv(ENV_MODEL_DOWNLOAD_PATH, download_directory)
+
+
+@pytest.fixture(autouse=True)
+def use_temporary_training_data_cache(tmpdir_factory, monkeypatch):
+    cache_directory = tmpdir_factory.mktemp("training_data_cache").strpath
+    monkeypatch.setenv(ENV_TRAINING_DATA_CACHE_PATH, cache_directory)
+
+
 @pytest.fixture
 async def default_agent(tmpdir_factory) -> Agent:
     model_path = tmpdir_factory.mktemp("model").strpath
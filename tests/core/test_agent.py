@@ -1,4 +1,6 @@
 import asyncio
+import base64
+import hashlib
 from typing import Text
 
 import pytest
@@ -189,6 +191,162 @@ async def test_wait_time_between_pulls_without_interval(model_server, monkeypatc
     jobs.kill_scheduler()
 
 
+async def test_model_from_server_is_swapped_after_warm_up(
+    model_server, trained_model
+):
+    from rasa.utils.metrics import registry
+
+    registry.reset()
+    agent = await load_agent(model_path=trained_model)
+    previous_ensemble = agent.policy_ensemble
+    await agent.handle_text("/greet")
+
+    model_endpoint_config = EndpointConfig.from_dict(
+        {
+            "url": model_server.make_url("/model"),
+            "wait_time_between_pulls": None,
+            "warm_up_messages": ["hello", "goodbye"],
+        }
+    )
+    await rasa.core.agent.load_from_server(agent, model_server=model_endpoint_config)
+
+    assert agent.fingerprint == "somehash"
+    assert agent.policy_ensemble is not previous_ensemble
+
+    metrics = registry.as_dict()
+    assert metrics["counters"]["model.swaps"] == 1
+    assert "model.warm_up.cold_latency" in metrics["gauges"]
+    assert "model.warm_up.warm_latency" in metrics["gauges"]
+    # measured with the messages the previous model actually handled
+    assert "model.swap.latency_before" in metrics["gauges"]
+    assert "model.swap.latency_after" not in metrics["gauges"]
+
+    await agent.handle_text("/greet")
+    assert "model.swap.latency_after" in registry.as_dict()["gauges"]
+
+    # the previous model is released in the background
+    await asyncio.sleep(0.1)
+    assert registry.as_dict()["counters"]["model.releases"] == 1
+
+
+async def test_replaced_model_is_released_after_its_messages(
+    model_server, trained_model
+):
+    from rasa.utils.metrics import registry
+
+    registry.reset()
+    agent = await load_agent(model_path=trained_model)
+    model_endpoint_config = EndpointConfig.from_dict(
+        {"url": model_server.make_url("/model"), "wait_time_between_pulls": None}
+    )
+
+    # a message which is still handled by the previous model
+    with agent.model_usage:
+        await rasa.core.agent.load_from_server(
+            agent, model_server=model_endpoint_config
+        )
+        await asyncio.sleep(0.1)
+        assert "model.releases" not in registry.as_dict()["counters"]
+
+    await asyncio.sleep(0.1)
+    assert registry.as_dict()["counters"]["model.releases"] == 1
+
+
+async def test_restarted_agent_reuses_downloaded_model(model_server):
+    model_endpoint_config = EndpointConfig.from_dict(
+        {"url": model_server.make_url("/model"), "wait_time_between_pulls": None}
+    )
+
+    await rasa.core.agent.load_from_server(Agent(), model_server=model_endpoint_config)
+    assert model_server.app.number_of_model_requests == 1
+
+    # a new agent, e.g. after a restart of the server
+    agent = await rasa.core.agent.load_from_server(
+        Agent(), model_server=model_endpoint_config
+    )
+
+    assert agent.fingerprint == "somehash"
+    assert agent.is_ready()
+    assert model_server.app.number_of_model_requests == 1
+
+
+def range_model_server_app(model_path: Text, digest: Text):
+    app = Sanic(__name__)
+    app.requested_ranges = []
+
+    with open(model_path, "rb") as f:
+        model_bytes = f.read()
+
+    @app.route("/model", methods=["GET"])
+    async def model(request):
+        headers = {"ETag": "somehash", "Digest": digest}
+        requested_range = request.headers.get("Range")
+        app.requested_ranges.append(requested_range)
+
+        if requested_range and request.headers.get("If-Range") == "somehash":
+            start = int(requested_range[len("bytes=") : -1])
+            headers["Content-Range"] = "bytes {}-{}/{}".format(
+                start, len(model_bytes) - 1, len(model_bytes)
+            )
+            return response.raw(model_bytes[start:], status=206, headers=headers)
+
+        return response.raw(model_bytes, headers=headers)
+
+    return app
+
+
+async def test_interrupted_model_download_is_resumed(
+    test_server, trained_moodbot_path
+):
+    with open(trained_moodbot_path, "rb") as f:
+        model_bytes = f.read()
+    checksum = hashlib.sha256(model_bytes).digest()
+    digest = "sha-256=" + base64.b64encode(checksum).decode()
+
+    server = await test_server(range_model_server_app(trained_moodbot_path, digest))
+    model_endpoint_config = EndpointConfig.from_dict(
+        {"url": server.make_url("/model"), "wait_time_between_pulls": None}
+    )
+
+    # the first half of the model was downloaded before the interruption
+    download = rasa.core.agent._ModelDownload(model_endpoint_config.url)
+    download.lock()
+    download.start("somehash", resume=False)
+    with open(download.partial_file, "wb") as f:
+        f.write(model_bytes[: len(model_bytes) // 2])
+    download.unlock()
+
+    agent = await rasa.core.agent.load_from_server(
+        Agent(), model_server=model_endpoint_config
+    )
+
+    assert agent.fingerprint == "somehash"
+    assert server.app.requested_ranges == ["bytes={}-".format(len(model_bytes) // 2)]
+    with open(download.model_file, "rb") as f:
+        assert f.read() == model_bytes
+    await server.close()
+
+
+async def test_model_with_wrong_checksum_is_not_loaded(
+    test_server, trained_moodbot_path
+):
+    digest = "sha-256=" + base64.b64encode(hashlib.sha256(b"other").digest()).decode()
+    server = await test_server(range_model_server_app(trained_moodbot_path, digest))
+    model_endpoint_config = EndpointConfig.from_dict(
+        {"url": server.make_url("/model"), "wait_time_between_pulls": None}
+    )
+
+    agent = await rasa.core.agent.load_from_server(
+        Agent(), model_server=model_endpoint_config
+    )
+
+    assert agent.fingerprint is None
+    download = rasa.core.agent._ModelDownload(model_endpoint_config.url)
+    assert download.stored_fingerprint() is None
+    assert download.resumable() == (0, None)
+    await server.close()
+
+
 async def test_load_agent(trained_model):
     agent = await load_agent(model_path=trained_model)
 
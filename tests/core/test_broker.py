@@ -1,9 +1,19 @@
 import json
 
+import pytest
+
 from rasa.core import broker
-from rasa.core.broker import FileProducer, PikaProducer, KafkaProducer, SQLProducer
+from rasa.core.broker import (
+    FileProducer,
+    PikaProducer,
+    KafkaProducer,
+    SQLProducer,
+    QueuedEventChannel,
+    EventChannel,
+)
 from rasa.core.events import Event, Restarted, SlotSet, UserUttered
 from rasa.utils.endpoints import EndpointConfig, read_endpoint_config
+from rasa.utils.metrics import registry
 from tests.core.conftest import DEFAULT_ENDPOINTS_FILE
 
 TEST_EVENTS = [
@@ -25,6 +35,87 @@ def test_pika_broker_from_config():
     assert actual.queue == "queue"
 
 
+class FakePikaConnection(object):
+    """Stands in for a `pika.BlockingConnection` and its channel."""
+
+    def __init__(self, published, failures=0):
+        self.published = published
+        self.failures = failures
+        self.is_open = True
+
+    def basic_publish(self, exchange, queue, body):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection lost")
+        self.published.append(body)
+
+    def process_data_events(self, time_limit=None):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+def _pika_producer_with_fake_connection(failures=0, **kwargs):
+    producer = PikaProducer("localhost", "username", "password", **kwargs)
+    published = []
+    opened = []
+
+    def open_connection():
+        # only the first connection fails to publish
+        producer.connection = FakePikaConnection(
+            published, failures if not opened else 0
+        )
+        producer.channel = producer.connection
+        opened.append(producer.connection)
+
+    producer._open_connection = open_connection
+    return producer, published, opened
+
+
+@pytest.mark.parametrize("background_publishing", [True, False])
+def test_pika_producer_keeps_connection_open(background_publishing):
+    producer, published, opened = _pika_producer_with_fake_connection(
+        background_publishing=background_publishing
+    )
+
+    for e in TEST_EVENTS:
+        producer.publish(e.as_dict())
+    producer.close()
+
+    assert [json.loads(body) for body in published] == [
+        e.as_dict() for e in TEST_EVENTS
+    ]
+    assert len(opened) == 1
+    assert not opened[0].is_open
+
+
+@pytest.mark.parametrize("background_publishing", [True, False])
+def test_pika_producer_reconnects(background_publishing):
+    producer, published, opened = _pika_producer_with_fake_connection(
+        failures=1, background_publishing=background_publishing
+    )
+
+    producer.publish(TEST_EVENTS[0].as_dict())
+    producer.close()
+
+    assert len(published) == 1
+    assert len(opened) == 2
+
+
+def test_pika_producer_drops_events_if_buffer_is_full():
+    producer, published, _ = _pika_producer_with_fake_connection(
+        background_publishing=True, max_buffer_size=1
+    )
+    # pretend the background publisher is busy
+    producer._publisher = object()
+
+    for e in TEST_EVENTS:
+        producer.publish(e.as_dict())
+
+    assert producer._buffer.qsize() == 1
+
+
 def test_no_broker_in_config():
     cfg = read_endpoint_config(DEFAULT_ENDPOINTS_FILE, "event_broker")
 
@@ -137,3 +228,121 @@ def test_kafka_broker_from_config():
     assert actual.sasl_username == expected.sasl_username
     assert actual.sasl_password == expected.sasl_password
     assert actual.topic == expected.topic
+
+
+def _read_events(fname):
+    with open(fname, "r") as f:
+        return [Event.from_parameters(json.loads(l)) for l in f]
+
+
+def test_queued_broker_from_config(tmpdir):
+    fname = tmpdir.join("events.log").strpath
+
+    actual = broker.from_endpoint_config(
+        EndpointConfig(
+            type="file",
+            path=fname,
+            queued=True,
+            max_queue_size=5,
+            full_queue_policy="spill",
+        )
+    )
+
+    assert isinstance(actual, QueuedEventChannel)
+    assert isinstance(actual.event_channel, FileProducer)
+    assert actual.event_channel.path == fname
+    assert actual.max_queue_size == 5
+    assert actual.full_queue_policy == "spill"
+
+
+def test_queued_broker_publishes_immediately_without_event_loop(tmpdir):
+    fname = tmpdir.join("events.log").strpath
+    actual = QueuedEventChannel(FileProducer(fname))
+
+    for e in TEST_EVENTS:
+        actual.publish(e.as_dict())
+
+    assert _read_events(fname) == TEST_EVENTS
+
+
+async def test_queued_broker_publishes_in_background(tmpdir):
+    fname = tmpdir.join("events.log").strpath
+    actual = QueuedEventChannel(FileProducer(fname))
+
+    for e in TEST_EVENTS:
+        actual.publish(e.as_dict())
+    await actual.flush()
+    actual.close()
+
+    assert _read_events(fname) == TEST_EVENTS
+    assert registry.gauges["event_broker.queue_length"] == 0
+    assert registry.timings["event_broker.publish_lag"].count > 0
+
+
+async def test_queued_broker_drops_events_if_queue_is_full(tmpdir):
+    registry.reset()
+    fname = tmpdir.join("events.log").strpath
+    actual = QueuedEventChannel(
+        FileProducer(fname), max_queue_size=1, full_queue_policy="drop"
+    )
+
+    for e in TEST_EVENTS:
+        actual.publish(e.as_dict())
+    await actual.flush()
+    actual.close()
+
+    assert _read_events(fname) == TEST_EVENTS[:1]
+    assert registry.counters["event_broker.dropped"] == 2
+
+
+@pytest.mark.parametrize("policy", ["block", "spill"])
+async def test_queued_broker_keeps_events_if_queue_is_full(policy, tmpdir):
+    fname = tmpdir.join("events.log").strpath
+    actual = QueuedEventChannel(
+        FileProducer(fname),
+        max_queue_size=1,
+        full_queue_policy=policy,
+        spill_path=tmpdir.join("spill.log").strpath,
+    )
+
+    await actual.publish_many([e.as_dict() for e in TEST_EVENTS])
+    await actual.publish_many([e.as_dict() for e in TEST_EVENTS])
+    await actual.flush()
+    actual.close()
+
+    assert _read_events(fname) == TEST_EVENTS + TEST_EVENTS
+    assert tmpdir.listdir(lambda p: p.basename.startswith("spill")) == []
+
+
+async def test_queued_broker_does_not_block_synchronous_callers(tmpdir):
+    fname = tmpdir.join("events.log").strpath
+    actual = QueuedEventChannel(
+        FileProducer(fname),
+        max_queue_size=1,
+        full_queue_policy="block",
+        spill_path=tmpdir.join("spill.log").strpath,
+    )
+
+    # e.g. `TrackerStore.save` on the event loop
+    actual.publish_batch([e.as_dict() for e in TEST_EVENTS])
+
+    assert len(actual._queue) == 1
+    assert actual._spilled == len(TEST_EVENTS) - 1
+
+    await actual.flush()
+    actual.close()
+
+    assert _read_events(fname) == TEST_EVENTS
+
+
+def test_queued_broker_rejects_background_publishing():
+    channel = EventChannel()
+    channel.background_publishing = True
+
+    with pytest.raises(ValueError):
+        QueuedEventChannel(channel)
+
+
+def test_queued_broker_with_unknown_policy():
+    with pytest.raises(ValueError):
+        QueuedEventChannel(EventChannel(), full_queue_policy="wait")
@@ -86,6 +86,26 @@ def test_policy_priority():
     assert result == priority_2_result
 
 
+def test_policy_priority_batch():
+    domain = Domain.load("data/test_domains/default.yml")
+    trackers = [
+        DialogueStateTracker.from_events(sender, [UserUttered("hi")], [])
+        for sender in ["first", "second"]
+    ]
+
+    priority_1 = ConstantPolicy(priority=1, predict_index=0)
+    priority_2 = ConstantPolicy(priority=2, predict_index=1)
+    policy_ensemble = SimplePolicyEnsemble([priority_1, priority_2])
+
+    results = policy_ensemble.probabilities_using_best_policy_batch(trackers, domain)
+
+    assert results == [
+        policy_ensemble.probabilities_using_best_policy(tracker, domain)
+        for tracker in trackers
+    ]
+    assert policy_ensemble.probabilities_using_best_policy_batch([], domain) == []
+
+
 class LoadReturnsNonePolicy(Policy):
     @classmethod
     def load(cls, path):
@@ -158,3 +178,49 @@ def test_valid_policy_configurations(valid_config):
 def test_invalid_policy_configurations(invalid_config):
     with pytest.raises(InvalidPolicyConfig):
         PolicyEnsemble.from_dict(invalid_config)
+
+
+async def test_train_policies_in_processes(default_domain):
+    from rasa.core import training
+    from rasa.core.policies.mapping_policy import MappingPolicy
+    from rasa.core.policies.memoization import (
+        AugmentedMemoizationPolicy,
+        MemoizationPolicy,
+    )
+    from tests.core.conftest import DEFAULT_STORIES_FILE
+
+    training_trackers = await training.load_data(
+        DEFAULT_STORIES_FILE, default_domain, augmentation_factor=0
+    )
+
+    def create_ensemble():
+        return SimplePolicyEnsemble(
+            [
+                MemoizationPolicy(max_history=3, priority=3),
+                AugmentedMemoizationPolicy(max_history=2, priority=2),
+                MappingPolicy(priority=1),
+            ]
+        )
+
+    sequential_ensemble = create_ensemble()
+    sequential_ensemble.train(training_trackers, default_domain)
+
+    parallel_ensemble = create_ensemble()
+    parallel_ensemble.train(training_trackers, default_domain, policy_processes=2)
+
+    assert [type(p) for p in parallel_ensemble.policies] == [
+        type(p) for p in sequential_ensemble.policies
+    ]
+    for parallel, sequential in zip(
+        parallel_ensemble.policies[:2], sequential_ensemble.policies[:2]
+    ):
+        assert parallel.lookup == sequential.lookup
+        assert parallel.priority == sequential.priority
+
+
+def test_train_policies_in_processes_load_returns_none(default_domain):
+    ensemble = PolicyEnsemble([WorkingPolicy(), LoadReturnsNonePolicy()])
+    trackers = [DialogueStateTracker("default", default_domain.slots)]
+
+    with pytest.raises(Exception):
+        ensemble.train(trackers, default_domain, policy_processes=2)
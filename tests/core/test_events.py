@@ -23,6 +23,7 @@ from rasa.core.events import (
     UserUtteranceReverted,
     AgentUttered,
 )
+from rasa.core.events import compact
 
 
 @pytest.mark.parametrize(
@@ -267,3 +268,56 @@ def test_correct_timestamp_setting(event_class):
     event2 = event_class("test")
 
     assert event.timestamp < event2.timestamp
+
+
+def test_compact_encoding_round_trip():
+    ranking = [
+        {"name": "greet", "confidence": 0.9},
+        {"name": "goodbye", "confidence": 0.1},
+    ]
+    parse_data = {
+        "intent": ranking[0],
+        "intent_ranking": ranking,
+        "entities": [{"entity": "name", "value": "Bob", "start": 0, "end": 3}],
+        "text": "Bob here",
+    }
+    evts = [
+        UserUttered("Bob here", ranking[0], parse_data["entities"], parse_data),
+        UserUttered(metadata={"type": "text"}),
+        SlotSet("name", "Bob"),
+        SlotSet("count", 3),
+        ActionExecuted("utter_greet", "policy_0_MemoizationPolicy", 1.0),
+        ActionExecuted("action_listen"),
+        BotUttered("Hey Bob", {"buttons": None}),
+        ReminderScheduled("my_action", datetime.now(), name="reminder"),
+        Restarted(),
+    ]
+
+    encoded = compact.encode_events(evts)
+    decoded = compact.decode_events(encoded)
+
+    assert decoded == evts
+    assert [e.as_dict() for e in decoded] == [e.as_dict() for e in evts]
+    # names are stored once
+    assert encoded.count(b"utter_greet") == 1
+    assert encoded.count(b"goodbye") == 1
+
+
+def test_compact_encoding_rejects_other_versions():
+    encoded = bytearray(compact.encode_events([Restarted()]))
+    encoded[len(compact.MAGIC)] = compact.FORMAT_VERSION + 1
+
+    with pytest.raises(ValueError):
+        compact.decode_events(bytes(encoded))
+
+
+def test_resolve_by_type_finds_events_defined_later():
+    with pytest.raises(ValueError):
+        Event.resolve_by_type("my_custom_event")
+
+    class MyCustomEvent(Event):
+        type_name = "my_custom_event"
+
+    assert Event.resolve_by_type("my_custom_event") is MyCustomEvent
+    assert Event.resolve_by_type("slot") is SlotSet
+    assert Event.resolve_by_type("unknown", default=ActionExecuted) is ActionExecuted
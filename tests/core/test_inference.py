@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+
+from rasa.core import inference
+from rasa.core.inference import MicroBatcher, StageExecutor
+from rasa.utils.metrics import registry
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+def _add(a: int, b: int) -> int:
+    return a + b
+
+
+def setup_function(function):
+    registry.reset()
+
+
+async def test_inline_executor_runs_on_event_loop():
+    executor = StageExecutor("test", inference.INLINE_EXECUTOR)
+
+    assert await executor.run(_thread_name) == threading.current_thread().name
+    assert registry.timings["inference.test.latency"].count == 1
+
+
+async def test_thread_executor_runs_in_other_thread():
+    executor = StageExecutor("test", inference.THREAD_EXECUTOR, max_workers=1)
+
+    assert await executor.run(_thread_name) != threading.current_thread().name
+    assert await executor.run(_add, 1, 2) == 3
+
+    metrics = registry.as_dict()
+    assert metrics["timings"]["inference.test.latency"]["count"] == 2
+    assert metrics["timings"]["inference.test.queue_time"]["count"] == 2
+    assert metrics["gauges"]["inference.test.queue_depth"] == 0
+
+    executor.shutdown()
+
+
+def test_default_executors_run_inline():
+    inference.shutdown()
+
+    for stage in [inference.NLU_STAGE, inference.POLICY_STAGE]:
+        executor = inference.get_executor(stage)
+        assert executor.executor_type == inference.INLINE_EXECUTOR
+
+    inference.shutdown()
+
+
+def test_thread_executor_limits_threads():
+    executor = StageExecutor("test", inference.THREAD_EXECUTOR)
+
+    pool = executor._get_executor()
+    assert pool._max_workers == inference.DEFAULT_MAX_THREAD_WORKERS
+
+    executor.shutdown()
+
+
+async def test_process_executor():
+    executor = StageExecutor("test", inference.PROCESS_EXECUTOR, max_workers=1)
+
+    assert await executor.run(_add, 2, 3) == 5
+
+    executor.shutdown()
+
+
+def test_unknown_executor_type():
+    with pytest.raises(ValueError):
+        StageExecutor("test", "gpu")
+
+
+def test_policy_inference_falls_back_to_threads():
+    inference.configure(
+        nlu_executor=inference.PROCESS_EXECUTOR,
+        policy_executor=inference.PROCESS_EXECUTOR,
+    )
+
+    nlu_executor = inference.get_executor(inference.NLU_STAGE)
+    policy_executor = inference.get_executor(inference.POLICY_STAGE)
+    assert nlu_executor.executor_type == inference.PROCESS_EXECUTOR
+    assert policy_executor.executor_type == inference.THREAD_EXECUTOR
+
+    inference.shutdown()
+
+
+async def test_micro_batcher_collects_concurrent_calls():
+    batches = []
+
+    def double(items):
+        batches.append(items)
+        return [2 * item for item in items]
+
+    executor = StageExecutor(
+        "test", inference.INLINE_EXECUTOR, max_batch_size=3, max_batch_wait_ms=50
+    )
+    batcher = MicroBatcher(executor, double)
+
+    results = await asyncio.gather(*[batcher.submit(i) for i in range(4)])
+
+    assert results == [0, 2, 4, 6]
+    # the first batch is full, the second one is processed after waiting
+    assert batches == [[0, 1, 2], [3]]
+    assert registry.counters["inference.test.batches"] == 2
+    assert registry.counters["inference.test.batched_items"] == 4
+
+
+async def test_micro_batcher_propagates_errors():
+    def fail(items):
+        raise ValueError("failed")
+
+    executor = StageExecutor("test", inference.INLINE_EXECUTOR, max_batch_size=2)
+    batcher = MicroBatcher(executor, fail)
+
+    with pytest.raises(ValueError):
+        await batcher.submit(1)
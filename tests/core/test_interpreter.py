@@ -1,3 +1,6 @@
+from collections import OrderedDict
+from unittest.mock import Mock
+
 import pytest
 from aioresponses import aioresponses
 
@@ -111,3 +114,24 @@ async def test_http_interpreter(endpoint_url, joined_url):
         response = {"text": "message_text", "token": None, "message_id": "message_id"}
 
         assert query == response
+
+
+def test_worker_process_keeps_only_recent_interpreters(monkeypatch):
+    from rasa.core import interpreter
+    from rasa.nlu.model import Interpreter
+
+    def load(model_directory):
+        return Mock(pipeline=[Mock(session=Mock())], directory=model_directory)
+
+    monkeypatch.setattr(Interpreter, "load", load)
+    monkeypatch.setattr(interpreter, "_worker_process_interpreters", OrderedDict())
+
+    first = interpreter._worker_process_interpreter("model_1")
+    second = interpreter._worker_process_interpreter("model_2")
+    assert interpreter._worker_process_interpreter("model_1") is first
+
+    interpreter._worker_process_interpreter("model_3")
+
+    assert list(interpreter._worker_process_interpreters) == ["model_1", "model_3"]
+    assert second.pipeline[0].session.close.called
+    assert not first.pipeline[0].session.close.called
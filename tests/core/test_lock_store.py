@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+
+from rasa.core.lock import TicketLock
+from rasa.core.lock_store import (
+    InMemoryLockStore,
+    LockError,
+    LockStore,
+    RedisLockStore,
+)
+from rasa.utils.endpoints import EndpointConfig
+
+
+class FakeRedisLockStore(RedisLockStore):
+    """Fake `RedisLockStore` using `fakeredis` library."""
+
+    def __init__(self):
+        self.red = fakeredis.FakeStrictRedis()
+        # added in redis==3.3.0, but not yet in fakeredis
+        self.red.connection_pool.connection_class.health_check_interval = 0
+        self.key_prefix = "lock:"
+
+
+def test_issue_ticket():
+    lock = TicketLock("some sender")
+
+    # no lock issued
+    assert lock.last_issued == -1
+    assert lock.now_serving == 0
+
+    # no one is waiting
+    assert not lock.is_someone_waiting()
+
+    # issue ticket
+    ticket = lock.issue_ticket(1)
+    assert ticket == 0
+    assert lock.last_issued == 0
+    assert lock.now_serving == 0
+
+    # someone is waiting
+    assert lock.is_someone_waiting()
+
+
+def test_remove_expired_tickets():
+    lock = TicketLock("random id 1")
+
+    # issue one long- and one short-lived ticket
+    _ = list(map(lock.issue_ticket, [k for k in [0.01, 10]]))
+
+    # both tickets are there
+    assert len(lock.tickets) == 2
+
+    # sleep and only one ticket should be left
+    import time
+
+    time.sleep(0.02)
+    lock.remove_expired_tickets()
+    assert len(lock.tickets) == 1
+
+
+def test_lock_serialisation():
+    lock = TicketLock("some sender")
+    lock.issue_ticket(10)
+    lock.issue_ticket(10)
+
+    restored = TicketLock.from_dict(json.loads(lock.dumps()))
+
+    assert restored.conversation_id == "some sender"
+    assert [t.number for t in restored.tickets] == [0, 1]
+
+
+@pytest.mark.parametrize("lock_store", [InMemoryLockStore(), FakeRedisLockStore()])
+def test_create_lock_store(lock_store: LockStore):
+    conversation_id = "my id 0"
+
+    # create and lock
+    lock = lock_store.create_lock(conversation_id)
+    lock_store.save_lock(lock)
+    lock = lock_store.get_lock(conversation_id)
+    assert lock
+    assert lock.conversation_id == conversation_id
+
+
+@pytest.mark.parametrize("lock_store", [InMemoryLockStore(), FakeRedisLockStore()])
+def test_serve_ticket(lock_store: LockStore):
+    conversation_id = "my id 1"
+
+    # issue ticket with long lifetime
+    ticket_0 = lock_store.issue_ticket(conversation_id, 10)
+    assert ticket_0 == 0
+    assert lock_store.get_lock(conversation_id).now_serving == ticket_0
+
+    # issue another one
+    ticket_1 = lock_store.issue_ticket(conversation_id, 10)
+
+    # finish serving ticket_0
+    lock_store.finish_serving(conversation_id, ticket_0)
+
+    lock = lock_store.get_lock(conversation_id)
+    assert lock.last_issued == ticket_1
+    assert lock.now_serving == ticket_1
+    assert lock.is_someone_waiting()
+
+    # serving the last ticket deletes the lock
+    lock_store.finish_serving(conversation_id, ticket_1)
+    assert lock_store.get_lock(conversation_id) is None
+    assert not lock_store.is_someone_waiting(conversation_id)
+
+
+@pytest.mark.parametrize("lock_store", [InMemoryLockStore(), FakeRedisLockStore()])
+async def test_lock_processes_messages_in_order(lock_store: LockStore):
+    conversation_id = "my id 2"
+    processed = []
+
+    async def handle(message: int) -> None:
+        async with lock_store.lock(conversation_id, wait_time_in_seconds=0.01):
+            # yield control so that the other coroutines try to get the lock
+            await asyncio.sleep(0.02)
+            processed.append(message)
+
+    await asyncio.gather(*[handle(i) for i in range(3)])
+
+    assert processed == [0, 1, 2]
+    assert lock_store.get_lock(conversation_id) is None
+
+
+async def test_lock_error_if_lock_expired():
+    lock_store = InMemoryLockStore()
+    conversation_id = "my id 3"
+
+    # the first ticket blocks the lock, while the second one expires immediately
+    lock_store.issue_ticket(conversation_id, 10)
+
+    with pytest.raises(LockError):
+        async with lock_store.lock(
+            conversation_id, lock_lifetime=0, wait_time_in_seconds=0.01
+        ):
+            pass
+
+
+def test_find_lock_store():
+    assert isinstance(LockStore.find_lock_store(None), InMemoryLockStore)
+
+    store = EndpointConfig(type="redis", url="localhost", port=6379, db=1)
+    assert isinstance(LockStore.find_lock_store(store), RedisLockStore)
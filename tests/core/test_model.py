@@ -11,7 +11,13 @@ import rasa
 import rasa.core
 import rasa.nlu
 from rasa.importers.rasa import RasaFileImporter
-from rasa.constants import DEFAULT_CONFIG_PATH, DEFAULT_DATA_PATH
+from rasa.constants import (
+    DEFAULT_CONFIG_PATH,
+    DEFAULT_DATA_PATH,
+    ENV_MODEL_CACHE_PATH,
+    ENV_MODEL_CACHE_READ_ONLY,
+    ENV_MODEL_CACHE_SIZE_MB,
+)
 from rasa.core.domain import Domain
 from rasa.model import (
     FINGERPRINT_CONFIG_KEY,
@@ -32,6 +38,8 @@ from rasa.model import (
     should_retrain,
     FINGERPRINT_CONFIG_CORE_KEY,
     FINGERPRINT_CONFIG_NLU_KEY,
+    ModelCache,
+    is_cached_model,
 )
 from rasa.exceptions import ModelNotFound
 
@@ -54,13 +62,71 @@ def test_get_model_from_directory(trained_model):
     assert os.path.exists(os.path.join(unpacked, "nlu"))
 
 
-def test_get_model_context_manager(trained_model):
+def test_get_model_context_manager(trained_model, monkeypatch):
+    # models which are not cached are removed after use
+    monkeypatch.setenv(ENV_MODEL_CACHE_SIZE_MB, "0")
+
     with get_model(trained_model) as unpacked:
         assert os.path.exists(unpacked)
 
     assert not os.path.exists(unpacked)
 
 
+def test_get_model_uses_cache(trained_model, tmpdir, monkeypatch):
+    monkeypatch.setenv(ENV_MODEL_CACHE_PATH, tmpdir.strpath)
+
+    with get_model(trained_model) as unpacked:
+        assert is_cached_model(unpacked)
+        assert os.path.dirname(unpacked) == tmpdir.strpath
+
+    # cached models are kept and reused
+    assert os.path.exists(os.path.join(unpacked, "core"))
+    assert get_model(trained_model) == unpacked
+
+
+def test_get_model_with_read_only_cache(trained_model, tmpdir, monkeypatch):
+    monkeypatch.setenv(ENV_MODEL_CACHE_PATH, tmpdir.strpath)
+    monkeypatch.setenv(ENV_MODEL_CACHE_READ_ONLY, "true")
+
+    with get_model(trained_model) as unpacked:
+        assert not is_cached_model(unpacked)
+
+    assert tmpdir.listdir() == []
+
+
+def _model_archive(directory: Text, name: Text) -> Text:
+    model_directory = os.path.join(directory, name)
+    os.makedirs(os.path.join(model_directory, "core"))
+    with open(os.path.join(model_directory, "core", "model"), "w") as f:
+        f.write("x" * 1000)
+
+    return create_package_rasa(
+        model_directory,
+        os.path.join(directory, name + ".tar.gz"),
+        {FINGERPRINT_TRAINED_AT_KEY: name},
+    )
+
+
+def test_model_cache_evicts_least_recently_used_models(tmpdir):
+    first = _model_archive(tmpdir.strpath, "first")
+    second = _model_archive(tmpdir.strpath, "second")
+    third = _model_archive(tmpdir.strpath, "third")
+
+    cache = ModelCache(tmpdir.join("cache").strpath, max_size=2500)
+    first_cached = cache.get(first)
+    second_cached = cache.get(second)
+    # make the second model the least recently used one
+    os.utime(second_cached, (0, 0))
+    assert cache.get(first) == first_cached
+
+    third_cached = cache.get(third)
+
+    assert os.path.exists(first_cached)
+    assert not os.path.exists(second_cached)
+    assert os.path.exists(third_cached)
+    assert len(tmpdir.join("cache").listdir()) == 2
+
+
 @pytest.mark.parametrize("model_path", ["foobar", "rasa", "README.md", None])
 def test_get_model_exception(model_path):
     with pytest.raises(ModelNotFound):
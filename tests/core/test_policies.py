@@ -5,7 +5,7 @@ import numpy as np
 import pytest
 
 import rasa.utils.io
-from rasa.core import training
+from rasa.core import training, utils
 from rasa.core.actions.action import (
     ACTION_DEFAULT_ASK_AFFIRMATION_NAME,
     ACTION_DEFAULT_ASK_REPHRASE_NAME,
@@ -134,6 +134,20 @@ class PolicyTestCollection(object):
             )
             assert predicted_probabilities == actual_probabilities
 
+    async def test_prediction_batch(self, trained_policy, default_domain):
+        trackers = await train_trackers(default_domain, augmentation_factor=20)
+
+        batch_probabilities = trained_policy.predict_action_probabilities_batch(
+            trackers, default_domain
+        )
+
+        assert len(batch_probabilities) == len(trackers)
+        for tracker, probabilities in zip(trackers, batch_probabilities):
+            expected = trained_policy.predict_action_probabilities(
+                tracker, default_domain
+            )
+            assert np.allclose(probabilities, expected, atol=1e-5)
+
     def test_prediction_on_empty_tracker(self, trained_policy, default_domain):
         tracker = DialogueStateTracker(
             UserMessage.DEFAULT_SENDER_ID, default_domain.slots
@@ -320,7 +334,7 @@ class TestMemoizationPolicy(PolicyTestCollection):
 
         nums = np.random.randn(default_domain.num_states)
         random_states = [{f: num for f, num in zip(default_domain.input_states, nums)}]
-        assert trained_policy._recall_states(random_states) is None
+        assert trained_policy._recall_states(random_states, default_domain) is None
 
         # compare augmentation for augmentation_factor of 0 and 20:
         trackers_no_augmentation = await train_trackers(
@@ -344,6 +358,35 @@ class TestMemoizationPolicy(PolicyTestCollection):
         recalled = trained_policy.recall(states, tracker, default_domain)
         assert recalled is not None
 
+    async def test_load_legacy_lookup(self, trained_policy, default_domain, tmpdir):
+        trackers = await train_trackers(default_domain, augmentation_factor=0)
+        all_states, all_actions = trained_policy.featurizer.training_states_and_actions(
+            trackers, default_domain
+        )
+
+        # lookup table as persisted by models trained before 1.2.3
+        legacy_policy = MemoizationPolicy(
+            max_history=trained_policy.max_history, legacy_feature_keys=True
+        )
+        legacy_policy._add_states_to_lookup(all_states, all_actions, default_domain)
+        trained_policy.featurizer.persist(tmpdir.strpath)
+        utils.dump_obj_as_json_to_file(
+            tmpdir.join("memorized_turns.json").strpath,
+            {
+                "priority": legacy_policy.priority,
+                "max_history": legacy_policy.max_history,
+                "lookup": legacy_policy.lookup,
+            },
+        )
+
+        loaded = MemoizationPolicy.load(tmpdir.strpath)
+
+        assert loaded.legacy_feature_keys
+        assert loaded.lookup == legacy_policy.lookup
+        for tracker, states, actions in zip(trackers, all_states, all_actions):
+            recalled = loaded.recall(states, tracker, default_domain)
+            assert recalled == default_domain.index_for_action(actions[0])
+
 
 class TestAugmentedMemoizationPolicy(PolicyTestCollection):
     def create_policy(self, featurizer, priority):
@@ -353,6 +396,28 @@ class TestAugmentedMemoizationPolicy(PolicyTestCollection):
         p = AugmentedMemoizationPolicy(priority=priority, max_history=max_history)
         return p
 
+    async def test_skipping_restarts_does_not_change_recall(
+        self, trained_policy, default_domain, monkeypatch
+    ):
+        trackers = await train_trackers(default_domain, augmentation_factor=20)
+        all_states = trained_policy.featurizer.prediction_states(
+            trackers, default_domain
+        )
+        recalled = [
+            trained_policy.recall(states, tracker, default_domain)
+            for tracker, states in zip(trackers, all_states)
+        ]
+
+        # replay every restarted tracker instead of skipping the restarts whose
+        # previous actions were never memorized
+        monkeypatch.setattr(trained_policy, "_memorized_actions", lambda _: None)
+        recalled_without_index = [
+            trained_policy.recall(states, tracker, default_domain)
+            for tracker, states in zip(trackers, all_states)
+        ]
+
+        assert recalled == recalled_without_index
+
 
 class TestSklearnPolicy(PolicyTestCollection):
     def create_policy(self, featurizer, priority, **kwargs):
@@ -53,6 +53,50 @@ async def test_message_processor(
     } == default_channel.latest_output()
 
 
+async def test_predict_next_action_batch(default_processor: MessageProcessor):
+    trackers = []
+    for sender_id in ["first", "second", "third"]:
+        tracker = DialogueStateTracker(sender_id, [])
+        await default_processor._handle_message_with_tracker(
+            UserMessage('/greet{"name":"Core"}', sender_id=sender_id), tracker
+        )
+        trackers.append(tracker)
+
+    predictions = default_processor.predict_next_action_batch(trackers)
+
+    assert len(predictions) == len(trackers)
+    for tracker, (action, policy, confidence) in zip(trackers, predictions):
+        expected_action, expected_policy, expected_confidence = default_processor.predict_next_action(
+            tracker
+        )
+        assert action.name() == expected_action.name()
+        assert policy == expected_policy
+        assert confidence == pytest.approx(expected_confidence)
+
+
+async def test_coalesced_action_predictions(
+    default_channel: CollectingOutputChannel, default_processor: MessageProcessor
+):
+    from rasa.core import inference
+
+    inference.configure(policy_batch_size=2, policy_batch_wait_ms=50)
+    try:
+        await asyncio.gather(
+            *[
+                default_processor.handle_message(
+                    UserMessage('/greet{"name":"Core"}', default_channel, sender_id)
+                )
+                for sender_id in ["first", "second"]
+            ]
+        )
+    finally:
+        inference.shutdown()
+
+    for sender_id in ["first", "second"]:
+        tracker = default_processor.tracker_store.retrieve(sender_id)
+        assert tracker.latest_bot_utterance.text == "hey there Core!"
+
+
 async def test_message_id_logging(default_processor: MessageProcessor):
     from rasa.core.trackers import DialogueStateTracker
 
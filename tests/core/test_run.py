@@ -1,4 +1,9 @@
+import pytest
+
 from rasa.core import run
+from rasa.core.channels.channel import RestInput
+from rasa.core.utils import AvailableEndpoints
+from rasa.utils.endpoints import EndpointConfig
 
 CREDENTIALS_FILE = "examples/moodbot/credentials.yml"
 
@@ -40,3 +45,71 @@ def test_create_single_input_channels_by_class_wo_credentials():
 
     assert len(channels) == 1
     assert channels[0].name() == "rest"
+
+
+def test_number_of_workers_with_shared_stores():
+    endpoints = AvailableEndpoints(
+        tracker_store=EndpointConfig(type="redis"),
+        lock_store=EndpointConfig(type="redis"),
+    )
+    channels = [RestInput()]
+
+    assert run.number_of_workers(4, endpoints, channels) == 4
+
+
+@pytest.mark.parametrize(
+    "endpoints",
+    [
+        None,
+        AvailableEndpoints(),
+        AvailableEndpoints(tracker_store=EndpointConfig(type="redis")),
+        AvailableEndpoints(
+            tracker_store=EndpointConfig(type="redis"),
+            lock_store=EndpointConfig(type="in_memory"),
+        ),
+        AvailableEndpoints(
+            tracker_store=EndpointConfig(type="in_memory"),
+            lock_store=EndpointConfig(type="redis"),
+        ),
+    ],
+)
+def test_number_of_workers_without_shared_stores(endpoints):
+    assert run.number_of_workers(4, endpoints, [RestInput()]) == 1
+
+
+def test_number_of_workers_with_cmdline_channel():
+    endpoints = AvailableEndpoints(
+        tracker_store=EndpointConfig(type="redis"),
+        lock_store=EndpointConfig(type="redis"),
+    )
+    channels = run.create_http_input_channels("cmdline", None)
+
+    assert run.number_of_workers(4, endpoints, channels) == 1
+
+
+def test_preload_libraries_of_model(tmpdir, monkeypatch):
+    import importlib
+    import json
+
+    policy_names = ["rasa.core.policies.mapping_policy.MappingPolicy"]
+    tmpdir.join("core", "metadata.json").write(
+        json.dumps({"policy_names": policy_names}), ensure=True
+    )
+    pipeline = [{"name": "CountVectorsFeaturizer", "class": "CountVectorsFeaturizer"}]
+    tmpdir.join("nlu", "metadata.json").write(
+        json.dumps({"pipeline": pipeline}), ensure=True
+    )
+
+    imported = []
+    import_module = importlib.import_module
+
+    def record_import(name, *args, **kwargs):
+        imported.append(name)
+        return import_module(name, *args, **kwargs)
+
+    monkeypatch.setattr(importlib, "import_module", record_import)
+
+    run._preload_libraries(tmpdir.strpath)
+
+    assert "rasa.core.policies.mapping_policy" in imported
+    assert "sklearn" in imported
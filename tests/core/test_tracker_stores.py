@@ -1,15 +1,22 @@
+from unittest.mock import Mock
+
+import fakeredis
 import pytest
 
+from rasa.core.broker import EventChannel
 from rasa.core.channels.channel import UserMessage
 from rasa.core.domain import Domain
 from rasa.core.events import SlotSet, ActionExecuted, Restarted
 from rasa.core.tracker_store import (
     TrackerStore,
     InMemoryTrackerStore,
+    MongoTrackerStore,
     RedisTrackerStore,
     SQLTrackerStore,
 )
+from rasa.core.trackers import DialogueStateTracker
 from rasa.utils.endpoints import EndpointConfig, read_endpoint_config
+from rasa.utils.metrics import registry
 from tests.core.conftest import DEFAULT_ENDPOINTS_FILE
 
 domain = Domain.load("data/test_domains/default.yml")
@@ -58,6 +65,64 @@ def test_tracker_store_remembers_max_history(default_domain):
     assert tr._max_event_history == tr2._max_event_history == 42
 
 
+def test_in_memory_tracker_store_spills_least_recently_used(default_domain, tmpdir):
+    registry.reset()
+    store = InMemoryTrackerStore(
+        default_domain, max_conversations=2, spill_path=tmpdir.strpath
+    )
+
+    for sender_id in ["alice", "bob"]:
+        tracker = store.get_or_create_tracker(sender_id)
+        tracker.update(SlotSet("name", sender_id))
+        store.save(tracker)
+
+    # `alice` becomes the most recently used conversation
+    store.retrieve("alice")
+    store.get_or_create_tracker("carol")
+
+    assert list(store.store.keys()) == ["alice", "carol"]
+    assert sorted(store.keys()) == ["alice", "bob", "carol"]
+    # the marks of evicted conversations are dropped with them
+    assert sorted(store._streamed_events) == ["alice", "carol"]
+
+    again = store.retrieve("bob")
+    assert again.get_slot("name") == "bob"
+    assert list(store.store.keys()) == ["carol", "bob"]
+
+    assert registry.counters["tracker_store.in_memory.evictions"] == 2
+    assert registry.counters["tracker_store.in_memory.spill_hits"] == 1
+    assert registry.counters["tracker_store.in_memory.misses"] == 3
+
+
+def test_in_memory_tracker_store_expires_conversations(default_domain, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("time.time", lambda: now[0])
+    store = InMemoryTrackerStore(default_domain, conversation_ttl=60)
+
+    store.get_or_create_tracker("alice")
+    now[0] += 30
+    store.get_or_create_tracker("bob")
+    now[0] += 40
+
+    assert list(store.keys()) == ["bob"]
+    assert list(store._streamed_events) == ["bob"]
+    assert store.retrieve("alice") is None
+
+
+def test_in_memory_tracker_store_keeps_saved_state(default_domain):
+    store = InMemoryTrackerStore(default_domain)
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+
+    # changes which were not saved yet are not visible to others
+    assert store.retrieve("myuser").get_slot("name") is None
+
+    store.save(tracker)
+    tracker.update(SlotSet("name", "Alice"))
+
+    assert store.retrieve("myuser").get_slot("name") == "Bob"
+
+
 def test_tracker_store_endpoint_config_loading():
     cfg = read_endpoint_config(DEFAULT_ENDPOINTS_FILE, "tracker_store")
 
@@ -161,3 +226,348 @@ def test_get_db_url_with_correct_host():
         )
         == expected
     )
+
+
+def test_sql_tracker_store_only_stores_new_events(default_domain, tmpdir):
+    store = SQLTrackerStore(default_domain, db=tmpdir.join("rasa.db").strpath)
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    store.save(tracker)
+    store.save(tracker)
+
+    assert store.number_of_existing_events("myuser") == len(tracker.events) == 2
+
+    again = store.retrieve("myuser")
+    assert again.events == tracker.events
+    assert again.get_slot("name") == "Bob"
+
+
+def test_sql_tracker_store_loads_events_after_restart(default_domain, tmpdir):
+    store = SQLTrackerStore(
+        default_domain,
+        db=tmpdir.join("rasa.db").strpath,
+        load_events_after_restart=True,
+    )
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    tracker.update(Restarted())
+    tracker.update(ActionExecuted("action_listen"))
+    store.save(tracker)
+
+    again = store.retrieve("myuser")
+    assert list(again.events) == [Restarted(), ActionExecuted("action_listen")]
+    assert again.get_slot("name") is None
+
+    again.update(SlotSet("name", "Alice"))
+    store.save(again)
+
+    assert store.number_of_existing_events("myuser") == 5
+    assert store.retrieve("myuser").get_slot("name") == "Alice"
+
+
+def test_sql_tracker_store_inserts_events_in_chunks(
+    default_domain, tmpdir, monkeypatch
+):
+    monkeypatch.setattr(SQLTrackerStore, "MAX_INSERT_ROWS", 2)
+    store = SQLTrackerStore(default_domain, db=tmpdir.join("rasa.db").strpath)
+    tracker = store.get_or_create_tracker("myuser")
+    for i in range(5):
+        tracker.update(SlotSet("name", str(i)))
+    store.save(tracker)
+
+    assert store.number_of_existing_events("myuser") == len(tracker.events) == 6
+    assert store.retrieve("myuser").events == tracker.events
+
+
+def test_sql_tracker_store_remembers_recent_senders_only(
+    default_domain, tmpdir, monkeypatch
+):
+    monkeypatch.setattr(SQLTrackerStore, "MAX_EVENT_MARKS", 1)
+    store = SQLTrackerStore(
+        default_domain,
+        db=tmpdir.join("rasa.db").strpath,
+        load_events_after_restart=True,
+    )
+    tracker = store.get_or_create_tracker("first")
+    tracker.update(Restarted())
+    store.save(tracker)
+    tracker = store.retrieve("first")
+    store.get_or_create_tracker("second")
+
+    assert list(store._persisted_events) == ["second"]
+
+    # the fallback counts the events which were loaded into the tracker
+    tracker.update(SlotSet("name", "Bob"))
+    store.save(tracker)
+
+    assert store.number_of_existing_events("first") == 3
+    assert store.retrieve("first").get_slot("name") == "Bob"
+
+
+def _fake_redis():
+    red = fakeredis.FakeStrictRedis()
+    # added in redis==3.3.0, but not yet in fakeredis
+    red.connection_pool.connection_class.health_check_interval = 0
+    return red
+
+
+def test_redis_event_list_store_appends_new_events(default_domain):
+    store = RedisTrackerStore(default_domain, use_event_lists=True)
+    store.red = _fake_redis()
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    store.save(tracker)
+    store.save(tracker)
+
+    assert store.red.llen(store._events_key("myuser")) == 2
+    assert list(store.keys()) == ["myuser"]
+
+    again = store.retrieve("myuser")
+    assert again.events == tracker.events
+    assert again.get_slot("name") == "Bob"
+
+
+def test_redis_event_list_store_loads_events_after_restart(default_domain):
+    store = RedisTrackerStore(
+        default_domain, use_event_lists=True, load_events_after_restart=True
+    )
+    store.red = _fake_redis()
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    tracker.update(Restarted())
+    tracker.update(SlotSet("name", "Alice"))
+    store.save(tracker)
+
+    again = store.retrieve("myuser")
+    assert list(again.events) == [Restarted(), SlotSet("name", "Alice")]
+    assert again.get_slot("name") == "Alice"
+
+    again.update(ActionExecuted("action_listen"))
+    store.save(again)
+
+    assert store.red.llen(store._events_key("myuser")) == 5
+    assert len(store.retrieve("myuser").events) == 3
+
+
+def test_redis_event_list_store_rewrites_replaced_events(default_domain):
+    store = RedisTrackerStore(
+        default_domain, use_event_lists=True, load_events_after_restart=True
+    )
+    store.red = _fake_redis()
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    tracker.update(Restarted())
+    tracker.update(ActionExecuted("action_listen"))
+    store.save(tracker)
+
+    # e.g. `PUT /conversations/<id>/tracker/events` replaces all events
+    replaced_events = [
+        ActionExecuted("action_listen"),
+        SlotSet("name", "Alice"),
+        ActionExecuted("utter_greet"),
+        ActionExecuted("action_listen"),
+        SlotSet("location", "Berlin"),
+    ]
+    replaced = DialogueStateTracker.from_events(
+        "myuser", replaced_events, default_domain.slots
+    )
+    store.save(replaced)
+
+    assert store.red.llen(store._events_key("myuser")) == 5
+    again = store.retrieve("myuser")
+    assert list(again.events) == replaced_events
+    assert again.get_slot("name") == "Alice"
+
+    # the same happens if the store did not load the conversation before
+    store._event_list_marks.clear()
+    store.save(DialogueStateTracker.from_events("myuser", replaced_events[:2]))
+
+    assert list(store.retrieve("myuser").events) == replaced_events[:2]
+
+
+def test_redis_event_list_store_rewrites_replaced_events_with_same_end(
+    default_domain,
+):
+    store = RedisTrackerStore(default_domain, use_event_lists=True)
+    store.red = _fake_redis()
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    tracker.update(ActionExecuted("action_listen"))
+    store.save(tracker)
+
+    # the replaced events end with the same event as the stored ones
+    replaced_events = [
+        ActionExecuted("action_listen"),
+        SlotSet("name", "Alice"),
+        ActionExecuted("action_listen"),
+        SlotSet("location", "Berlin"),
+    ]
+    replaced = DialogueStateTracker.from_dict(
+        "myuser", [e.as_dict() for e in replaced_events], default_domain.slots
+    )
+    store.save(replaced)
+
+    assert store.red.llen(store._events_key("myuser")) == 4
+    assert list(store.retrieve("myuser").events) == replaced_events
+
+
+def test_redis_event_list_store_rewrites_events_changed_by_other_process(
+    default_domain,
+):
+    red = _fake_redis()
+    stores = [
+        RedisTrackerStore(default_domain, use_event_lists=True) for _ in range(2)
+    ]
+    for store in stores:
+        store.red = red
+
+    tracker = stores[0].get_or_create_tracker("myuser")
+    stale = stores[1].retrieve("myuser")
+
+    tracker.update(SlotSet("name", "Bob"))
+    stores[0].save(tracker)
+    stale.update(SlotSet("name", "Alice"))
+    stores[1].save(stale)
+
+    again = stores[0].retrieve("myuser")
+    assert list(again.events) == list(stale.events)
+    assert again.get_slot("name") == "Alice"
+
+
+def test_redis_event_list_store_keeps_marks_of_recent_senders(
+    default_domain, monkeypatch
+):
+    monkeypatch.setattr(RedisTrackerStore, "MAX_EVENT_MARKS", 2)
+    store = RedisTrackerStore(default_domain, use_event_lists=True)
+    store.red = _fake_redis()
+
+    for sender_id in ["alice", "bob", "carol"]:
+        store.get_or_create_tracker(sender_id)
+
+    assert list(store._event_list_marks) == ["bob", "carol"]
+
+    # without its marks the conversation is rewritten on the next save
+    tracker = store.retrieve("alice")
+    tracker.update(SlotSet("name", "Alice"))
+    store._event_list_marks.clear()
+    store.save(tracker)
+
+    assert list(store.retrieve("alice").events) == list(tracker.events)
+
+
+class BatchRecordingBroker(EventChannel):
+    def __init__(self):
+        self.batches = []
+
+    def publish(self, event):
+        self.batches.append([event])
+
+    def publish_batch(self, events):
+        self.batches.append(events)
+
+
+def test_stream_events_does_not_retrieve_tracker(default_domain, monkeypatch):
+    broker = BatchRecordingBroker()
+    store = InMemoryTrackerStore(default_domain, event_broker=broker)
+
+    tracker = store.get_or_create_tracker("myuser")
+
+    def fail(sender_id):
+        raise AssertionError("tracker should not be retrieved")
+
+    monkeypatch.setattr(store, "retrieve", fail)
+
+    tracker.update(SlotSet("name", "Bob"))
+    tracker.update(ActionExecuted("utter_greet"))
+    store.save(tracker)
+    store.save(tracker)
+
+    assert [[e["event"] for e in batch] for batch in broker.batches] == [
+        ["action"],
+        ["slot", "action"],
+    ]
+    assert all(e["sender_id"] == "myuser" for e in broker.batches[1])
+
+
+def test_mongo_tracker_store_pushes_only_new_events(default_domain, monkeypatch):
+    conversations = Mock()
+    conversations.find_one.return_value = None
+    monkeypatch.setattr(MongoTrackerStore, "_ensure_indices", lambda self: None)
+    monkeypatch.setattr(MongoTrackerStore, "conversations", conversations)
+    store = MongoTrackerStore(default_domain)
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    store.save(tracker)
+    store.save(tracker)
+
+    # the second save of the unchanged tracker does not update the document
+    assert conversations.update_one.call_count == 2
+    created, updated = [c[0][1] for c in conversations.update_one.call_args_list]
+
+    assert [e["event"] for e in created["$push"]["events"]["$each"]] == ["action"]
+    assert [e["event"] for e in updated["$push"]["events"]["$each"]] == ["slot"]
+    assert "sender_id" not in updated["$set"]
+    assert updated["$set"]["slots"]["name"] == "Bob"
+    assert updated["$set"]["snapshot"]["event_offset"] == 2
+
+
+def test_mongo_tracker_store_rewrites_replaced_events(default_domain, monkeypatch):
+    conversations = Mock()
+    conversations.find_one.return_value = None
+    monkeypatch.setattr(MongoTrackerStore, "_ensure_indices", lambda self: None)
+    monkeypatch.setattr(MongoTrackerStore, "conversations", conversations)
+    store = MongoTrackerStore(default_domain)
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("name", "Bob"))
+    tracker.update(ActionExecuted("action_listen"))
+    store.save(tracker)
+
+    # e.g. `PUT /conversations/<id>/tracker/events` replaces all events with
+    # more events which end with the same event
+    replaced_events = [
+        ActionExecuted("action_listen"),
+        SlotSet("name", "Alice"),
+        ActionExecuted("utter_greet"),
+        ActionExecuted("action_listen"),
+    ]
+    replaced = DialogueStateTracker.from_dict(
+        "myuser", [e.as_dict() for e in replaced_events], default_domain.slots
+    )
+    store.save(replaced)
+
+    query, update = conversations.update_one.call_args[0]
+    assert query == {"sender_id": "myuser"}
+    assert "$push" not in update
+    assert [e["event"] for e in update["$set"]["events"]] == [
+        e.as_dict()["event"] for e in replaced_events
+    ]
+    assert update["$set"]["slots"]["name"] == "Alice"
+
+
+def test_mongo_tracker_store_rewrites_events_changed_by_other_process(
+    default_domain, monkeypatch
+):
+    conversations = Mock()
+    conversations.find_one.return_value = None
+    monkeypatch.setattr(MongoTrackerStore, "_ensure_indices", lambda self: None)
+    monkeypatch.setattr(MongoTrackerStore, "conversations", conversations)
+    store = MongoTrackerStore(default_domain)
+
+    tracker = store.get_or_create_tracker("myuser")
+    version = conversations.update_one.call_args[0][1]["$set"]["events_version"]
+
+    # another process wrote the document meanwhile
+    conversations.update_one.return_value.matched_count = 0
+    tracker.update(SlotSet("name", "Bob"))
+    store.save(tracker)
+
+    appended, rewritten = [c[0] for c in conversations.update_one.call_args_list[1:]]
+    assert appended[0] == {"sender_id": "myuser", "events_version": version}
+    assert rewritten[0] == {"sender_id": "myuser"}
+    assert [e["event"] for e in rewritten[1]["$set"]["events"]] == ["action", "slot"]
@@ -20,6 +20,7 @@ from rasa.core.events import (
     Restarted,
     ActionReverted,
     UserUtteranceReverted,
+    Form,
 )
 from rasa.core.tracker_store import (
     InMemoryTrackerStore,
@@ -49,9 +50,12 @@ def loop():
 
 
 class MockRedisTrackerStore(RedisTrackerStore):
-    def __init__(self, domain):
+    def __init__(self, domain, use_event_lists=False):
         self.red = fakeredis.FakeStrictRedis()
         self.record_exp = None
+        self.use_event_lists = use_event_lists
+        self.load_events_after_restart = False
+        self._event_list_marks = {}
 
         # added in redis==3.3.0, but not yet in fakeredis
         self.red.connection_pool.connection_class.health_check_interval = 0
@@ -63,13 +67,19 @@ def stores_to_be_tested():
     temp = tempfile.mkdtemp()
     return [
         MockRedisTrackerStore(domain),
+        MockRedisTrackerStore(domain, use_event_lists=True),
         InMemoryTrackerStore(domain),
         SQLTrackerStore(domain, db=os.path.join(temp, "rasa.db")),
     ]
 
 
 def stores_to_be_tested_ids():
-    return ["redis-tracker", "in-memory-tracker", "SQL-tracker"]
+    return [
+        "redis-tracker",
+        "redis-event-list-tracker",
+        "in-memory-tracker",
+        "SQL-tracker",
+    ]
 
 
 def test_tracker_duplicate():
@@ -393,6 +403,126 @@ def test_traveling_back_in_time(default_domain):
     assert len(list(tracker.generate_all_prior_trackers())) == 2
 
 
+def test_restore_tracker_from_snapshot(default_domain):
+    tracker = tracker_from_dialogue_file(
+        "data/test_dialogues/default.json", default_domain
+    )
+    snapshot = tracker.as_snapshot()
+    new_events = [
+        ActionExecuted(ACTION_LISTEN_NAME),
+        UserUttered("/greet", {"name": "greet", "confidence": 1.0}, []),
+        SlotSet("name", "Alice"),
+    ]
+    for e in new_events:
+        tracker.update(e)
+
+    restored = DialogueStateTracker.from_snapshot(
+        tracker.sender_id, snapshot, list(tracker.events), default_domain.slots
+    )
+
+    assert restored == tracker
+    assert restored.current_state() == tracker.current_state()
+    assert restored.get_slot("name") == "Alice"
+
+
+def test_restore_tracker_from_mismatching_snapshot(default_domain):
+    tracker = tracker_from_dialogue_file(
+        "data/test_dialogues/default.json", default_domain
+    )
+    snapshot = tracker.as_snapshot()
+    snapshot["event_offset"] = len(tracker.events) + 1
+
+    restored = DialogueStateTracker.from_snapshot(
+        tracker.sender_id, snapshot, list(tracker.events), default_domain.slots
+    )
+
+    assert restored.current_state() == tracker.current_state()
+
+
+def test_tracker_copy_uses_snapshot(default_domain):
+    tracker = tracker_from_dialogue_file(
+        "data/test_dialogues/default.json", default_domain
+    )
+    copied = tracker.copy()
+
+    assert list(copied.events) == list(tracker.events)
+    assert copied.as_snapshot() == tracker.as_snapshot()
+
+
+def _generated_past_states(tracker, domain):
+    return [
+        frozenset(state.items())
+        for state in domain.states_for_tracker_history(tracker)
+    ]
+
+
+def test_past_states_are_updated_incrementally(default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots)
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+    states = tracker.past_states(default_domain)
+    # the cached states are returned as long as no event was applied
+    assert tracker.past_states(default_domain) is states
+
+    intent = {"name": "greet", "confidence": 1.0}
+    tracker.update(UserUttered("/greet", intent, []), default_domain)
+    tracker.update(ActionExecuted("utter_greet"))
+    tracker.update(SlotSet("name", "Peter"))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+    assert tracker.past_states(default_domain) is states
+    assert list(states) == _generated_past_states(tracker, default_domain)
+
+
+@pytest.mark.parametrize(
+    "event", [ActionReverted(), UserUtteranceReverted(), Restarted()]
+)
+def test_past_states_cache_is_dropped(event, default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots)
+    intent = {"name": "greet", "confidence": 1.0}
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    tracker.update(UserUttered("/greet", intent, []))
+    tracker.update(ActionExecuted("utter_greet"))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+
+    states = tracker.past_states(default_domain)
+    tracker.update(event)
+
+    assert tracker.past_states(default_domain) is not states
+    assert list(tracker.past_states(default_domain)) == _generated_past_states(
+        tracker, default_domain
+    )
+
+
+def test_past_states_after_completed_form(default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots)
+    greet = {"name": "greet", "confidence": 1.0}
+    inform = {"name": "default", "confidence": 1.0}
+    entities = [{"entity": "name", "value": "Peter"}]
+
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    states = tracker.past_states(default_domain)
+    tracker.update(UserUttered("/greet", greet, []))
+    tracker.update(ActionExecuted("some_form"))
+    tracker.update(Form("some_form"))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    tracker.update(UserUttered("/default", inform, entities))
+    tracker.update(ActionExecuted("some_form"))
+    tracker.update(Form(None))
+    tracker.update(ActionExecuted(ACTION_LISTEN_NAME))
+    tracker.past_states(default_domain)
+
+    # the form is completed, but the latest message is still the one within
+    # the form, which the prior trackers replace with the one before the form
+    tracker.update(UserUttered("/greet", greet, []))
+    tracker.update(ActionExecuted("utter_greet"))
+
+    assert tracker.past_states(default_domain) is not states
+    assert list(tracker.past_states(default_domain)) == _generated_past_states(
+        tracker, default_domain
+    )
+
+
 async def test_dump_and_restore_as_json(default_agent, tmpdir_factory):
     trackers = await default_agent.load_data(DEFAULT_STORIES_FILE)
 
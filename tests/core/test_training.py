@@ -4,6 +4,8 @@ from rasa.core.interpreter import RegexInterpreter
 from rasa.core.train import train
 from rasa.core.agent import Agent
 from rasa.core.policies.form_policy import FormPolicy
+from rasa.core.training import extract_story_graph, load_data
+from rasa.core.training.generator import TrainingDataGenerator
 
 from rasa.core.training.dsl import StoryFileReader
 from rasa.core.training.visualization import visualize_stories
@@ -144,3 +146,40 @@ async def test_random_seed(tmpdir, config_file):
     probs_1 = processor_1.predict_next("1")
     probs_2 = processor_2.predict_next("2")
     assert probs_1["confidence"] == probs_2["confidence"]
+
+
+async def test_generated_training_data_is_cached(default_domain, monkeypatch):
+    trackers = await load_data(DEFAULT_STORIES_FILE, default_domain)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The training data should have been cached.")
+
+    monkeypatch.setattr(TrainingDataGenerator, "_generate", fail)
+    cached_trackers = await load_data(DEFAULT_STORIES_FILE, default_domain)
+
+    assert [t.sender_id for t in cached_trackers] == [t.sender_id for t in trackers]
+    assert [list(t.events) for t in cached_trackers] == [
+        list(t.events) for t in trackers
+    ]
+    assert all(t.domain is default_domain for t in cached_trackers)
+
+    # other generator parameters require new training data
+    with pytest.raises(AssertionError):
+        await load_data(DEFAULT_STORIES_FILE, default_domain, augmentation_factor=0)
+
+
+@pytest.mark.parametrize(
+    "stories_file",
+    [
+        "data/test_stories/stories_with_cycle.md",
+        "data/test_stories/stories_checkpoint_after_or.md",
+    ],
+)
+async def test_training_data_cache_key_is_stable(stories_file, default_domain):
+    keys = []
+    for _ in range(2):
+        story_graph = await extract_story_graph(stories_file, default_domain)
+        generator = TrainingDataGenerator(story_graph, default_domain, use_cache=True)
+        keys.append(generator._cache_key())
+
+    assert keys[0] == keys[1]
@@ -58,6 +58,11 @@ def test_crf_extractor(spacy_nlp, ner_crf_pos_feature_config):
     assert feats[1]["0:low"] == "in"
     sentence = "anywhere in the west"
     ext.extract_entities(Message(sentence, {"spacy_doc": spacy_nlp(sentence)}))
+    sentences = ["anywhere in the west", "central indian restaurant"]
+    batch = [Message(s, {"spacy_doc": spacy_nlp(s)}) for s in sentences]
+    assert ext.extract_entities_batch(batch) == [
+        ext.extract_entities(message) for message in batch
+    ]
     filtered = ext.filter_trainable_entities(examples)
     assert filtered[0].get("entities") == [
         {"start": 16, "end": 20, "value": "west", "entity": "location"}
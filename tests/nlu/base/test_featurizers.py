@@ -29,6 +29,46 @@ def test_spacy_featurizer(sentence, expected, spacy_nlp):
     assert np.allclose(vecs, doc.vector, atol=1e-5)
 
 
+def test_spacy_featurizer_process_batch(spacy_nlp):
+    from rasa.nlu.featurizers.spacy_featurizer import SpacyFeaturizer
+
+    sentences = ["hey how are you today", "I want some chinese food"]
+    messages = [Message(sentence) for sentence in sentences]
+    for message in messages:
+        message.set("spacy_doc", spacy_nlp(message.text))
+
+    SpacyFeaturizer().process_batch(messages)
+
+    for sentence, message in zip(sentences, messages):
+        expected = spacy_nlp(sentence).vector
+        assert np.allclose(message.get("text_features"), expected, atol=1e-5)
+
+
+def test_spacy_process_batch_equals_process(component_builder, default_config):
+    from rasa.nlu.featurizers.spacy_featurizer import SpacyFeaturizer
+
+    spacy_nlp_component = component_builder.create_component(
+        {"name": "SpacyNLP", "case_sensitive": False}, default_config
+    )
+    featurizer = SpacyFeaturizer()
+    sentences = ["Hey How ARE you today", "I want some Chinese food"]
+
+    processed = [Message(sentence) for sentence in sentences]
+    for message in processed:
+        spacy_nlp_component.process(message)
+        featurizer.process(message)
+
+    batch = [Message(sentence) for sentence in sentences]
+    spacy_nlp_component.process_batch(batch)
+    featurizer.process_batch(batch)
+
+    for single, batched in zip(processed, batch):
+        assert batched.get("spacy_doc").text == single.get("spacy_doc").text
+        assert np.allclose(
+            batched.get("text_features"), single.get("text_features"), atol=1e-5
+        )
+
+
 def test_mitie_featurizer(mitie_feature_extractor, default_config):
     from rasa.nlu.featurizers.mitie_featurizer import MitieFeaturizer
 
@@ -71,6 +111,30 @@ def test_ngram_featurizer(spacy_nlp):
     assert ftr.best_num_ngrams > 0
 
 
+def test_regex_featurizer_process_batch(spacy_nlp):
+    from rasa.nlu.featurizers.regex_featurizer import RegexFeaturizer
+
+    patterns = [
+        {"pattern": "[0-9]+", "name": "number", "usage": "intent"},
+        {"pattern": "\\bhey*", "name": "hello", "usage": "intent"},
+    ]
+    ftr = RegexFeaturizer(known_patterns=patterns)
+
+    sentences = ["hey how are you today", "a 1 digit number", "blah balh"]
+    messages = []
+    for sentence in sentences:
+        message = Message(sentence)
+        message.set("spacy_doc", spacy_nlp(sentence))
+        SpacyTokenizer().process(message)
+        messages.append(message)
+
+    ftr.process_batch(messages)
+
+    expected = [[0.0, 1.0], [1.0, 0.0], [0.0, 0.0]]
+    for message, features in zip(messages, expected):
+        assert np.allclose(message.get("text_features"), features, atol=1e-10)
+
+
 @pytest.mark.parametrize(
     "sentence, expected, labeled_tokens",
     [
@@ -195,6 +259,26 @@ def test_count_vector_featurizer(sentence, expected):
     assert np.all(test_message.get("text_features") == expected)
 
 
+def test_count_vector_featurizer_process_batch():
+    from rasa.nlu.featurizers.count_vectors_featurizer import CountVectorsFeaturizer
+
+    sentences = ["hello hello hi", "goodbye", "hi goodbye unknown"]
+
+    ftr = CountVectorsFeaturizer({"token_pattern": r"(?u)\b\w+\b"})
+    train_messages = [Message(sentence) for sentence in sentences]
+    for train_message in train_messages:
+        train_message.set("intent", "bla")
+    ftr.train(TrainingData(train_messages))
+
+    batch = [Message(sentence) for sentence in sentences]
+    ftr.process_batch(batch)
+
+    for sentence, message in zip(sentences, batch):
+        expected = Message(sentence)
+        ftr.process(expected)
+        assert np.all(message.get("text_features") == expected.get("text_features"))
+
+
 @pytest.mark.parametrize(
     "sentence, expected",
     [
@@ -42,6 +42,31 @@ async def test_interpreter(pipeline_template, component_builder, tmpdir):
             assert entity["entity"] in td.entities
 
 
+@utilities.slowtest
+@pytest.mark.parametrize(
+    "pipeline_template", list(registry.registered_pipeline_templates.keys())
+)
+async def test_interpreter_parse_batch(pipeline_template, component_builder, tmpdir):
+    _conf = utilities.base_test_conf(pipeline_template)
+    interpreter = await utilities.interpreter_for(
+        component_builder, "data/examples/rasa/demo-rasa.json", tmpdir.strpath, _conf
+    )
+
+    texts = ["good bye", "", "i am looking for an indian spot", "hello"]
+
+    results = interpreter.parse_batch(texts)
+
+    assert len(results) == len(texts)
+    for text, result in zip(texts, results):
+        expected = interpreter.parse(text)
+        assert result["text"] == text
+        assert result["intent"]["name"] == expected["intent"]["name"]
+        assert result["intent"]["confidence"] == pytest.approx(
+            expected["intent"]["confidence"]
+        )
+        assert result["entities"] == expected["entities"]
+
+
 @pytest.mark.parametrize(
     "metadata",
     [
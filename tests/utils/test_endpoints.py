@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import pytest
@@ -5,6 +6,7 @@ from aioresponses import aioresponses
 
 from tests.utilities import latest_request, json_of_latest_request
 import rasa.utils.endpoints as endpoint_utils
+from rasa.utils.metrics import registry
 
 
 @pytest.mark.parametrize(
@@ -94,3 +96,91 @@ def test_endpoint_config_custom_token_name():
     actual = endpoint_utils.EndpointConfig.from_dict(test_data)
 
     assert actual.token_name == "test_token"
+
+
+async def test_endpoint_config_reuses_pooled_session():
+    registry.reset()
+    endpoint = endpoint_utils.EndpointConfig(
+        "https://example.com/", connection_limit_per_host=5
+    )
+
+    with aioresponses() as mocked:
+        mocked.post("https://example.com/test", payload={"ok": True}, repeat=True)
+        mocked.post("https://example.com/fail", status=500)
+
+        await endpoint.request("post", subpath="test")
+        session = endpoint.pooled_session()
+        await endpoint.request("post", subpath="test")
+
+        with pytest.raises(endpoint_utils.ClientResponseError):
+            await endpoint.request("post", subpath="fail")
+
+    assert endpoint.pooled_session() is session
+    assert session.connector.limit_per_host == 5
+
+    metrics = registry.as_dict()
+    assert metrics["timings"]["endpoint.https://example.com/.latency"]["count"] == 3
+    assert metrics["counters"]["endpoint.https://example.com/.errors"] == 1
+
+    await endpoint_utils.close_pooled_sessions()
+
+    assert session.closed
+    assert endpoint.pooled_session() is not session
+    await endpoint.close_session()
+
+
+def test_endpoint_config_keeps_pooled_session_per_loop():
+    endpoint = endpoint_utils.EndpointConfig("https://example.com/")
+    first_loop = asyncio.new_event_loop()
+    second_loop = asyncio.new_event_loop()
+
+    async def get_session():
+        return endpoint.pooled_session()
+
+    try:
+        first = first_loop.run_until_complete(get_session())
+        second = second_loop.run_until_complete(get_session())
+
+        assert first is not second
+        assert first_loop.run_until_complete(get_session()) is first
+
+        second_loop.run_until_complete(endpoint_utils.close_pooled_sessions())
+
+        assert first.closed
+        assert second.closed
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+
+def test_endpoint_config_forgets_sessions_of_closed_loops():
+    endpoint = endpoint_utils.EndpointConfig("https://example.com/")
+
+    async def get_session():
+        return endpoint.pooled_session()
+
+    closed_loop = asyncio.new_event_loop()
+    closed_loop.run_until_complete(get_session())
+    closed_loop.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        session = loop.run_until_complete(get_session())
+
+        assert list(endpoint._pooled_sessions.values()) == [session]
+
+        loop.run_until_complete(endpoint.close_session())
+    finally:
+        loop.close()
+
+
+def test_endpoint_config_copy_keeps_connection_settings():
+    endpoint = endpoint_utils.EndpointConfig(
+        "https://example.com/", connection_limit_per_host=5, keepalive_timeout=10
+    )
+
+    copied = endpoint.copy()
+
+    assert copied.connection_limit_per_host == 5
+    assert copied.keepalive_timeout == 10
+    assert "connection_limit_per_host" not in copied.kwargs